@@ -0,0 +1,87 @@
+"""
+Thin client for the Adzuna job search API, shared by the jobs routes and the
+background ingestion service.
+"""
+import os
+from typing import Any, Dict, Optional
+import httpx
+import orjson
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Adzuna API credentials
+ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY")
+ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
+ADZUNA_BASE_URL = os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
+
+# Value of jobs.source for postings ingested from Adzuna
+SOURCE = "adzuna"
+
+# Our job type filter values mapped onto Adzuna contract types
+CONTRACT_TYPES = {
+    "full_time": "full_time",
+    "part_time": "part_time",
+    "contract": "contract",
+    "temporary": "temp",
+    "internship": "internship"
+}
+
+class AdzunaError(Exception):
+    """Non-200 or undecodable response from the Adzuna API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Adzuna returned {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+def build_search_params(
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    type: Optional[str] = None,
+    salary: Optional[str] = None,
+    results_per_page: int = 20,
+) -> Dict[str, Any]:
+    """Build Adzuna search query parameters from our search filters"""
+    params = {
+        "app_id": ADZUNA_APP_ID,
+        "app_key": ADZUNA_API_KEY,
+        "results_per_page": results_per_page,
+        "content-type": "application/json",
+    }
+    
+    # Add search parameters if provided
+    if title:
+        params["what"] = title
+    if location:
+        params["where"] = location
+    if salary:
+        # Parse salary range
+        try:
+            min_salary, max_salary = salary.split("-")
+            params["salary_min"] = min_salary
+            params["salary_max"] = max_salary
+        except ValueError:
+            pass
+    
+    # Add filters for job type
+    if type in CONTRACT_TYPES:
+        params["contract_type"] = CONTRACT_TYPES[type]
+    
+    return params
+
+async def fetch_page(client: httpx.AsyncClient, country: str, page: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch one page of search results"""
+    response = await client.get(f"{ADZUNA_BASE_URL}/{country}/search/{page}", params=params)
+    try:
+        data = orjson.loads(response.content)  # Decode straight from bytes, no intermediate str copy
+    except orjson.JSONDecodeError:
+        # Error pages from proxies and rate limiting are often HTML or empty
+        data = None
+    if response.status_code != 200:
+        error = data.get("error") if isinstance(data, dict) else None
+        raise AdzunaError(response.status_code, error or "Unknown error")
+    if not isinstance(data, dict):
+        raise AdzunaError(response.status_code, "Response is not a JSON object")
+    return data
@@ -0,0 +1,109 @@
+"""
+Table size and query latency before and after archiving cold parsed_data.
+
+Fills a temporary SQLite database with resume uploads (mostly older than the
+archive cutoff, each with ~20KB of parsed_data), then measures the database
+size and the latency of a status scan and of listing one user's uploads,
+archives, VACUUMs and measures again. Also reports the cost of reading one
+archived upload (blob read, gunzip and decode).
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_archive [uploads]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from .. import crud, models, upload_archive
+from ..database import Base
+
+def parsed_data(rng: random.Random) -> dict:
+    return {
+        "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+        "summary": "Backend engineer focused on distributed systems. " * 8,
+        "experience": [
+            {"title": f"Engineer {i}", "description": "Built and operated services. " * 20,
+             "start_date": "2019", "end_date": "Present"}
+            for i in range(rng.randint(6, 10))
+        ],
+        "skills": [{"name": f"skill-{i}"} for i in range(40)],
+    }
+
+def fill(db, uploads: int) -> None:
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": i % 500 + 1, "file_path": f"/uploads/{i}.pdf", "original_filename": "resume.pdf",
+            "file_type": "application/pdf", "file_size": 50_000, "status": "completed", "version": 1,
+            # 80% of uploads are past the archive cutoff
+            "upload_date": now - timedelta(days=rng.randint(200, 900) if rng.random() < 0.8 else rng.randint(0, 90)),
+            "parsed_data": parsed_data(rng),
+        }
+        for i in range(uploads)
+    ]
+    for start in range(0, len(rows), 1000):
+        db.execute(insert(models.ResumeUpload), rows[start:start + 1000])
+    db.commit()
+
+def timed_ms(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def measure(db, path: str) -> dict:
+    U = models.ResumeUpload
+    return {
+        "size MB": os.path.getsize(path) / 1e6,
+        "status scan ms": timed_ms(lambda: db.execute(
+            select(func.count()).select_from(U).where(U.status == "failed")
+        ).scalar()),
+        "user list ms": timed_ms(lambda: db.execute(
+            select(U).where(U.user_id == 7).order_by(U.upload_date.desc()).limit(100)
+        ).all()),
+    }
+
+def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        upload_archive.blob_store = upload_archive.FileBlobStore(os.path.join(tmp, "archive"))
+        db = sessionmaker(bind=engine)()
+        fill(db, uploads)
+        before = measure(db, path)
+
+        start = time.perf_counter()
+        stats = upload_archive.archive_uploads(db)
+        archive_s = time.perf_counter() - start
+        with engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+        after = measure(db, path)
+
+        archived_id = db.execute(
+            select(models.ResumeUpload.id).where(models.ResumeUpload.parsed_data_ref.isnot(None)).limit(1)
+        ).scalar()
+        def read_archived():
+            db.expire_all()
+            crud.get_resume_upload(db, archived_id)
+        rehydrate_ms = timed_ms(read_archived, repeat=200)
+
+        print(f"{uploads} uploads, {stats['archived']} archived in {archive_s:.1f}s "
+              f"({stats['json_bytes'] / 1e6:.0f} MB JSON -> {stats['stored_bytes'] / 1e6:.0f} MB gzip blobs)")
+        print(f"{'':<16}{'before':>10}{'after':>10}")
+        for name in before:
+            print(f"{name:<16}{before[name]:>10.2f}{after[name]:>10.2f}")
+        print(f"read one archived upload: {rehydrate_ms:.2f} ms")
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
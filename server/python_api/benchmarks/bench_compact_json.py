@@ -0,0 +1,94 @@
+"""
+Storage size and encode/decode cost of the CompactJSON column type.
+
+Compares, for resume content (bench_serialization.build_content) at a few sizes
+and for a typical parsed_data document:
+
+    json        orjson text, as a JSON column stores it (JSONB is about the
+                same size on disk before TOAST)
+    toast       the same text through zlib without a dictionary, a stand-in
+                for Postgres TOAST compression of a large JSON/JSONB value
+                (Postgres only compresses values over ~2KB, smaller ones are
+                stored as in the json row)
+    compact     compact_json.encode (preset dictionary deflate)
+
+Write cost is the time to turn the dict into the stored bytes, read cost the
+time to get the dict back.
+
+A second table gives the bytes a resumes row spends on content, since a row
+used to carry a canonical content_json text copy next to the content column:
+
+    json+text     JSON content column plus the content_json text copy
+    compact+text  compact content column plus the content_json text copy
+    compact       compact content only, content_json derived from it
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_compact_json
+"""
+import time
+import zlib
+
+import orjson
+
+from .. import compact_json
+from .bench_serialization import build_content
+
+def parsed_data() -> dict:
+    return {
+        "personal_info": {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100",
+                          "location": "Austin, TX", "website": "", "linkedin": ""},
+        "summary": "Backend engineer focused on distributed systems.",
+        "experience": [
+            {"title": f"Engineer {i}", "company": f"Company {i}", "location": "Remote",
+             "start_date": "2019", "end_date": "Present", "description": "Built and operated services."}
+            for i in range(4)
+        ],
+        "education": [{"institution": "State University", "degree": "BSc", "fieldOfStudy": "Computer Science",
+                       "start_date": "2012", "end_date": "2016", "gpa": ""}],
+        "skills": [{"name": name} for name in ("Python", "PostgreSQL", "Kubernetes", "Go", "AWS")],
+    }
+
+def timed_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def toast_encode(value) -> bytes:
+    return zlib.compress(orjson.dumps(value), 6)
+
+def toast_decode(data: bytes):
+    return orjson.loads(zlib.decompress(data))
+
+FORMATS = {
+    "json": (orjson.dumps, orjson.loads),
+    "toast": (toast_encode, toast_decode),
+    "compact": (compact_json.encode, compact_json.decode),
+}
+
+def main():
+    samples = {"parsed_data": parsed_data()}
+    for size in (2_000, 10_000, 50_000):
+        samples[f"content {size // 1000}KB"] = build_content(size)
+    print(f"{'sample':<16}{'format':<10}{'bytes':>9}{'ratio':>8}{'write us':>10}{'read us':>10}")
+    for label, value in samples.items():
+        json_size = len(orjson.dumps(value))
+        repeat = max(50, 2_000_000 // json_size)
+        for name, (encode, decode) in FORMATS.items():
+            data = encode(value)
+            assert decode(data) == value
+            write = timed_us(lambda: encode(value), repeat)
+            read = timed_us(lambda: decode(data), repeat)
+            print(f"{label:<16}{name:<10}{len(data):>9}{json_size / len(data):>8.1f}{write:>10.1f}{read:>10.1f}")
+
+    print()
+    print(f"{'resumes row':<16}{'json+text':>11}{'compact+text':>14}{'compact':>9}")
+    for label, value in samples.items():
+        if not label.startswith("content"):
+            continue
+        json_size = len(orjson.dumps(value))
+        compact_size = len(compact_json.encode(value))
+        print(f"{label:<16}{json_size * 2:>11}{compact_size + json_size:>14}{compact_size:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+CPU cost against bytes saved for response compression.
+
+Compresses typical large responses (a 100-job listing with full descriptions,
+the same listing with snippets, and a user's resume list) with each gzip level
+and brotli quality the middleware can use, and compares with the cost of a
+precompressed-cache hit (hashing the body).
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_compression
+"""
+import hashlib
+import random
+import time
+
+import orjson
+
+from ..compression import brotli, gzip_compress
+from ..job_records import LIST_FIELDS, JobRecord, add_snippets, records_response
+from ..skills import extract_skills
+from .bench_job_records import make_page
+from .bench_serialization import build_content
+
+def job_payloads():
+    body = make_page(100, random.Random(5))
+    records = [
+        JobRecord.from_adzuna(result, extract_skills(result["description"]), 80)
+        for result in orjson.loads(body)["results"]
+    ]
+    full = records_response(records).body
+    add_snippets(records, ["python"])
+    return full, records_response(records, LIST_FIELDS).body
+
+def resume_list_payload(count: int = 20) -> bytes:
+    return orjson.dumps([{"id": i, "title": f"Resume {i}", "content": build_content(20_000)} for i in range(count)])
+
+def cpu_ms(fn, data: bytes, repeat: int = 10) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(data)
+    return (time.process_time() - start) / repeat * 1000
+
+def main():
+    full, listed = job_payloads()
+    payloads = {"jobs (full)": full, "jobs (list)": listed, "resume list": resume_list_payload()}
+    codecs = [(f"gzip-{level}", lambda d, level=level: gzip_compress(d, level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{q}", lambda d, q=q: brotli.compress(d, quality=q)) for q in (4, 5, 11)]
+    else:
+        print("brotli not installed, gzip only")
+
+    print(f"{'payload':<14}{'codec':<10}{'KiB in':>9}{'KiB out':>9}{'ratio':>8}{'CPU ms':>9}{'MB saved/CPU s':>16}")
+    for name, data in payloads.items():
+        for codec, fn in codecs:
+            out = fn(data)
+            ms = cpu_ms(fn, data)
+            saved_mb = (len(data) - len(out)) / 1e6
+            print(
+                f"{name:<14}{codec:<10}{len(data) / 1024:>9.0f}{len(out) / 1024:>9.0f}"
+                f"{len(out) / len(data):>8.2f}{ms:>9.2f}{saved_mb / (ms / 1000):>16.0f}"
+            )
+        hit_ms = cpu_ms(lambda d: hashlib.blake2b(d, digest_size=16).digest(), data, repeat=100)
+        print(f"{name:<14}{'cache hit':<10}{'':>34}{hit_ms:>9.3f}")
+
+if __name__ == "__main__":
+    main()
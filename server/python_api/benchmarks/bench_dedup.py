@@ -0,0 +1,68 @@
+"""
+Precision/recall and throughput of near-duplicate job detection.
+
+Generates a synthetic corpus of unique job descriptions plus lightly edited
+reposts (word substitutions, deletions and an agency footer), then compares
+the groups found by MinHash/LSH with the known ground truth.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_dedup [unique_jobs]
+"""
+import itertools
+import random
+import sys
+import time
+
+from ..dedup import find_duplicate_groups
+
+VOCABULARY = (
+    "build design operate scale python java kubernetes services team product customers data "
+    "pipelines reliable secure cloud platform mentor engineers own roadmap deliver features "
+    "collaborate stakeholders analytics dashboards testing automation infrastructure latency "
+    "monitoring incidents payments search growth mobile web api backend frontend"
+).split()
+
+def make_corpus(unique: int, rng: random.Random):
+    texts, labels = [], []
+    for label in range(unique):
+        base = [rng.choice(VOCABULARY) for _ in range(rng.randint(80, 160))]
+        texts.append(" ".join(base))
+        labels.append(label)
+        # About a third of postings are reposted 1-3 times with small edits
+        if rng.random() < 0.33:
+            for _ in range(rng.randint(1, 3)):
+                words = list(base)
+                for _ in range(max(1, len(words) // 40)):
+                    words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+                del words[rng.randrange(len(words))]
+                texts.append(" ".join(words) + " apply through our agency today")
+                labels.append(label)
+    return texts, labels
+
+def pairs_from_groups(groups):
+    return {pair for group in groups for pair in itertools.combinations(sorted(group), 2)}
+
+def main():
+    unique = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    texts, labels = make_corpus(unique, random.Random(3))
+
+    start = time.perf_counter()
+    groups = find_duplicate_groups(texts)
+    elapsed = time.perf_counter() - start
+
+    truth_groups = {}
+    for i, label in enumerate(labels):
+        truth_groups.setdefault(label, []).append(i)
+    truth = pairs_from_groups(truth_groups.values())
+    found = pairs_from_groups(groups)
+    true_positives = len(truth & found)
+    precision = true_positives / len(found) if found else 1.0
+    recall = true_positives / len(truth) if truth else 1.0
+
+    print(f"documents:   {len(texts)} ({len(truth)} duplicate pairs)")
+    print(f"precision:   {precision:.3f}")
+    print(f"recall:      {recall:.3f}")
+    print(f"throughput:  {len(texts) / elapsed:.0f} docs/s ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Throughput and memory of the streaming resume export.
+
+Fills a temporary SQLite database with resumes (~10KB of content each, every
+fifth with a 100KB original file), then times the dry run, streams the whole
+archive, and streams a resumed download of its last 10%. Peak Python memory of
+each stream is traced, to show it does not grow with the export.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_export [resumes]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from .. import export_archive, models
+from ..database import Base
+from .bench_serialization import build_content
+
+USERS = 50
+
+def fill(db, tmp: str, resumes: int) -> None:
+    content = build_content(10_000)
+    file_data = os.urandom(100_000)
+    rows = []
+    for i in range(resumes):
+        file_path = None
+        if i % 5 == 0:
+            file_path = os.path.join(tmp, f"{i}.pdf")
+            with open(file_path, "wb") as f:
+                f.write(file_data)
+        rows.append({
+            "user_id": i % USERS + 1, "title": f"Resume {i}", "template": "professional", "version": 1,
+            "content": content,
+            "file_path": file_path, "file_name": "resume.pdf" if file_path else None,
+        })
+    for start in range(0, len(rows), 1000):
+        db.execute(insert(models.Resume), rows[start:start + 1000])
+    db.commit()
+
+def stream(db, plan, start: int = 0):
+    """Stream the archive from start, returning (bytes, seconds, peak traced MB)"""
+    tracemalloc.start()
+    began = time.perf_counter()
+    sent = sum(len(chunk) for chunk in export_archive.iter_archive(db, plan, start))
+    elapsed = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return sent, elapsed, peak
+
+def main():
+    resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        fill(db, tmp, resumes)
+        user_ids = list(range(1, USERS + 1))
+
+        began = time.perf_counter()
+        plan = export_archive.plan_export(db, user_ids)
+        plan_s = time.perf_counter() - began
+        print(f"{resumes} resumes, {len(plan.files)} files, archive {plan.size / 1e6:.0f} MB, dry run {plan_s:.2f}s")
+        for label, start in [("full download", 0), ("resume last 10%", plan.size * 9 // 10)]:
+            sent, elapsed, peak = stream(db, plan, start)
+            assert sent == plan.size - start
+            print(f"{label:<16} {sent / 1e6:>6.0f} MB in {elapsed:.2f}s, peak memory {peak:.1f} MB")
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Ranking stored jobs for a resume: skill index vs. scanning descriptions.
+
+Builds a synthetic catalog of jobs in a temporary SQLite database with the
+job_skills postings populated, then compares rank_jobs against the naive
+approach of running extract_skills over every job description.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_job_matching [job_count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import Base
+from ..job_index import rank_jobs
+from ..routes.jobs import extract_skills
+from ..skills import SKILL_TAXONOMY
+
+RESUME_SKILLS = ["python", "kubernetes", "aws", "postgresql", "docker"]
+BATCH_SIZE = 20_000
+
+def populate(db: Session, count: int) -> None:
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    jobs, postings = [], []
+    for job_id in range(1, count + 1):
+        skills = rng.sample(SKILL_TAXONOMY, rng.randint(2, 6))
+        expires_at = now + timedelta(days=rng.randint(-10, 30))
+        jobs.append({
+            "id": job_id, "title": "Engineer", "company": "Acme", "location": "Remote",
+            "type": "full_time", "description": "We use " + ", ".join(skills) + ". " + "Details. " * 40,
+            "skills": skills, "apply_url": "https://example.com", "posted_at": now, "expires_at": expires_at
+        })
+        postings.extend({"skill": s, "job_id": job_id, "expires_at": expires_at} for s in skills)
+        if len(jobs) >= BATCH_SIZE:
+            db.execute(insert(models.Job), jobs)
+            db.execute(insert(models.JobSkill), postings)
+            jobs, postings = [], []
+    if jobs:
+        db.execute(insert(models.Job), jobs)
+        db.execute(insert(models.JobSkill), postings)
+    db.commit()
+
+def naive_rank(db: Session, skills, limit=20):
+    """Scan every job and extract skills from its description at query time"""
+    wanted = set(skills)
+    scored = []
+    for job_id, description in db.execute(select(models.Job.id, models.Job.description)):
+        matched = len(wanted.intersection(extract_skills(description)))
+        if matched:
+            scored.append((matched, job_id))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'jobs.db')}")
+        Base.metadata.create_all(engine, tables=[models.Job.__table__, models.JobSkill.__table__])
+        with Session(engine) as db:
+            start = time.perf_counter()
+            populate(db, count)
+            print(f"inserted {count} jobs in {time.perf_counter() - start:.1f}s")
+
+            rank_jobs(db, RESUME_SKILLS)  # warm up
+            runs = 5
+            start = time.perf_counter()
+            for _ in range(runs):
+                results = rank_jobs(db, RESUME_SKILLS)
+            print(f"skill index rank_jobs      {(time.perf_counter() - start) / runs * 1000:10.1f} ms ({len(results)} jobs)")
+
+            start = time.perf_counter()
+            naive_rank(db, RESUME_SKILLS)
+            print(f"description scan           {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    main()
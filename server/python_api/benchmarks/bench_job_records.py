@@ -0,0 +1,99 @@
+"""
+Per-request memory of encoding a page of job results.
+
+Compares the previous path (dict per result -> JobResponse per dict -> FastAPI
+jsonable copy -> JSON) with JobRecord encoded directly by orjson, measuring
+allocations with tracemalloc for a page decoded from upstream JSON bytes.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_job_records [results_per_page]
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from ..job_records import LIST_FIELDS, JobRecord, add_snippets, records_response
+from ..schemas import JobResponse
+from ..skills import extract_skills
+
+WORDS = "python kubernetes aws services team product customers data pipelines reliable secure cloud remote".split()
+
+def make_page(results: int, rng: random.Random) -> bytes:
+    return orjson.dumps({"results": [
+        {
+            "id": str(1000 + i),
+            "title": f"Engineer {i}",
+            "company": {"display_name": f"Company {i}"},
+            "location": {"display_name": "Austin, TX"},
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(300, 600))),
+            "created": "2026-10-18T10:00:00Z",
+            "contract_type": "permanent",
+            "salary_is_predicted": "0",
+        }
+        for i in range(results)
+    ]})
+
+def dict_path(body: bytes) -> bytes:
+    jobs = []
+    for result in json.loads(body)["results"]:
+        jobs.append({
+            "id": result.get("id", ""),
+            "title": result.get("title", ""),
+            "company": result.get("company", {}).get("display_name", "Unknown Company"),
+            "location": result.get("location", {}).get("display_name", ""),
+            "description": result.get("description", ""),
+            "postedAt": result.get("created", ""),
+            "salary": result.get("salary_is_predicted", "Not specified"),
+            "type": result.get("contract_type", "Not specified"),
+            "isRemote": "remote" in result.get("description", "").lower(),
+            "skills": extract_skills(result.get("description", "")),
+            "match": 80,
+            "status": "new",
+            "saved": False
+        })
+    models = [JobResponse(**job) for job in jobs]
+    return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+def record_path(body: bytes) -> bytes:
+    jobs = []
+    for result in orjson.loads(body)["results"]:
+        jobs.append(JobRecord.from_adzuna(result, extract_skills(result.get("description", "")), 80))
+    return records_response(jobs).body
+
+def measure(fn, body: bytes, repeat: int = 20):
+    fn(body)  # Warm up caches (regexes, pydantic validators)
+    tracemalloc.start()
+    fn(body)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(body)
+    return peak, (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    results = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    body = make_page(results, random.Random(5))
+    print(f"{results} results per page, upstream body {len(body) / 1024:.0f} KiB")
+    print(f"{'path':<12}{'peak KiB':>12}{'ms/request':>14}")
+    for name, fn in (("dict", dict_path), ("JobRecord", record_path)):
+        peak, ms = measure(fn, body)
+        print(f"{name:<12}{peak / 1024:>12.0f}{ms:>14.2f}")
+
+    # Payload size of the default list response (snippets) against full descriptions
+    records = [
+        JobRecord.from_adzuna(result, extract_skills(result["description"]), 80)
+        for result in orjson.loads(body)["results"]
+    ]
+    full = len(records_response(records).body)
+    add_snippets(records, ["python"])
+    listed = len(records_response(records, LIST_FIELDS).body)
+    print(f"payload: full {full / 1024:.0f} KiB, list {listed / 1024:.0f} KiB ({full / listed:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
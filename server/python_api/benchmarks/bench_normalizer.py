@@ -0,0 +1,71 @@
+"""
+Throughput of the shared text normalizer.
+
+Builds a corpus of resume-like documents (mixed-case text with Unicode
+punctuation, full-width characters and words hyphenated across lines) and
+reports tokens/sec for normalize(), then compares skill extraction the old way
+(lower-casing the text once per taxonomy skill) with matching on the cached
+token stream.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_normalizer [documents]
+"""
+import random
+import sys
+import time
+
+from ..skills import SKILL_TAXONOMY, skills_in_tokens
+from ..text_normalizer import normalize
+
+WORDS = [
+    "Built", "operated", "services", "handling", "millions", "of", "requests", "per", "day",
+    "Led", "migration", "to", "Kubernetes", "reducing", "costs", "by", "30%", "—", "résumé",
+    "Node.js", "C++", "PostgreSQL", "CI/CD", "Python", "machine", "learning", "ｄａｔａ", "team",
+]
+
+def make_document(rng: random.Random, words: int = 600) -> str:
+    lines, line = [], []
+    for _ in range(words):
+        line.append(rng.choice(WORDS))
+        if len(line) >= 12:
+            if rng.random() < 0.2:
+                line.append("develop-")  # Hyphenated across the line break
+                lines.append("  ".join(line))
+                line = ["ment"]
+            else:
+                lines.append(" ".join(line))
+                line = []
+    lines.append(" ".join(line))
+    return "\r\n".join(lines)
+
+def old_extract_skills(description: str) -> list:
+    return [skill for skill in SKILL_TAXONOMY if skill.lower() in description.lower()]
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(7)
+    corpus = [make_document(rng) for _ in range(documents)]
+    megabytes = sum(len(doc.encode("utf-8")) for doc in corpus) / 1e6
+
+    start = time.perf_counter()
+    normalized = [normalize(doc) for doc in corpus]
+    normalize_s = time.perf_counter() - start
+    tokens = sum(len(n["tokens"]) for n in normalized)
+
+    start = time.perf_counter()
+    for doc in corpus:
+        old_extract_skills(doc)
+    old_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for n in normalized:
+        skills_in_tokens(n["tokens"])
+    cached_s = time.perf_counter() - start
+
+    print(f"corpus: {documents} documents, {megabytes:.1f} MB, {tokens} tokens")
+    print(f"normalize:                  {normalize_s:8.2f}s {tokens / normalize_s:>12,.0f} tokens/s {megabytes / normalize_s:6.1f} MB/s")
+    print(f"skills, lower() per skill:  {old_s:8.2f}s")
+    print(f"skills, cached tokens:      {cached_s:8.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Request throughput against connection pool size.
+
+Runs a fixed number of threads (standing in for a worker's request
+concurrency), each checking out a connection, running a query that holds it for
+QUERY_MS, and returning it. For each pool size it reports requests/sec, the
+average and worst wait for a connection, and pool timeouts, so the pool can be
+sized per deployment: throughput stops improving once the pool covers the
+concurrency the database can actually serve.
+
+Uses DATABASE_URL when it points at Postgres (the query is pg_sleep), otherwise
+a temporary SQLite file with the hold time simulated client-side.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_pool [threads] [requests per thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+from ..database import engine_options, instrument, pool_stats
+
+QUERY_MS = 5
+POOL_SIZES = [1, 2, 4, 8, 16, 32]
+
+def run(engine, threads: int, requests: int, server_sleep: bool) -> float:
+    query = text(f"SELECT pg_sleep({QUERY_MS / 1000})") if server_sleep else text("SELECT 1")
+
+    def worker():
+        for _ in range(requests):
+            with engine.connect() as conn:
+                conn.execute(query)
+                if not server_sleep:
+                    time.sleep(QUERY_MS / 1000)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * requests / (time.perf_counter() - start)
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    url = os.getenv("DATABASE_URL", "")
+    server_sleep = url.startswith(("postgresql", "postgres://"))
+    with tempfile.TemporaryDirectory() as tmp:
+        if not server_sleep:
+            url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"{threads} threads x {requests} requests, {QUERY_MS} ms per query, {url.split('://')[0]}")
+        print(f"{'pool size':>10}{'req/s':>10}{'avg wait ms':>13}{'max wait ms':>13}{'timeouts':>10}")
+        for size in POOL_SIZES:
+            engine = create_engine(url, **engine_options(url, pool_size=size, max_overflow=0, pool_timeout=60))
+            instrument(engine)
+            pool_stats.reset()
+            throughput = run(engine, threads, requests, server_sleep)
+            stats = pool_stats.snapshot()
+            print(
+                f"{size:>10}{throughput:>10.0f}{stats['avg_wait_ms']:>13.2f}"
+                f"{stats['max_wait_ms']:>13.2f}{stats['timeouts']:>10}"
+            )
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-request overhead of the rate limiting middleware.
+
+Drives the middleware directly with a no-op ASGI app (no HTTP stack) and
+reports microseconds per request for an unmatched path, the in-memory token
+bucket backend, and the SQL fixed-window backend on a temporary SQLite file.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_rate_limit [requests]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..database import Base
+from ..rate_limit import MemoryBackend, RateLimitMiddleware, SQLBackend, parse_rules
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+async def noop_send(message):
+    pass
+
+async def drive(middleware, path: str, requests: int, clients: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "method": "GET", "path": path,
+            "query_string": b"", "headers": [], "client": (f"10.0.{i % clients // 256}.{i % 256}", 1234),
+        }
+        await middleware(scope, None, noop_send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rules = parse_rules("GET /api/jobs=1000000/60")
+    baseline = asyncio.run(drive(noop_app, "/api/jobs", requests, 1000))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        cases = [
+            ("no rule match", RateLimitMiddleware(noop_app, rules, MemoryBackend()), "/health", requests),
+            ("memory", RateLimitMiddleware(noop_app, rules, MemoryBackend()), "/api/jobs", requests),
+            ("sql (sqlite)", RateLimitMiddleware(noop_app, rules, SQLBackend(sessionmaker(bind=engine))), "/api/jobs", requests // 50),
+        ]
+        print(f"{'backend':<16}{'us/request':>12}{'overhead us':>14}")
+        print(f"{'no middleware':<16}{baseline:>12.2f}{'':>14}")
+        for name, middleware, path, count in cases:
+            us = asyncio.run(drive(middleware, path, count, 1000))
+            print(f"{name:<16}{us:>12.2f}{us - baseline:>14.2f}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Throughput of rendering 1k resumes to PDF and DOCX.
+
+Measures a single process, the render process pool, and the cached path
+(artifact already on disk).
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_rendering [count]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from .bench_serialization import build_content
+from .. import render_service
+from ..resume_renderer import ResumeRenderer
+from ..serialization import dump_content
+
+def make_resumes(count: int):
+    base = build_content(8_000)
+    resumes = []
+    for i in range(count):
+        content = dict(base, summary=f"Candidate {i}. " + base["summary"])
+        resumes.append((content, dump_content(content)))
+    return resumes
+
+def report(label: str, count: int, elapsed: float):
+    print(f"{label:<32} {count / elapsed:10.1f} resumes/s  ({elapsed:.2f}s)")
+
+async def render_all(resumes, fmt: str):
+    await asyncio.gather(*(
+        render_service.render_to_cache(content, content_json, "professional", fmt)
+        for content, content_json in resumes
+    ))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    resumes = make_resumes(count)
+
+    for fmt in ("pdf", "docx"):
+        start = time.perf_counter()
+        for content, _ in resumes:
+            ResumeRenderer.render(content, "professional", fmt)
+        report(f"{fmt} single process", count, time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as render_dir:
+            render_service.RENDER_DIR = render_dir
+            render_service.RENDER_CACHE_MAX_FILES = count * 2
+            start = time.perf_counter()
+            asyncio.run(render_all(resumes, fmt))
+            report(f"{fmt} pool ({render_service.RENDER_WORKERS} workers)", count, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            asyncio.run(render_all(resumes, fmt))
+            report(f"{fmt} cached", count, time.perf_counter() - start)
+            assert len(os.listdir(render_dir)) == count
+
+    render_service.shutdown_pool()
+
+if __name__ == "__main__":
+    main()
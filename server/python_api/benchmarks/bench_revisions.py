@@ -0,0 +1,93 @@
+"""
+Storage and reconstruction latency of resume revision history.
+
+Saves a ~20KB resume 1000 times through crud.update_resume with small
+autosave-sized edits, for a few snapshot intervals, then reports the bytes of
+history stored (against storing every version in full), the added cost per
+save, and the latency of rebuilding revision 1000 and an older revision.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_revisions [saves]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import orjson
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from .. import compact_json, crud, models, resume_history, schemas
+from ..database import Base
+from .bench_serialization import build_content
+
+INTERVALS = (10, 50, 200)
+
+def edit(content, rng):
+    """A random autosave-sized edit of a copy of resume content"""
+    content = orjson.loads(orjson.dumps(content))
+    experience = content["experience"]
+    choice = rng.random()
+    if choice < 0.4:
+        experience[rng.randrange(len(experience))]["description"] += " More detail."
+    elif choice < 0.6:
+        experience.insert(rng.randrange(len(experience) + 1), {"title": f"Role {rng.random()}", "description": "", "highlights": []})
+    elif choice < 0.7 and len(experience) > 1:
+        del experience[rng.randrange(len(experience))]
+    elif choice < 0.8 and "languages" in content:
+        del content["languages"]
+    elif choice < 0.8:
+        content["languages"] = ["French"]
+    else:
+        content["summary"] = f"Summary {rng.random()}"
+    return content
+
+def timed_ms(fn, repeat: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def run(db, saves: int, interval: int) -> dict:
+    resume_history.REVISION_SNAPSHOT_INTERVAL = interval
+    rng = random.Random(1)
+    content = build_content(20_000)
+    resume = crud.create_resume(db, schemas.ResumeCreate(user_id=1, title="Bench", content=content))
+    full_bytes = len(compact_json.encode(content))
+    start = time.perf_counter()
+    for _ in range(saves):
+        content = edit(content, rng)
+        crud.update_resume(db, resume.id, 1, schemas.ResumeUpdate(content=content))
+        full_bytes += len(compact_json.encode(content))
+    save_ms = (time.perf_counter() - start) / saves * 1000
+
+    R = models.ResumeRevision
+    last = saves + 1
+    stored_bytes = db.execute(select(func.sum(func.length(R.data))).where(R.resume_id == resume.id)).scalar()
+    assert resume_history.get_revision(db, resume.id, last)[0] == content
+    return {
+        "history KB": stored_bytes / 1000,
+        "full copies KB": full_bytes / 1000,
+        "save ms": save_ms,
+        f"rebuild {last} ms": timed_ms(lambda: resume_history.get_revision(db, resume.id, last)),
+        f"rebuild {last // 2} ms": timed_ms(lambda: resume_history.get_revision(db, resume.id, last // 2)),
+    }
+
+def main():
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 999
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        results = {interval: run(db, saves, interval) for interval in INTERVALS}
+        print(f"{saves + 1} revisions of a ~20KB resume, by snapshot interval")
+        print(f"{'':<18}" + "".join(f"{interval:>10}" for interval in INTERVALS))
+        for name in results[INTERVALS[0]]:
+            print(f"{name:<18}" + "".join(f"{results[interval][name]:>10.2f}" for interval in INTERVALS))
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Latency of recruiter searches over a large synthetic resume index.
+
+Populates the search side tables directly (as indexing would) in a temporary
+SQLite database, then times representative queries.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_search [resume_count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import Base
+from ..search_index import parse_query, search_resumes
+from ..skills import SKILL_TAXONOMY
+
+CITIES = ["austin", "boston", "seattle", "denver", "chicago", "new york", "remote", "atlanta"]
+TITLES = ["engineer", "developer", "senior", "staff", "manager", "analyst", "architect", "lead"]
+QUERIES = [
+    "Python + Kubernetes in Austin",
+    "react + node.js in Seattle",
+    "java, spring, senior",
+    "machine learning + aws + python",
+]
+BATCH_SIZE = 20_000
+
+def populate(db: Session, count: int) -> None:
+    rng = random.Random(42)
+    docs, terms = [], []
+    for resume_id in range(1, count + 1):
+        city = rng.choice(CITIES)
+        docs.append({
+            "resume_id": resume_id, "user_id": resume_id, "headline": "Engineer", "location": city,
+            "years_experience": rng.randint(0, 25), "fields_hash": ""
+        })
+        for skill in rng.sample(SKILL_TAXONOMY, rng.randint(3, 10)):
+            terms.append({"field": "skill", "term": skill, "resume_id": resume_id})
+        for title in rng.sample(TITLES, 2):
+            terms.append({"field": "title", "term": title, "resume_id": resume_id})
+        for token in city.split():
+            terms.append({"field": "location", "term": token, "resume_id": resume_id})
+        if len(docs) >= BATCH_SIZE:
+            db.execute(insert(models.ResumeSearchDoc), docs)
+            db.execute(insert(models.ResumeSearchTerm), terms)
+            docs, terms = [], []
+    if docs:
+        db.execute(insert(models.ResumeSearchDoc), docs)
+        db.execute(insert(models.ResumeSearchTerm), terms)
+    db.commit()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        Base.metadata.create_all(engine, tables=[
+            models.User.__table__, models.Resume.__table__,
+            models.ResumeSearchDoc.__table__, models.ResumeSearchTerm.__table__
+        ])
+        with Session(engine) as db:
+            start = time.perf_counter()
+            populate(db, count)
+            print(f"indexed {count} resumes in {time.perf_counter() - start:.1f}s")
+            for query in QUERIES:
+                skills, keywords, location = parse_query(query)
+                search_resumes(db, skills, keywords, location)  # warm up
+                runs = 10
+                start = time.perf_counter()
+                for _ in range(runs):
+                    results = search_resumes(db, skills, keywords, location)
+                elapsed_ms = (time.perf_counter() - start) / runs * 1000
+                print(f"{query:<36} {elapsed_ms:8.1f} ms  ({len(results)} results)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Per-response CPU cost of serializing a ~50KB resume.
+
+Compares the default FastAPI path (response_model validation, jsonable_encoder,
+stdlib json) against the pre-serialized orjson path used by the read endpoints.
+
+Run from the server directory:
+    python -m python_api.benchmarks.bench_serialization
+"""
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from .. import schemas
+from ..serialization import dump_content, resume_to_json
+
+ITERATIONS = 2000
+
+def build_content(target_bytes: int = 50_000) -> dict:
+    """Build a realistic resume content blob of roughly target_bytes"""
+    content = {
+        "personalInfo": {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100",
+                         "location": "Austin, TX", "website": "", "linkedin": ""},
+        "summary": "Backend engineer focused on distributed systems. " * 10,
+        "education": [], "experience": [], "skills": [], "certifications": [],
+        "languages": [], "projects": []
+    }
+    i = 0
+    while len(json.dumps(content)) < target_bytes:
+        content["experience"].append({
+            "title": f"Senior Engineer {i}", "company": f"Company {i}", "location": "Remote",
+            "startDate": "2019-01", "endDate": "2021-06",
+            "description": "Built and operated services handling millions of requests per day. " * 4,
+            "highlights": [f"Shipped feature {i}-{j} with measurable impact" for j in range(5)]
+        })
+        content["skills"].append({"name": f"skill-{i}", "proficiency": 3})
+        i += 1
+    return content
+
+def build_row(content: dict) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=1, user_id=1, title="Benchmark resume", template="professional",
+        content=content, content_json=dump_content(content),
+        created_at=now, updated_at=now,
+        file_path=None, file_name=None, file_type=None, file_size=None
+    )
+
+def bench(label: str, fn, row) -> float:
+    fn(row)  # warm up
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        body = fn(row)
+    per_call_us = (time.process_time() - start) / ITERATIONS * 1e6
+    print(f"{label:<28} {per_call_us:10.1f} us/response  ({len(body)} bytes)")
+    return per_call_us
+
+def stdlib_path(row) -> bytes:
+    """What FastAPI does for a response_model endpoint returning an ORM object"""
+    validated = schemas.ResumeResponse.model_validate(row, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+def main():
+    row = build_row(build_content())
+    print(f"content size: {len(row.content_json)} bytes, {ITERATIONS} iterations")
+    before = bench("pydantic + stdlib json", stdlib_path, row)
+    after = bench("pre-serialized orjson", resume_to_json, row)
+    print(f"speedup: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compact binary storage for large JSON columns.
+
+Resume.content and ResumeUpload.parsed_data are mostly the same keys repeated
+per entry ("startDate", "highlights", ...). CompactJSON stores them as orjson
+bytes deflated with a preset dictionary of those keys, so even a small
+document compresses well, behind a one-byte format prefix:
+
+    0x00  raw JSON bytes (values under COMPACT_JSON_MIN_SIZE, or
+          COMPACT_JSON_LEVEL=0)
+    0x01  raw deflate of the JSON with DICTIONARY_V1 as preset dictionary
+
+Values without a known prefix are read as plain JSON text, so rows written
+before a column was converted still load. The column type is transparent to
+crud.py and the pydantic schemas: it takes and returns the same dicts as JSON.
+
+Keys are sorted before encoding, so the inflated bytes are the canonical JSON
+text of the value. CompactJSONText reads a column back as that text without
+parsing it, which is how Resume.content_json is derived from Resume.content
+instead of being stored a second time.
+
+The dictionary is part of the stored format: never edit DICTIONARY_V1, add a
+DICTIONARY_V2 with a new prefix instead.
+"""
+import os
+import zlib
+from typing import Any, Optional
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+load_dotenv()
+
+COMPACT_JSON_LEVEL = int(os.getenv("COMPACT_JSON_LEVEL", "6"))
+COMPACT_JSON_MIN_SIZE = int(os.getenv("COMPACT_JSON_MIN_SIZE", "64"))
+
+FORMAT_RAW = 0x00
+FORMAT_DEFLATE_V1 = 0x01
+
+# Fragments seen in nearly every document, as orjson writes them. zlib favours
+# matches near the end of the dictionary, so the most common ones come last.
+DICTIONARY_V1 = b"".join([
+    b'"certifications":[],"languages":[],"projects":[]',
+    b'"url":"","highlights":[]},{"name":"',
+    b'"institution":"","degree":"","fieldOfStudy":"","gpa":"",',
+    b'"personal_info":{"name":"","email":"","phone":"","location":"","website":"","linkedin":""},',
+    b'"education":[{"institution":"',
+    b'"start_date":"","end_date":"","description":"',
+    b'"experience":[{"title":"',
+    b'"skills":[{"name":"',
+    b'"personalInfo":{"name":"","email":"","phone":"","location":"","website":"","linkedin":""},"summary":"',
+    b'"present","Present","Remote","2019","2020","2021","2022","2023","2024","2025",',
+    b'"}],"',
+    b'","proficiency":3},{"name":"',
+    b'"title":"","company":"","location":"","startDate":"","endDate":"","description":"',
+    b'","highlights":["',
+    b'"],"startDate":"","endDate":"","description":"","highlights":[]},{"title":"',
+])
+
+def encode(value: Any, level: int = COMPACT_JSON_LEVEL) -> bytes:
+    """Encode a JSON-compatible value in the compact format"""
+    raw = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    if level <= 0 or len(raw) < COMPACT_JSON_MIN_SIZE:
+        return bytes([FORMAT_RAW]) + raw
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=DICTIONARY_V1)
+    packed = compressor.compress(raw) + compressor.flush()
+    if len(packed) >= len(raw):
+        return bytes([FORMAT_RAW]) + raw
+    return bytes([FORMAT_DEFLATE_V1]) + packed
+
+def decode_bytes(data: bytes) -> bytes:
+    """JSON bytes of a value written by encode() (or plain JSON text), without parsing them"""
+    data = bytes(data)
+    if not data:
+        return b"null"
+    fmt = data[0]
+    if fmt == FORMAT_RAW:
+        return data[1:]
+    if fmt == FORMAT_DEFLATE_V1:
+        decompressor = zlib.decompressobj(-15, zdict=DICTIONARY_V1)
+        return decompressor.decompress(data[1:]) + decompressor.flush()
+    return data
+
+def decode(data: bytes) -> Any:
+    """Decode a value written by encode() (or plain JSON text)"""
+    return orjson.loads(decode_bytes(data))
+
+class CompactJSON(TypeDecorator):
+    """JSON value stored in a binary column as compact (dictionary-deflated) bytes"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return decode(value)
+
+class CompactJSONText(TypeDecorator):
+    """Read a CompactJSON column as its canonical JSON text (for column_property/type_coerce)"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode(orjson.loads(value))
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decode_bytes(value).decode("utf-8")
@@ -0,0 +1,294 @@
+"""
+Response compression middleware.
+
+Compresses JSON and text responses with the best encoding the client accepts
+(brotli when the brotli package is installed, else gzip). Responses below
+COMPRESSION_MIN_SIZE bytes, already-encoded responses, partial content and
+binary types (PDF, DOCX, zip) are passed through untouched.
+
+Single-message responses are compressed in one go. Compressed bodies of
+responses under COMPRESSION_CACHE_PATHS are kept in an LRU keyed by a digest
+of the uncompressed body, so repeated job searches returning the same page
+only pay for hashing. Streamed responses are compressed incrementally and
+flushed per chunk so clients still see data as it is produced.
+
+CPU time spent compressing and bytes saved are reported at
+/internal/stats/compression.
+"""
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip only without it
+    brotli = None
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024)))
+COMPRESSION_CACHE_PATHS = tuple(
+    p for p in os.getenv("COMPRESSION_CACHE_PATHS", "/api/jobs").split(",") if p
+)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson", "application/javascript")
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip_compress(data)
+
+def gzip_compress(data: bytes, level: int = GZIP_LEVEL) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return compressor.compress(data) + compressor.flush()
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class CompressionStats:
+    """Per-worker counters of compression work"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.responses = 0
+        self.streamed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record(self, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.cpu_seconds += cpu_seconds
+
+    def count(self, streamed: bool = False, cache_hit: Optional[bool] = None) -> None:
+        with self._lock:
+            self.responses += 1
+            self.streamed += streamed
+            if cache_hit is True:
+                self.cache_hits += 1
+            elif cache_hit is False:
+                self.cache_misses += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            saved = self.bytes_in - self.bytes_out
+            return {
+                "responses": self.responses,
+                "streamed": self.streamed,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": saved,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+                "cpu_seconds": self.cpu_seconds,
+                "cpu_ms_per_mb_saved": 1000 * self.cpu_seconds / (saved / 1e6) if saved > 0 else 0.0,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+            }
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by (encoding, body digest), bounded by total bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes // 4:
+            return  # Never let one response flush the whole cache
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+compression_stats = CompressionStats()
+compressed_cache = CompressedCache(COMPRESSION_CACHE_BYTES)
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses (see module docstring)"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        use_cache = scope.get("path", "").startswith(COMPRESSION_CACHE_PATHS)
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size, use_cache))
+
+class _CompressingSend:
+    """Wraps send for one response, deciding on compression at the first body message"""
+
+    def __init__(self, send, encoding: str, minimum_size: int, use_cache: bool):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.use_cache = use_cache
+        self.start_message = None
+        self.started = False
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    def _eligible(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        if self.start_message["status"] in (204, 206, 304) or _header(headers, b"content-encoding"):
+            return False
+        if _header(headers, b"content-range"):
+            return False
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compressed_headers(self, length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers = []
+        for key, value in self.start_message["headers"]:
+            name = key.lower()
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                # The compressed body differs byte-wise, so the validator becomes weak
+                value = b"W/" + value
+            headers.append((key, value))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        vary = _header(headers, b"vary")
+        if vary is None:
+            headers.append((b"vary", b"Accept-Encoding"))
+        elif b"accept-encoding" not in vary.lower():
+            headers = [(k, v + b", Accept-Encoding" if k.lower() == b"vary" else v) for k, v in headers]
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return headers
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._eligible(list(message.get("headers") or []))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if not more_body:
+                await self._send_whole(body)
+                return
+            self.stream = _StreamCompressor(self.encoding)
+            compression_stats.count(streamed=True)
+            await self.send({**self.start_message, "headers": self._compressed_headers(None)})
+        await self._send_chunk(body, more_body)
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) < self.minimum_size:
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        compressed, cache_hit = None, None
+        if self.use_cache:
+            key = (self.encoding, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = compressed_cache.get(key)
+            cache_hit = compressed is not None
+        if compressed is None:
+            started = time.thread_time()
+            compressed = compress(body, self.encoding)
+            compression_stats.record(len(body), len(compressed), time.thread_time() - started)
+            if self.use_cache:
+                compressed_cache.put(key, compressed)
+        else:
+            compression_stats.record(len(body), len(compressed), 0.0)
+        compression_stats.count(cache_hit=cache_hit)
+        await self.send({**self.start_message, "headers": self._compressed_headers(len(compressed))})
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, body: bytes, more_body: bool) -> None:
+        started = time.thread_time()
+        out = self.stream.chunk(body, final=not more_body)
+        compression_stats.record(len(body), len(out), time.thread_time() - started)
+        await self.send({"type": "http.response.body", "body": out, "more_body": more_body})
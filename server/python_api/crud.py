@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, desc, select, union
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timezone
 import os
-from . import models, schemas
+import orjson
+from . import models, schemas, search_index, job_index, skill_profile, upload_archive, resume_history
+from .resume_cache import resume_cache
 
 # Resume Upload CRUD operations
 def create_resume_upload(db: Session, upload: schemas.ResumeUploadCreate, file_path: str) -> models.ResumeUpload:
@@ -21,14 +25,22 @@ def create_resume_upload(db: Session, upload: schemas.ResumeUploadCreate, file_p
     return db_upload
 
 def get_resume_upload(db: Session, upload_id: int) -> Optional[models.ResumeUpload]:
-    """Get a specific resume upload by ID"""
-    return db.query(models.ResumeUpload).filter(models.ResumeUpload.id == upload_id).first()
+    """Get a specific resume upload by ID, with archived parsed_data loaded back"""
+    db_upload = db.query(models.ResumeUpload).filter(models.ResumeUpload.id == upload_id).first()
+    upload_archive.rehydrate([db_upload])
+    return db_upload
+
+def get_resume_upload_version(db: Session, upload_id: int) -> Optional[int]:
+    """Get only the version counter of a resume upload (no JSON columns loaded)"""
+    return db.query(models.ResumeUpload.version).filter(models.ResumeUpload.id == upload_id).scalar()
 
 def get_resume_uploads_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.ResumeUpload]:
     """Get all resume uploads for a user"""
-    return db.query(models.ResumeUpload).filter(models.ResumeUpload.user_id == user_id).order_by(
+    uploads = db.query(models.ResumeUpload).filter(models.ResumeUpload.user_id == user_id).order_by(
         desc(models.ResumeUpload.upload_date)
     ).offset(skip).limit(limit).all()
+    upload_archive.rehydrate(uploads)
+    return uploads
 
 def update_resume_upload(db: Session, upload_id: int, upload: schemas.ResumeUploadUpdate) -> Optional[models.ResumeUpload]:
     """Update a resume upload record"""
@@ -39,9 +51,14 @@ def update_resume_upload(db: Session, upload_id: int, upload: schemas.ResumeUplo
     update_data = upload.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_upload, key, value)
+    if "parsed_data" in update_data:
+        # New parsed data is stored inline again; the next archive run moves it back out
+        db_upload.parsed_data_ref = None
+        db_upload.archived_at = None
     
     db.commit()
     db.refresh(db_upload)
+    upload_archive.rehydrate([db_upload])
     return db_upload
 
 def delete_resume_upload(db: Session, upload_id: int) -> bool:
@@ -56,6 +73,7 @@ def delete_resume_upload(db: Session, upload_id: int) -> bool:
             os.remove(db_upload.file_path)
         except Exception:
             pass  # We still want to delete the DB record even if file deletion fails
+    upload_archive.delete_archived(db_upload)
     
     db.delete(db_upload)
     db.commit()
@@ -66,16 +84,51 @@ def create_resume(db: Session, resume: schemas.ResumeCreate) -> models.Resume:
     """Create a new resume"""
     db_resume = models.Resume(**resume.dict())
     db.add(db_resume)
+    db.flush()
+    resume_history.record_revision(db, db_resume.id, db_resume.version, None, resume.content)
+    search_index.index_resume(db, db_resume.id, db_resume.user_id, resume.content)
+    skill_profile.refresh_profile(db, db_resume.user_id)
     db.commit()
     db.refresh(db_resume)
+    resume_cache.invalidate(db_resume.id, db_resume.user_id)
     return db_resume
 
 def get_resume(db: Session, resume_id: int, user_id: Optional[int] = None) -> Optional[models.Resume]:
     """Get a specific resume by ID, optionally filtering by user_id for security"""
+    # Validate against the current version stamp so other workers' writes are seen
+    stamp_query = db.query(models.Resume.version, models.Resume.created_at).filter(models.Resume.id == resume_id)
+    if user_id is not None:
+        stamp_query = stamp_query.filter(models.Resume.user_id == user_id)
+    stamp = stamp_query.first()
+    if stamp is None:
+        return None
+    stamp = tuple(stamp)
+    
+    key = (resume_id, user_id)
+    cached = resume_cache.get(key, stamp)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    
     query = db.query(models.Resume).filter(models.Resume.id == resume_id)
     if user_id is not None:
         query = query.filter(models.Resume.user_id == user_id)
-    return query.first()
+    db_resume = query.first()
+    if db_resume is None:
+        return None
+    # content and content_json share one stored column; parse the text already loaded
+    set_committed_value(db_resume, "content", orjson.loads(db_resume.content_json))
+    
+    # Cache a detached instance and hand the caller a session-bound copy
+    db.expunge(db_resume)
+    resume_cache.put(key, (db_resume.version, db_resume.created_at), db_resume)
+    return db.merge(db_resume, load=False)
+
+def get_resume_version(db: Session, resume_id: int, user_id: Optional[int] = None) -> Optional[int]:
+    """Get only the version counter of a resume (no JSON columns loaded)"""
+    query = db.query(models.Resume.version).filter(models.Resume.id == resume_id)
+    if user_id is not None:
+        query = query.filter(models.Resume.user_id == user_id)
+    return query.scalar()
 
 def get_resumes_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Resume]:
     """Get all resumes for a user"""
@@ -90,11 +143,19 @@ def update_resume(db: Session, resume_id: int, user_id: int, resume: schemas.Res
         return None
     
     update_data = resume.dict(exclude_unset=True)
+    previous = db_resume.content
     for key, value in update_data.items():
         setattr(db_resume, key, value)
+    if "content" in update_data:
+        # Write the resume first: its bumped version numbers the revision
+        db.flush()
+        resume_history.record_revision(db, resume_id, db_resume.version, previous, update_data["content"])
+        if search_index.index_resume(db, resume_id, db_resume.user_id, update_data["content"]):
+            skill_profile.refresh_profile(db, db_resume.user_id)
     
     db.commit()
     db.refresh(db_resume)
+    resume_cache.invalidate(resume_id, user_id)
     return db_resume
 
 def delete_resume(db: Session, resume_id: int, user_id: int) -> bool:
@@ -103,10 +164,137 @@ def delete_resume(db: Session, resume_id: int, user_id: int) -> bool:
     if not db_resume:
         return False
     
+    search_index.remove_resume(db, resume_id)
+    skill_profile.refresh_profile(db, user_id)
+    resume_history.delete_history(db, resume_id)
     db.delete(db_resume)
     db.commit()
+    resume_cache.invalidate(resume_id, user_id)
     return True
 
+# Job CRUD operations
+def create_job(db: Session, job: schemas.JobCreate) -> models.Job:
+    """Create a job and add it to the skill index"""
+    db_job = models.Job(**job.dict())
+    db.add(db_job)
+    db.flush()
+    job_index.index_jobs(db, [db_job])
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_job(db: Session, job_id: int) -> Optional[models.Job]:
+    """Get a stored job by ID"""
+    return db.query(models.Job).filter(models.Job.id == job_id).first()
+
+def get_job_by_external_id(db: Session, source: str, external_id: str) -> Optional[models.Job]:
+    """Get a stored job by its id at the source it was ingested from"""
+    return db.query(models.Job).filter(
+        models.Job.source == source, models.Job.external_id == external_id
+    ).first()
+
+def expire_jobs(db: Session) -> int:
+    """Drop expired jobs from the skill index and delete the ones nobody saved or applied to"""
+    now = datetime.now(timezone.utc)
+    job_index.remove_expired(db, now)
+    referenced = union(select(models.SavedJob.job_id), select(models.Application.job_id))
+    deleted = db.query(models.Job).filter(
+        models.Job.expires_at <= now,
+        models.Job.id.notin_(referenced)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def upsert_insert(db: Session, model):
+    """Dialect-specific insert() of model supporting ON CONFLICT (Postgres and SQLite)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(model)
+
+def bulk_upsert(db: Session, model, rows: List[Dict[str, Any]], conflict_columns: List[str], update_columns: List[str]) -> None:
+    """
+    Insert rows in a single multi-row INSERT ... ON CONFLICT DO UPDATE statement (caller commits)
+    
+    Args:
+        model: Mapped class to insert into
+        rows: Column values per row
+        conflict_columns: Columns of the unique constraint that identifies a row
+        update_columns: Columns overwritten when the row already exists
+    """
+    if not rows:
+        return
+    stmt = upsert_insert(db, model).values(rows)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    db.execute(stmt)
+
+# Saved job and application CRUD operations
+def save_jobs(db: Session, user_id: int, job_ids: List[int]) -> int:
+    """Save jobs for a user in one statement; already saved jobs are left untouched"""
+    rows = [{"user_id": user_id, "job_id": job_id} for job_id in dict.fromkeys(job_ids)]
+    bulk_upsert(db, models.SavedJob, rows, ["user_id", "job_id"], [])
+    db.commit()
+    return len(rows)
+
+def unsave_jobs(db: Session, user_id: int, job_ids: List[int]) -> int:
+    """Remove saved jobs for a user in one statement"""
+    deleted = db.query(models.SavedJob).filter(
+        models.SavedJob.user_id == user_id,
+        models.SavedJob.job_id.in_(job_ids)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def upsert_application_statuses(db: Session, bulk: schemas.BulkApplicationStatusUpdate) -> int:
+    """Create or update application statuses for many jobs in one statement"""
+    # Last update wins when a job appears twice in the batch
+    rows = {
+        update.job_id: {
+            "user_id": bulk.user_id,
+            "job_id": update.job_id,
+            "resume_id": update.resume_id or bulk.resume_id,
+            "status": update.status
+        }
+        for update in bulk.updates
+    }
+    bulk_upsert(db, models.Application, list(rows.values()), ["user_id", "job_id"], ["status"])
+    db.commit()
+    return len(rows)
+
+def get_job_states(db: Session, user_id: int, key_column, keys: List[Any], *criteria) -> Dict[Any, Tuple[bool, Optional[str]]]:
+    """
+    Saved flag and application status of a page of jobs for a user, in one query
+    
+    Args:
+        key_column: Job column identifying the jobs (Job.id or Job.external_id)
+        keys: Values of key_column to look up
+        criteria: Extra filters on jobs, e.g. the source of external ids
+    
+    Returns:
+        Dict of key -> (saved, application status or None); unknown jobs are omitted
+    """
+    if not keys:
+        return {}
+    S, A = models.SavedJob, models.Application
+    query = (
+        select(key_column, S.id.isnot(None), A.status)
+        .select_from(models.Job)
+        .outerjoin(S, and_(S.job_id == models.Job.id, S.user_id == user_id))
+        .outerjoin(A, and_(A.job_id == models.Job.id, A.user_id == user_id))
+        .where(key_column.in_(keys), *criteria)
+    )
+    return {key: (saved, status) for key, saved, status in db.execute(query)}
+
 # User CRUD operations (simplified)
 def get_user(db: Session, user_id: int) -> Optional[models.User]:
     """Get a user by ID"""
@@ -1,10 +1,18 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, Pool, QueuePool
 from dotenv import load_dotenv
 import logging
 
+from .replicas import DATABASE_REPLICA_URLS, ReplicaSet, RoutingSession, read_after
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,35 +32,184 @@ else:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Pool settings. Every worker process has its own pool, so the connections the
+# service can open are WEB_CONCURRENCY * (pool size + overflow).
+# DB_PGBOUNCER=true is for running behind pgbouncer in transaction pooling mode:
+# no server-side prepared statements, and no pool of our own unless
+# DB_POOL_MODE=queue is set explicitly.
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "null" if DB_PGBOUNCER else "queue")  # "queue" or "null"
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+def pool_sizes() -> Tuple[int, int]:
+    """
+    pool_size and max_overflow for this worker
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW win when set. Otherwise, if DB_MAX_CONNECTIONS
+    is set, that budget is split evenly across WEB_CONCURRENCY workers with two
+    thirds of each share kept open and the rest as overflow.
+    """
+    budget = os.getenv("DB_MAX_CONNECTIONS")
+    if budget:
+        share = max(1, int(budget) // max(1, int(os.getenv("WEB_CONCURRENCY", "1"))))
+        default_size = max(1, share * 2 // 3)
+        default_overflow = share - default_size
+    else:
+        default_size, default_overflow = 5, 10
+    return (
+        int(os.getenv("DB_POOL_SIZE", str(default_size))),
+        int(os.getenv("DB_MAX_OVERFLOW", str(default_overflow))),
+    )
+
+class PoolStats:
+    """Connection pool counters for this process, updated from any thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds / self.waits * 1000, 3) if self.waits else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=max(0, pool.overflow()))
+        if pool is not None:
+            stats["pool"] = type(pool).__name__
+        return stats
+
+pool_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection"""
+
+    # Log under SQLAlchemy's pool logger so echo_pool / sqlalchemy log levels still apply
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out)
+
+def engine_options(url: str, **overrides) -> Dict[str, Any]:
+    """create_engine() keyword arguments for url under the DB_* settings (overrides win)"""
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args: Dict[str, Any] = {}
+    if parsed.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; keep SQLAlchemy's default pool
+            return {**options, "connect_args": connect_args, **overrides}
+    if DB_POOL_MODE == "null":
+        options["poolclass"] = NullPool
+    else:
+        pool_size, max_overflow = pool_sizes()
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    if DB_PGBOUNCER:
+        # psycopg2 never prepares server-side; psycopg 3 and asyncpg need it turned off
+        if parsed.get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+        elif parsed.get_driver_name() == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+    if connect_args:
+        options["connect_args"] = connect_args
+    options.update(overrides)
+    if options.get("poolclass") is NullPool:
+        for name in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(name, None)
+    return options
+
+def instrument(engine) -> None:
+    """Count connects and checkouts on engine's pool into pool_stats"""
+    event.listen(engine, "connect", lambda *args: pool_stats.count("connects"))
+    event.listen(engine, "checkout", lambda *args: pool_stats.count("checkouts"))
+
 try:
     # Create SQLAlchemy engine with echo for debugging in development
     engine = create_engine(
         DATABASE_URL,
         echo=os.getenv("ENVIRONMENT") == "development",
-        pool_size=5,
-        max_overflow=10
+        **engine_options(DATABASE_URL)
     )
     # Test the connection
     with engine.connect() as conn:
-        conn.execute("SELECT 1")
+        conn.execute(text("SELECT 1"))
     logger.info("Database connection test successful")
 except Exception as e:
     logger.error(f"Error connecting to database: {str(e)}")
     # Fallback to SQLite
     DATABASE_URL = "sqlite:///./test.db"
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
     logger.warning("Using fallback SQLite database")
+instrument(engine)
+
+# Read replicas (see replicas.py); database.get_read_db sessions read from them
+replica_set = ReplicaSet([create_engine(url, **engine_options(url)) for url in DATABASE_REPLICA_URLS])
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replica_set
+)
 
 # Create base class for models
 Base = declarative_base()
 
 # Dependency to get DB session
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["request_state"] = request.scope.setdefault("state", {})
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency for handlers that only read: the same session, routed to a replica when possible
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    db.info["read_only"] = True
+    db.info["read_after"] = read_after(request)
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        for key in ("read_only", "read_after", "replica"):
+            db.info.pop(key, None)
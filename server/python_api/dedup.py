@@ -0,0 +1,91 @@
+"""
+Near-duplicate job detection with MinHash signatures and LSH banding.
+
+The same posting often comes back from several agencies with slightly edited
+descriptions. Each job's title + description is broken into word shingles and
+summarised as a MinHash signature (one-permutation hashing, so the cost is
+linear in the number of shingles). Signatures are split into bands and
+bucketed, so only jobs sharing a band are ever compared, and candidate pairs
+are confirmed by estimated Jaccard similarity before being merged.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+NUM_BINS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.6
+
+_WORD = re.compile(r"\w+")
+_EMPTY = (1 << 64) - 1
+
+Signature = Tuple[int, ...]
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+def signature(text: str) -> Signature:
+    """MinHash signature of a text's word shingles (one-permutation hashing with densification)"""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        words = words + [""] * (SHINGLE_SIZE - len(words))
+    bins = [_EMPTY] * NUM_BINS
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        h = _hash64(" ".join(words[i:i + SHINGLE_SIZE]))
+        b = h % NUM_BINS
+        value = h // NUM_BINS
+        if value < bins[b]:
+            bins[b] = value
+    # Fill empty bins from the next non-empty bin (rotation densification)
+    for b in range(NUM_BINS):
+        if bins[b] == _EMPTY:
+            for offset in range(1, NUM_BINS):
+                donor = bins[(b + offset) % NUM_BINS]
+                if donor != _EMPTY:
+                    bins[b] = donor + offset
+                    break
+    return tuple(bins)
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+def find_duplicate_groups(texts: Sequence[str], threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Group near-duplicate texts
+
+    Returns:
+        Lists of indices into texts, one per group, each in original order;
+        every text appears in exactly one group
+    """
+    signatures = [signature(text) for text in texts]
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[Tuple[int, Signature], List[int]] = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        for band in range(BANDS):
+            buckets[(band, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])].append(i)
+
+    for members in buckets.values():
+        for position, i in enumerate(members[1:], start=1):
+            for j in members[:position]:
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    break
+                if similarity(signatures[i], signatures[j]) >= threshold:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+                    break
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(texts)):
+        groups[find(i)].append(i)
+    return sorted(groups.values(), key=lambda group: group[0])
@@ -0,0 +1,214 @@
+"""
+Streaming zip export of many users' resumes.
+
+The archive holds resumes.ndjson (one ResumeResponse JSON object per line,
+ordered by resume id, as GET /resumes/{id} returns it) and each resume's
+original file under files/<resume id>/<file name>. It is written as it is
+sent: rows are read with yield_per and files in EXPORT_CHUNK_SIZE pieces, so
+neither memory nor disk use grows with the export.
+
+Downloads can be resumed with a byte range. For that the archive must be
+byte-for-byte reproducible and its length known up front, so:
+
+- entries are stored uncompressed (original files are mostly PDF/DOCX, which
+  are compressed already) with fixed timestamps
+- every entry uses zip64 records and a trailing data descriptor, so header
+  sizes do not depend on the data and CRCs can be written after it
+- plan_export() makes a dry run over the rows (and stats the files) to get the
+  length and an ETag; the ETag changes whenever the archive would
+
+Serving a range still re-reads what comes before it: the NDJSON is
+regenerated and earlier files are read for their CRCs, but none of it is sent.
+"""
+import hashlib
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from . import models
+from .serialization import resume_to_json
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "500"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", str(256 * 1024)))
+
+NDJSON_NAME = "resumes.ndjson"
+# Bump when the archive layout changes, so old ETags stop matching
+FORMAT_VERSION = 1
+
+ZIP_VERSION = 45  # zip64
+ZIP_FLAGS = 0x0808  # Data descriptor follows the data, UTF-8 names
+DOS_DATE = (1 << 5) | 1  # 1980-01-01 00:00
+EXTERNAL_ATTR = 0o100644 << 16
+ZIP64_SIZE = 0xFFFFFFFF
+LOCAL_EXTRA = struct.pack("<HHQQ", 1, 16, 0, 0)
+LOCAL_HEADER_SIZE = 30 + len(LOCAL_EXTRA)
+DESCRIPTOR_SIZE = 24
+CENTRAL_HEADER_SIZE = 46 + 28
+END_RECORDS_SIZE = 56 + 20 + 22
+
+class ExportChanged(RuntimeError):
+    """The rows or files changed between planning an export and streaming it"""
+
+@dataclass
+class ExportPlan:
+    user_ids: List[int]
+    ndjson_size: int = 0
+    ndjson_crc: int = 0
+    files: List[Tuple[str, str, int]] = field(default_factory=list)  # (archive name, path, size)
+    etag: str = ""
+    size: int = 0
+
+def _resumes(db: Session, user_ids: Sequence[int]):
+    return (
+        db.query(models.Resume)
+        .filter(models.Resume.user_id.in_(user_ids))
+        .order_by(models.Resume.id)
+        .yield_per(EXPORT_YIELD_PER)
+    )
+
+def _archive_name(db_resume: models.Resume) -> str:
+    name = os.path.basename((db_resume.file_name or db_resume.file_path).replace("\\", "/")) or "file"
+    return f"files/{db_resume.id}/{name}"
+
+def _entry_size(name: str, size: int) -> int:
+    name_size = len(name.encode("utf-8"))
+    return LOCAL_HEADER_SIZE + name_size + size + DESCRIPTOR_SIZE + CENTRAL_HEADER_SIZE + name_size
+
+def plan_export(db: Session, user_ids: Sequence[int]) -> ExportPlan:
+    """Dry run of an export: its length, ETag and the files it contains"""
+    plan = ExportPlan(user_ids=sorted(set(user_ids)))
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{plan.user_ids}".encode())
+    for db_resume in _resumes(db, plan.user_ids):
+        line = resume_to_json(db_resume) + b"\n"
+        plan.ndjson_size += len(line)
+        plan.ndjson_crc = zlib.crc32(line, plan.ndjson_crc)
+        if db_resume.file_path:
+            try:
+                stat = os.stat(db_resume.file_path)
+            except OSError:
+                logger.warning(f"Export skips missing file of resume {db_resume.id}: {db_resume.file_path}")
+                continue
+            name = _archive_name(db_resume)
+            plan.files.append((name, db_resume.file_path, stat.st_size))
+            digest.update(f"|{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    digest.update(f"|{plan.ndjson_size}:{plan.ndjson_crc}".encode())
+    plan.etag = f'"resumes-export-{digest.hexdigest()[:32]}"'
+    plan.size = _entry_size(NDJSON_NAME, plan.ndjson_size) + END_RECORDS_SIZE + sum(
+        _entry_size(name, size) for name, _, size in plan.files
+    )
+    return plan
+
+def _local_header(name: bytes) -> bytes:
+    return struct.pack(
+        "<IHHHHHIIIHH", 0x04034B50, ZIP_VERSION, ZIP_FLAGS, 0, 0, DOS_DATE,
+        0, ZIP64_SIZE, ZIP64_SIZE, len(name), len(LOCAL_EXTRA),
+    ) + name + LOCAL_EXTRA
+
+def _descriptor(crc: int, size: int) -> bytes:
+    return struct.pack("<IIQQ", 0x08074B50, crc, size, size)
+
+def _central_header(name: bytes, crc: int, size: int, offset: int) -> bytes:
+    return struct.pack(
+        "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | ZIP_VERSION, ZIP_VERSION, ZIP_FLAGS, 0, 0, DOS_DATE,
+        crc, ZIP64_SIZE, ZIP64_SIZE, len(name), 28, 0, 0, 0, EXTERNAL_ATTR, ZIP64_SIZE,
+    ) + name + struct.pack("<HHQQQ", 1, 24, size, size, offset)
+
+def _end_records(entries: int, directory_offset: int, directory_size: int) -> bytes:
+    zip64_offset = directory_offset + directory_size
+    return (
+        struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, ZIP_VERSION, ZIP_VERSION, 0, 0,
+                    entries, entries, directory_size, directory_offset)
+        + struct.pack("<IIQI", 0x07064B50, 0, zip64_offset, 1)
+        + struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, 0xFFFF, 0xFFFF, ZIP64_SIZE, ZIP64_SIZE, 0)
+    )
+
+def _ndjson_chunks(db: Session, user_ids: Sequence[int]) -> Iterator[bytes]:
+    buffer = []
+    buffered = 0
+    for db_resume in _resumes(db, user_ids):
+        line = resume_to_json(db_resume) + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= EXPORT_CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+def _file_chunks(path: str) -> Iterator[bytes]:
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        raise ExportChanged(f"{path} is no longer readable") from e
+    with f:
+        while chunk := f.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+
+def iter_archive(db: Session, plan: ExportPlan, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Stream bytes [start, end) of the archive described by plan
+
+    Raises:
+        ExportChanged: if the data no longer matches the plan (the response is cut short)
+    """
+    end = plan.size if end is None else end
+    position = 0
+
+    def window(data: bytes) -> bytes:
+        """The part of data (at the current position) inside [start, end)"""
+        nonlocal position
+        chunk = data[max(start - position, 0):max(end - position, 0)]
+        position += len(data)
+        return chunk
+
+    entries = [(NDJSON_NAME, None, plan.ndjson_size)] + list(plan.files)
+    directory = []
+    for name, path, size in entries:
+        if position >= end:
+            return
+        encoded_name = name.encode("utf-8")
+        offset = position
+        if chunk := window(_local_header(encoded_name)):
+            yield chunk
+        chunks = _ndjson_chunks(db, plan.user_ids) if path is None else _file_chunks(path)
+        if position < end and (position + size > start or size == 0):
+            crc = written = 0
+            for data in chunks:
+                crc = zlib.crc32(data, crc)
+                written += len(data)
+                if chunk := window(data):
+                    yield chunk
+            if written != size or (path is None and crc != plan.ndjson_crc):
+                raise ExportChanged(f"{name} changed since the export was planned")
+        elif position >= end:
+            return
+        elif path is None:
+            position += size
+            crc = plan.ndjson_crc
+        else:
+            # Before the range, but its CRC is still needed for the descriptor and central directory
+            position += size
+            crc = 0
+            for data in chunks:
+                crc = zlib.crc32(data, crc)
+        directory.append((encoded_name, offset, crc, size))
+        if chunk := window(_descriptor(crc, size)):
+            yield chunk
+
+    directory_offset = position
+    for encoded_name, offset, crc, size in directory:
+        if chunk := window(_central_header(encoded_name, crc, size, offset)):
+            yield chunk
+    if chunk := window(_end_records(len(directory), directory_offset, position - directory_offset)):
+        yield chunk
@@ -0,0 +1,80 @@
+"""
+HTTP caching helpers: strong ETags, conditional GET and byte range handling.
+
+ETags are derived from the row's version counter, which SQLAlchemy bumps on
+every update, so a conditional request can be answered from a single indexed
+lookup of the version column without loading or serializing the row.
+"""
+import os
+import re
+from typing import Optional, Tuple
+from fastapi import Response, status
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+class RangeNotSatisfiable(Exception):
+    """A Range header that selects no bytes of the resource"""
+
+# Private: responses are per-user. no-cache: browsers/CDNs must revalidate with the ETag.
+CACHE_CONTROL = os.getenv("RESOURCE_CACHE_CONTROL", "private, no-cache")
+
+def make_etag(kind: str, resource_id: int, version: int) -> str:
+    """Build a strong ETag for a versioned resource"""
+    return f'"{kind}-{resource_id}-v{version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the cache validators"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+def set_cache_headers(response: Response, etag: str) -> Response:
+    """Attach ETag and Cache-Control headers to a full response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    The [start, end) byte range a Range header asks for, or None to send the whole resource
+    
+    Only single ranges are supported; anything else is ignored, which RFC 9110 allows.
+    
+    Raises:
+        RangeNotSatisfiable: if the range starts past the end of the resource
+    """
+    match = RANGE_PATTERN.fullmatch(range_header.strip()) if range_header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+        if last and int(last) < start:
+            return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
@@ -0,0 +1,216 @@
+"""
+Background job ingestion service.
+
+Walks a configured list of popular query/location combinations against the
+Adzuna API, newest postings first, fetching several pages concurrently. Each
+query keeps a high-water mark (the newest posting seen) so later runs stop as
+soon as they reach postings already stored. New postings are de-duplicated,
+bulk upserted into the jobs table with INSERT ... ON CONFLICT, and added to the
+job skill index; jobs past expires_at are expired at the end of each run.
+
+Run as a separate process from the server directory:
+    python -m python_api.ingestion            # loop every INGEST_INTERVAL_SECONDS
+    python -m python_api.ingestion --once     # single pass
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from . import adzuna, crud, job_index, models
+from .database import SessionLocal
+from .dedup import find_duplicate_groups
+from .skills import extract_skills
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "what|where" pairs separated by ";"
+INGEST_QUERIES = os.getenv(
+    "INGEST_QUERIES",
+    "software engineer|;data scientist|;frontend developer|;devops engineer|;product manager|"
+)
+INGEST_COUNTRY = os.getenv("INGEST_COUNTRY", "us")
+INGEST_MAX_PAGES = int(os.getenv("INGEST_MAX_PAGES", "10"))
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "4"))
+INGEST_INTERVAL_SECONDS = int(os.getenv("INGEST_INTERVAL_SECONDS", "3600"))
+JOB_TTL_DAYS = int(os.getenv("JOB_TTL_DAYS", "30"))
+RESULTS_PER_PAGE = 50
+SOURCE = adzuna.SOURCE
+
+# Columns refreshed when an already stored posting is fetched again
+UPSERT_UPDATE_COLUMNS = ["title", "company", "location", "type", "description", "skills", "apply_url", "expires_at"]
+
+def parse_queries(value: str) -> List[Tuple[str, str]]:
+    """Parse INGEST_QUERIES into (what, where) pairs"""
+    queries = []
+    for item in value.split(";"):
+        if item.strip():
+            what, _, where = item.partition("|")
+            queries.append((what.strip(), where.strip()))
+    return queries
+
+def parse_created(value: Optional[str]) -> Optional[datetime]:
+    """Parse Adzuna's ISO 8601 "created" timestamp"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def to_job_row(result: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Map an Adzuna search result onto a jobs table row"""
+    description = result.get("description", "")
+    posted_at = parse_created(result.get("created")) or now
+    return {
+        "source": SOURCE,
+        "external_id": str(result.get("id", "")),
+        "title": result.get("title", ""),
+        "company": result.get("company", {}).get("display_name", "Unknown Company"),
+        "location": result.get("location", {}).get("display_name", ""),
+        "type": result.get("contract_type") or "Not specified",
+        "description": description,
+        "skills": extract_skills(description),
+        "apply_url": result.get("redirect_url", ""),
+        "posted_at": posted_at,
+        "expires_at": posted_at + timedelta(days=JOB_TTL_DAYS),
+    }
+
+async def fetch_new_results(
+    client: httpx.AsyncClient,
+    country: str,
+    what: str,
+    where: str,
+    high_water_mark: Optional[datetime],
+) -> List[Dict[str, Any]]:
+    """Fetch postings newer than the high-water mark, several pages at a time"""
+    params = adzuna.build_search_params(what or None, where or None, results_per_page=RESULTS_PER_PAGE)
+    params["sort_by"] = "date"
+    if high_water_mark:
+        params["max_days_old"] = max(1, (datetime.now(timezone.utc) - high_water_mark).days + 1)
+
+    results: List[Dict[str, Any]] = []
+    page = 1
+    while page <= INGEST_MAX_PAGES:
+        pages = range(page, min(page + INGEST_CONCURRENCY, INGEST_MAX_PAGES + 1))
+        batches = await asyncio.gather(*(adzuna.fetch_page(client, country, p, params) for p in pages))
+        reached_end = False
+        for data in batches:
+            page_results = data.get("results", [])
+            for result in page_results:
+                created = parse_created(result.get("created"))
+                if high_water_mark and created and created <= high_water_mark:
+                    reached_end = True  # Everything from here on is already stored
+                else:
+                    results.append(result)
+            if len(page_results) < RESULTS_PER_PAGE:
+                reached_end = True
+        if reached_end:
+            break
+        page += INGEST_CONCURRENCY
+    return results
+
+def store_jobs(db: Session, results: List[Dict[str, Any]], collapse: bool = True) -> int:
+    """
+    De-duplicate, bulk upsert and index fetched postings. Returns rows written.
+    
+    collapse=False keeps near-duplicates too, for pages whose alternates are shown to users.
+    """
+    now = datetime.now(timezone.utc)
+    rows_by_id = {}
+    for result in results:
+        row = to_job_row(result, now)
+        if row["external_id"]:
+            rows_by_id.setdefault(row["external_id"], row)
+    rows = list(rows_by_id.values())
+    if collapse:
+        # Keep only the first posting of each near-duplicate group
+        groups = find_duplicate_groups([f"{row['title']} {row['description']}" for row in rows])
+        rows = [rows[group[0]] for group in groups]
+    if not rows:
+        return 0
+
+    crud.bulk_upsert(db, models.Job, rows, ["source", "external_id"], UPSERT_UPDATE_COLUMNS)
+    jobs = db.query(models.Job).filter(
+        models.Job.source == SOURCE,
+        models.Job.external_id.in_([row["external_id"] for row in rows])
+    ).all()
+    job_index.reindex_jobs(db, jobs)
+    db.commit()
+    return len(rows)
+
+async def sync_query(client: httpx.AsyncClient, db: Session, country: str, what: str, where: str) -> int:
+    """Pull new postings for one query and advance its high-water mark"""
+    state = db.get(models.IngestionState, (what, where, country))
+    if state is None:
+        state = models.IngestionState(query=what, location=where, country=country)
+        db.add(state)
+    high_water_mark = state.high_water_mark
+    if high_water_mark is not None and high_water_mark.tzinfo is None:
+        high_water_mark = high_water_mark.replace(tzinfo=timezone.utc)
+
+    results = await fetch_new_results(client, country, what, where, high_water_mark)
+    stored = store_jobs(db, results)
+
+    created = [c for c in (parse_created(r.get("created")) for r in results) if c]
+    if created and (high_water_mark is None or max(created) > high_water_mark):
+        state.high_water_mark = max(created)
+    state.last_run_at = datetime.now(timezone.utc)
+    db.commit()
+    return stored
+
+async def run_once(
+    session_factory=SessionLocal,
+    client: Optional[httpx.AsyncClient] = None,
+    queries: Optional[List[Tuple[str, str]]] = None,
+    country: str = INGEST_COUNTRY,
+) -> Dict[str, int]:
+    """Run one ingestion pass over all queries, then expire old jobs"""
+    queries = queries if queries is not None else parse_queries(INGEST_QUERIES)
+    owns_client = client is None
+    client = client or httpx.AsyncClient(timeout=30)
+    stats = {"stored": 0, "failed_queries": 0, "expired": 0}
+    db = session_factory()
+    try:
+        for what, where in queries:
+            try:
+                stats["stored"] += await sync_query(client, db, country, what, where)
+            except (adzuna.AdzunaError, httpx.HTTPError) as e:
+                db.rollback()
+                stats["failed_queries"] += 1
+                logger.error(f"Error ingesting jobs for '{what}' in '{where}': {str(e)}")
+        stats["expired"] = crud.expire_jobs(db)
+    finally:
+        db.close()
+        if owns_client:
+            await client.aclose()
+    logger.info(f"Ingestion run finished: {stats}")
+    return stats
+
+async def run_forever(interval_seconds: int = INGEST_INTERVAL_SECONDS) -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as e:
+            logger.exception(f"Ingestion run failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest jobs from Adzuna into the jobs table")
+    parser.add_argument("--once", action="store_true", help="Run a single ingestion pass and exit")
+    args = parser.parse_args()
+    if args.once:
+        asyncio.run(run_once())
+    else:
+        asyncio.run(run_forever())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Inverted index from skill to stored jobs.
+
+Job skills are extracted once when a job row is inserted and stored as
+postings in job_skills. Ranking jobs for a resume is then a merge of the
+posting lists for the resume's skills with top-k selection, instead of
+re-running skill extraction over every job description at query time.
+"""
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import desc, func, or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .skills import find_skills, normalize_skill
+
+def job_skills(job: models.Job) -> List[str]:
+    """Normalized skills of a job: its skills column, or extracted from the description"""
+    skills = {normalize_skill(s) for s in (job.skills or []) if s}
+    if not skills:
+        skills.update(find_skills(job.description or ""))
+    return sorted(skills)
+
+def index_jobs(db: Session, jobs: Iterable[models.Job]) -> None:
+    """Add postings for newly inserted (flushed) jobs (caller commits)"""
+    db.add_all(
+        models.JobSkill(skill=skill, job_id=job.id, expires_at=job.expires_at)
+        for job in jobs
+        for skill in job_skills(job)
+    )
+
+def reindex_jobs(db: Session, jobs: List[models.Job]) -> None:
+    """Replace the postings of jobs whose skills or expiry changed (caller commits)"""
+    db.query(models.JobSkill).filter(
+        models.JobSkill.job_id.in_([job.id for job in jobs])
+    ).delete(synchronize_session=False)
+    index_jobs(db, jobs)
+
+def remove_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Drop postings of jobs past expires_at (caller commits). Returns postings removed."""
+    now = now or datetime.now(timezone.utc)
+    return db.query(models.JobSkill).filter(
+        models.JobSkill.expires_at.isnot(None), models.JobSkill.expires_at <= now
+    ).delete(synchronize_session=False)
+
+def rank_jobs(
+    db: Session,
+    skills: List[str],
+    limit: int = 20,
+    now: Optional[datetime] = None,
+) -> List[Tuple[models.Job, int]]:
+    """
+    Rank live jobs by how many of the given skills they require
+
+    Args:
+        skills: Normalized skills of the candidate
+        limit: Number of jobs to return
+        now: Expiry cutoff (defaults to the current time)
+
+    Returns:
+        List of (job, matched skill count), best match first, newest first on ties
+    """
+    if not skills:
+        return []
+    now = now or datetime.now(timezone.utc)
+    S = models.JobSkill
+    matches = (
+        select(S.job_id, func.count().label("matched"))
+        .where(S.skill.in_(skills), or_(S.expires_at.is_(None), S.expires_at > now))
+        .group_by(S.job_id)
+        .order_by(desc("matched"), desc(S.job_id))
+        .limit(limit)
+        .subquery()
+    )
+    query = (
+        select(models.Job, matches.c.matched)
+        .join(matches, models.Job.id == matches.c.job_id)
+        .order_by(desc(matches.c.matched), desc(models.Job.id))
+    )
+    return [(job, matched) for job, matched in db.execute(query).all()]
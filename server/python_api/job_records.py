@@ -0,0 +1,178 @@
+"""
+Compact job records for the job listing hot path.
+
+A page of results used to exist three times per request: the dict built from
+the Adzuna result, the JobResponse pydantic model built from that dict, and
+the jsonable copy FastAPI makes before encoding. JobRecord is a slotted
+dataclass that references the strings of the decoded upstream JSON directly
+(no per-job __dict__), and orjson serializes it natively, so a page goes from
+upstream bytes to response bytes with one object per job.
+
+Field names are the JobResponse JSON keys, which keeps encoding a straight
+attribute dump. List responses default to LIST_FIELDS, which replace the full
+description with a short highlighted snippet; clients can pick their own
+subset with a sparse fieldset (?fields=id,title,snippet).
+"""
+import html
+import os
+import re
+from dataclasses import dataclass, field, fields as dataclass_fields
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+import orjson
+from fastapi.responses import Response
+
+from . import models
+from .dedup import find_duplicate_groups
+from .serialization import json_response
+
+SNIPPET_LENGTH = int(os.getenv("JOB_SNIPPET_LENGTH", "200"))
+_WHITESPACE = re.compile(r"\s+")
+
+@dataclass(slots=True)
+class JobAlternateRecord:
+    id: str
+    company: str
+    location: str
+
+@dataclass(slots=True)
+class JobRecord:
+    id: str
+    title: str
+    company: str
+    location: str
+    description: str
+    type: Optional[str] = None
+    salary: Optional[str] = None
+    isRemote: bool = False
+    postedAt: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    match: Optional[int] = None
+    status: str = "new"
+    saved: bool = False
+    alternates: List[JobAlternateRecord] = field(default_factory=list)
+    snippet: Optional[str] = None
+
+    @classmethod
+    def from_adzuna(cls, result: Dict[str, Any], skills: List[str], match: Optional[int]) -> "JobRecord":
+        """Build a record from an Adzuna search result"""
+        description = result.get("description", "")
+        return cls(
+            id=str(result.get("id", "")),
+            title=result.get("title", ""),
+            company=result.get("company", {}).get("display_name", "Unknown Company"),
+            location=result.get("location", {}).get("display_name", ""),
+            description=description,
+            type=result.get("contract_type", "Not specified"),
+            salary=result.get("salary_is_predicted", "Not specified"),
+            isRemote="remote" in description.lower(),
+            postedAt=result.get("created", ""),
+            skills=skills,
+            match=match,
+        )
+
+    @classmethod
+    def from_job(cls, job: models.Job, skills: List[str], match: Optional[int]) -> "JobRecord":
+        """Build a record from a stored job"""
+        return cls(
+            id=str(job.id),
+            title=job.title,
+            company=job.company,
+            location=job.location,
+            description=job.description,
+            type=job.type,
+            isRemote="remote" in job.description.lower(),
+            postedAt=job.posted_at.isoformat() if job.posted_at else None,
+            skills=skills,
+            match=match,
+        )
+
+def collapse_records(records: List[JobRecord]) -> List[JobRecord]:
+    """Collapse near-duplicate records into the first of each group, listing the rest as alternates"""
+    groups = find_duplicate_groups([f"{record.title} {record.description}" for record in records])
+    collapsed = []
+    for group in groups:
+        record = records[group[0]]
+        record.alternates = [
+            JobAlternateRecord(records[i].id, records[i].company, records[i].location) for i in group[1:]
+        ]
+        collapsed.append(record)
+    return collapsed
+
+JOB_FIELDS = tuple(f.name for f in dataclass_fields(JobRecord))
+# Default list payload: everything except the full description
+LIST_FIELDS = tuple(name for name in JOB_FIELDS if name != "description")
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a sparse fieldset like "title,company,snippet"
+    
+    Returns:
+        Field names in JobRecord order, always including id; LIST_FIELDS when value is empty
+    
+    Raises:
+        ValueError: If a field name is unknown
+    """
+    if not value or not value.strip():
+        return LIST_FIELDS
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in JOB_FIELDS if name in requested)
+
+def snippet_pattern(terms: Iterable[str]) -> Optional[Pattern]:
+    """Case-insensitive whole-word pattern matching any of the query terms"""
+    terms = sorted({t.strip().lower() for t in terms if len(t.strip()) > 1}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(t) for t in terms) + r")(?!\w)", re.IGNORECASE)
+
+def make_snippet(text: str, pattern: Optional[Pattern], length: int = SNIPPET_LENGTH) -> str:
+    """
+    Cut a preview of text around the first query term match
+    
+    The snippet is HTML-escaped, with matched terms wrapped in <em> tags, and
+    starts/ends on word boundaries with an ellipsis where text was cut.
+    """
+    text = _WHITESPACE.sub(" ", text or "").strip()
+    start = 0
+    match = pattern.search(text) if pattern else None
+    if match and match.end() > length:
+        # Leave some context before the first hit, starting on a word boundary
+        start = max(0, match.start() - length // 4)
+        space = text.find(" ", start, match.start())
+        if space >= 0:
+            start = space + 1
+    end = start + length
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+    window = text[start:end]
+
+    pieces, position = [], 0
+    if pattern:
+        for hit in pattern.finditer(window):
+            pieces.append(html.escape(window[position:hit.start()]))
+            pieces.append(f"<em>{html.escape(hit.group())}</em>")
+            position = hit.end()
+    pieces.append(html.escape(window[position:]))
+    return ("…" if start else "") + "".join(pieces) + ("…" if end < len(text) else "")
+
+def add_snippets(records: Sequence[JobRecord], terms: Iterable[str]) -> None:
+    """Fill the snippet of each record, highlighting the query terms"""
+    pattern = snippet_pattern(terms)
+    for record in records:
+        record.snippet = make_snippet(record.description, pattern)
+
+def records_response(records: List[JobRecord], fields: Optional[Sequence[str]] = None) -> Response:
+    """Encode a page of records straight to a JSON array response, optionally only some fields"""
+    if fields is None:
+        return json_response(orjson.dumps(records))
+    return json_response(orjson.dumps([{name: getattr(record, name) for name in fields} for record in records]))
+
+def record_response(record: JobRecord) -> Response:
+    """Encode a single record with all fields"""
+    return json_response(orjson.dumps(record))
@@ -1,23 +1,31 @@
 import os
 import logging
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, status
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Header, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import json
 from dotenv import load_dotenv
 import sqlalchemy
 
-from . import models, schemas, crud
-from .database import engine, Base, get_db
-from .resume_parser import ResumeParser
+from . import models, schemas, crud, parse_pipeline
+from .serialization import resume_to_json, upload_to_json, json_response, json_list_response
+from .http_cache import make_etag, etag_matches, not_modified, set_cache_headers
+from .database import engine, Base, get_db, get_read_db
 from .routes import jobs  # Import the jobs router
+from .routes import stats, exports, search, applications, revisions
+from .render_service import shutdown_pool
+from .compression import CompressionMiddleware
+from .rate_limit import RateLimitMiddleware
+from .replicas import ReadYourWritesMiddleware
+from .upload_validation import UploadRejected, UploadValidator, make_scanner, save_upload
 
 # Load environment variables
 load_dotenv()
 
 # Initialize FastAPI app
-app = FastAPI(title="AllHire Resume Upload API")
+app = FastAPI(title="AllHire Resume Upload API", default_response_class=ORJSONResponse)
 
 # Get CORS settings from environment
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173").split(",")
@@ -32,6 +40,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tell clients when they committed a write so their next reads avoid lagging replicas
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress large JSON responses (gzip, or brotli when installed)
+app.add_middleware(CompressionMiddleware)
+
+# Reject callers over RATE_LIMITS before any work is done (outermost middleware)
+app.add_middleware(RateLimitMiddleware)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -56,74 +73,22 @@ async def startup_event():
         # Don't raise the exception - let the app start anyway
         # The migrations should handle table creation
 
+@app.on_event("shutdown")
+def shutdown_event():
+    shutdown_pool()
+
 # Include routers
 app.include_router(jobs.router)
+app.include_router(stats.router)
+app.include_router(exports.router)
+app.include_router(exports.archive_router)
+app.include_router(search.router)
+app.include_router(applications.router)
+app.include_router(revisions.router)
 
 # Background task to process resume uploads
 def process_resume_upload(upload_id: int, db: Session):
-    # Get database session for this task
-    db_upload = crud.get_resume_upload(db, upload_id)
-    if not db_upload:
-        logger.error(f"Resume upload {upload_id} not found")
-        return
-    
-    try:
-        # Update status to processing
-        crud.update_resume_upload(db, upload_id, schemas.ResumeUploadUpdate(status="processing"))
-        
-        # Parse the resume
-        parsed_data = ResumeParser.parse_resume(db_upload.file_path, db_upload.file_type)
-        if not parsed_data:
-            crud.update_resume_upload(
-                db, 
-                upload_id, 
-                schemas.ResumeUploadUpdate(
-                    status="failed",
-                    error_message="Failed to parse resume file"
-                )
-            )
-            return
-        
-        # Convert parsed data to resume content format
-        resume_content = ResumeParser.convert_to_resume_content(parsed_data)
-        
-        # Create a new resume record
-        resume = schemas.ResumeCreate(
-            user_id=db_upload.user_id,
-            title=f"Resume from {db_upload.original_filename}",
-            template="professional",
-            content=resume_content,
-            file_path=db_upload.file_path,
-            file_name=db_upload.original_filename,
-            file_type=db_upload.file_type,
-            file_size=db_upload.file_size
-        )
-        
-        db_resume = crud.create_resume(db, resume)
-        
-        # Update the upload record with success status and resume_id
-        crud.update_resume_upload(
-            db,
-            upload_id,
-            schemas.ResumeUploadUpdate(
-                status="completed",
-                resume_id=db_resume.id,
-                parsed_data=parsed_data
-            )
-        )
-        
-        logger.info(f"Successfully processed resume upload {upload_id}")
-        
-    except Exception as e:
-        logger.exception(f"Error processing resume upload {upload_id}: {str(e)}")
-        crud.update_resume_upload(
-            db,
-            upload_id,
-            schemas.ResumeUploadUpdate(
-                status="failed",
-                error_message=str(e)
-            )
-        )
+    parse_pipeline.process_upload(db, upload_id)
 
 @app.get("/")
 def read_root():
@@ -139,28 +104,23 @@ async def upload_resume(
     """
     Upload a resume file for processing
     
-    The file will be saved and a background task will be started to parse it
+    The file is validated as it is saved (type, size, PDF pages, virus scan)
+    and a background task is started to parse it
     """
     try:
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Empty file"
-            )
-        
-        # Save the file
-        file_path, _ = ResumeParser.save_uploaded_file(file_content, file.filename)
+        # Validate while writing to disk; junk is rejected before a parse worker sees it
+        validator = UploadValidator(file.filename, file.content_type, scanner=make_scanner())
+        try:
+            file_path = await save_upload(file, validator)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
         
         # Create upload record
         upload = schemas.ResumeUploadCreate(
             user_id=user_id,
             original_filename=file.filename,
-            file_type=file.content_type,
-            file_size=file_size
+            file_type=validator.media_type,
+            file_size=validator.size
         )
         
         db_upload = crud.create_resume_upload(db, upload, file_path)
@@ -170,6 +130,8 @@ async def upload_resume(
         
         return db_upload
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error uploading resume: {str(e)}")
         raise HTTPException(
@@ -178,36 +140,82 @@ async def upload_resume(
         )
 
 @app.get("/uploads/resume/{upload_id}", response_model=schemas.ResumeUploadResponse)
-def get_resume_upload(upload_id: int, db: Session = Depends(get_db)):
+def get_resume_upload(
+    upload_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
     """Get details of a resume upload"""
+    if if_none_match:
+        # Answer revalidation from the version column alone
+        version = crud.get_resume_upload_version(db, upload_id)
+        if version is not None:
+            etag = make_etag("upload", upload_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
     db_upload = crud.get_resume_upload(db, upload_id)
     if not db_upload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume upload not found"
         )
-    return db_upload
+    response = json_response(upload_to_json(db_upload))
+    return set_cache_headers(response, make_etag("upload", db_upload.id, db_upload.version))
+
+@app.post("/uploads/resume/{upload_id}/retry", response_model=schemas.ResumeUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+def retry_resume_upload(upload_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Re-run processing of a failed upload, resuming from its last completed stage"""
+    db_upload = crud.get_resume_upload(db, upload_id)
+    if not db_upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume upload not found"
+        )
+    if db_upload.status != "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only failed uploads can be retried (status is {db_upload.status})"
+        )
+    background_tasks.add_task(process_resume_upload, upload_id, db)
+    return json_response(upload_to_json(db_upload), status_code=status.HTTP_202_ACCEPTED)
 
 @app.get("/uploads/resume/user/{user_id}", response_model=List[schemas.ResumeUploadResponse])
-def get_user_resume_uploads(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_user_resume_uploads(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """Get all resume uploads for a user"""
-    return crud.get_resume_uploads_by_user(db, user_id, skip, limit)
+    uploads = crud.get_resume_uploads_by_user(db, user_id, skip, limit)
+    return json_list_response(upload_to_json(db_upload) for db_upload in uploads)
 
 @app.get("/resumes/{resume_id}", response_model=schemas.ResumeResponse)
-def get_resume(resume_id: int, user_id: int, db: Session = Depends(get_db)):
+def get_resume(
+    resume_id: int,
+    user_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
     """Get a specific resume"""
+    if if_none_match:
+        # Answer revalidation from the version column alone
+        version = crud.get_resume_version(db, resume_id, user_id)
+        if version is not None:
+            etag = make_etag("resume", resume_id, version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    
     db_resume = crud.get_resume(db, resume_id, user_id)
     if not db_resume:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
-    return db_resume
+    response = json_response(resume_to_json(db_resume))
+    return set_cache_headers(response, make_etag("resume", db_resume.id, db_resume.version))
 
 @app.get("/resumes/user/{user_id}", response_model=List[schemas.ResumeResponse])
-def get_user_resumes(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_user_resumes(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """Get all resumes for a user"""
-    return crud.get_resumes_by_user(db, user_id, skip, limit)
+    resumes = crud.get_resumes_by_user(db, user_id, skip, limit)
+    return json_list_response(resume_to_json(db_resume) for db_resume in resumes)
 
 @app.delete("/uploads/resume/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_resume_upload(upload_id: int, db: Session = Depends(get_db)):
@@ -0,0 +1,26 @@
+"""Add users.skill_bits skill profile bitset
+
+Revision ID: 2c9e5f7a1b08
+Revises: d4b81e6a3c25
+Create Date: 2026-10-19 15:40:52.601337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c9e5f7a1b08'
+down_revision = 'd4b81e6a3c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled in on each user's next resume write; until then skill_profile.get_profile
+    # computes NULL profiles from the search index postings
+    op.add_column('users', sa.Column('skill_bits', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'skill_bits')
@@ -0,0 +1,53 @@
+"""Add pre-serialized resume content_json column
+
+Revision ID: 3f1a9c2b7d10
+Revises: 
+Create Date: 2026-10-19 09:12:44.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import orjson
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    op.add_column('resumes', sa.Column('content_json', sa.Text(), nullable=True))
+
+    # Backfill canonical JSON for existing rows in id order
+    resumes = sa.table(
+        'resumes',
+        sa.column('id', sa.Integer),
+        sa.column('content', sa.JSON),
+        sa.column('content_json', sa.Text),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(resumes.c.id, resumes.c.content)
+            .where(resumes.c.id > last_id)
+            .order_by(resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            conn.execute(
+                resumes.update()
+                .where(resumes.c.id == row.id)
+                .values(content_json=orjson.dumps(row.content, option=orjson.OPT_SORT_KEYS).decode("utf-8"))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_column('resumes', 'content_json')
@@ -0,0 +1,104 @@
+"""Add job skill inverted index
+
+Revision ID: 5e0b3a8f4c92
+Revises: c7d2e94f1b36
+Create Date: 2026-10-19 13:05:51.204776
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0b3a8f4c92'
+down_revision = 'c7d2e94f1b36'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Snapshot of python_api.skills at this revision, so the backfill does not depend
+# on the live models or taxonomy
+SKILL_TAXONOMY = [
+    "python", "javascript", "java", "c++", "react", "angular", "vue",
+    "node.js", "express", "django", "flask", "spring", "aws", "azure",
+    "gcp", "docker", "kubernetes", "sql", "nosql", "mongodb", "postgresql",
+    "mysql", "git", "agile", "scrum", "devops", "ci/cd", "machine learning"
+]
+SKILL_ALIASES = {
+    "js": "javascript", "node": "node.js", "nodejs": "node.js", "reactjs": "react",
+    "react.js": "react", "vuejs": "vue", "vue.js": "vue", "k8s": "kubernetes",
+    "postgres": "postgresql", "golang": "go", "amazon web services": "aws",
+    "google cloud": "gcp", "ml": "machine learning", "cicd": "ci/cd"
+}
+_TOKEN = re.compile(r"[^\W_]+(?:\.[^\W_]+)*[+#]*")
+_SKILL_TOKENS = [(skill, tuple(_TOKEN.findall(skill))) for skill in SKILL_TAXONOMY]
+
+
+def _normalize_skill(name):
+    normalized = " ".join(name.lower().split())
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def _job_skills(skills, description):
+    """Normalized skills of a job: its skills column, or matched in the description"""
+    found = {_normalize_skill(s) for s in (skills or []) if s}
+    if not found:
+        tokens = _TOKEN.findall((description or "").casefold())
+        grams = set()
+        for n in range(1, max(len(t) for _, t in _SKILL_TOKENS) + 1):
+            grams.update(zip(*(tokens[i:] for i in range(n))))
+        found.update(skill for skill, skill_tokens in _SKILL_TOKENS if skill_tokens in grams)
+    return sorted(found)
+
+
+def upgrade():
+    op.create_table(
+        'job_skills',
+        sa.Column('skill', sa.String(), primary_key=True),
+        sa.Column('job_id', sa.Integer(), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_job_skills_job_id', 'job_skills', ['job_id'])
+    op.create_index('ix_job_skills_expires_at', 'job_skills', ['expires_at'])
+
+    # Index existing jobs in id order
+    jobs = sa.table(
+        'jobs',
+        sa.column('id', sa.Integer),
+        sa.column('description', sa.Text),
+        sa.column('skills', sa.JSON),
+        sa.column('expires_at', sa.DateTime(timezone=True)),
+    )
+    job_skills = sa.table(
+        'job_skills',
+        sa.column('skill', sa.String),
+        sa.column('job_id', sa.Integer),
+        sa.column('expires_at', sa.DateTime(timezone=True)),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(jobs.c.id, jobs.c.description, jobs.c.skills, jobs.c.expires_at)
+            .where(jobs.c.id > last_id)
+            .order_by(jobs.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        postings = [
+            {'skill': skill, 'job_id': row.id, 'expires_at': row.expires_at}
+            for row in rows
+            for skill in _job_skills(row.skills, row.description)
+        ]
+        if postings:
+            conn.execute(job_skills.insert(), postings)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_index('ix_job_skills_expires_at', table_name='job_skills')
+    op.drop_index('ix_job_skills_job_id', table_name='job_skills')
+    op.drop_table('job_skills')
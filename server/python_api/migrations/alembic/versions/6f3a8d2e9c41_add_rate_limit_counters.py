@@ -0,0 +1,32 @@
+"""Add rate_limit_counters for the shared rate limiter backend
+
+Revision ID: 6f3a8d2e9c41
+Revises: 2c9e5f7a1b08
+Create Date: 2026-10-19 16:34:07.912458
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3a8d2e9c41'
+down_revision = '2c9e5f7a1b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(), primary_key=True),
+        sa.Column('window_start', sa.BigInteger(), primary_key=True),
+        sa.Column('expires_at', sa.BigInteger(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_rate_limit_counters_expires_at', 'rate_limit_counters', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_rate_limit_counters_expires_at', table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
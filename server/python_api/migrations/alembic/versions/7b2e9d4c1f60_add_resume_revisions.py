@@ -0,0 +1,44 @@
+"""Add resume_revisions for resume content history
+
+Revision ID: 7b2e9d4c1f60
+Revises: f5d2a7c1e083
+Create Date: 2026-10-19 21:02:37.118254
+
+Every existing resume gets its current content as revision 1. resumes.content
+is already in the compact JSON format the data column uses, so it is copied as
+is.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e9d4c1f60'
+down_revision = 'f5d2a7c1e083'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    revisions = op.create_table(
+        'resume_revisions',
+        sa.Column('resume_id', sa.Integer(), sa.ForeignKey('resumes.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('resume_id', 'revision'),
+    )
+    resumes = sa.table(
+        'resumes', sa.column('id', sa.Integer), sa.column('content', sa.LargeBinary),
+        sa.column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.execute(revisions.insert().from_select(
+        ['resume_id', 'revision', 'is_snapshot', 'data', 'created_at'],
+        sa.select(resumes.c.id, sa.literal(1), sa.true(), resumes.c.content, resumes.c.updated_at),
+    ))
+
+
+def downgrade():
+    op.drop_table('resume_revisions')
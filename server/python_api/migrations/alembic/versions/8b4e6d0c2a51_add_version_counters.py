@@ -0,0 +1,26 @@
+"""Add version counters to resumes and resume_uploads
+
+Revision ID: 8b4e6d0c2a51
+Revises: 3f1a9c2b7d10
+Create Date: 2026-10-19 10:02:17.530941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d0c2a51'
+down_revision = '3f1a9c2b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('resumes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('resume_uploads', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('resume_uploads', 'version')
+    op.drop_column('resumes', 'version')
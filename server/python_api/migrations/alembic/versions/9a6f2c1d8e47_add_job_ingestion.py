@@ -0,0 +1,37 @@
+"""Add job source/external_id and ingestion state
+
+Revision ID: 9a6f2c1d8e47
+Revises: 5e0b3a8f4c92
+Create Date: 2026-10-19 14:21:36.880412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a6f2c1d8e47'
+down_revision = '5e0b3a8f4c92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('jobs', sa.Column('source', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('external_id', sa.String(), nullable=True))
+    op.create_unique_constraint('uq_jobs_source_external_id', 'jobs', ['source', 'external_id'])
+    op.create_table(
+        'ingestion_state',
+        sa.Column('query', sa.String(), primary_key=True),
+        sa.Column('location', sa.String(), primary_key=True),
+        sa.Column('country', sa.String(), primary_key=True),
+        sa.Column('high_water_mark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('ingestion_state')
+    op.drop_constraint('uq_jobs_source_external_id', 'jobs', type_='unique')
+    op.drop_column('jobs', 'external_id')
+    op.drop_column('jobs', 'source')
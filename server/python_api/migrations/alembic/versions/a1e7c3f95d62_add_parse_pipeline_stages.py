@@ -0,0 +1,39 @@
+"""Add parse stage cache and per-stage progress on resume_uploads
+
+Revision ID: a1e7c3f95d62
+Revises: 6f3a8d2e9c41
+Create Date: 2026-10-19 17:12:45.330219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1e7c3f95d62'
+down_revision = '6f3a8d2e9c41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('resume_uploads', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('resume_uploads', sa.Column('stage_timings', sa.JSON(), nullable=True))
+    op.add_column('resume_uploads', sa.Column('last_completed_stage', sa.String(), nullable=True))
+    op.create_index('ix_resume_uploads_content_hash', 'resume_uploads', ['content_hash'])
+    op.create_table(
+        'parse_stage_results',
+        sa.Column('content_hash', sa.String(), primary_key=True),
+        sa.Column('stage', sa.String(), primary_key=True),
+        sa.Column('stage_key', sa.String(), primary_key=True),
+        sa.Column('output', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('parse_stage_results')
+    op.drop_index('ix_resume_uploads_content_hash', table_name='resume_uploads')
+    op.drop_column('resume_uploads', 'last_completed_stage')
+    op.drop_column('resume_uploads', 'stage_timings')
+    op.drop_column('resume_uploads', 'content_hash')
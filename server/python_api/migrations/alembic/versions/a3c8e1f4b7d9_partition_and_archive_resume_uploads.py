@@ -0,0 +1,86 @@
+"""Partition resume_uploads by upload_date and add archived parsed_data pointer
+
+Revision ID: a3c8e1f4b7d9
+Revises: e3b5d1f7a920
+Create Date: 2026-10-19 19:26:41.902337
+
+On Postgres the table is rebuilt as a table partitioned by range of
+upload_date, one partition per month from the oldest upload to three months
+ahead plus a default partition. A partitioned table's primary key must include
+the partition key, so it becomes (id, upload_date); ids still come from the
+same sequence. Other databases only get the new columns and index.
+
+Downgrading drops parsed_data_ref: archived parsed_data stays in blob storage
+and is no longer reachable from the row.
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c8e1f4b7d9'
+down_revision = 'e3b5d1f7a920'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _month_start(day, months_ahead=0):
+    month = day.month - 1 + months_ahead
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _rebuild(partitioned):
+    """Recreate resume_uploads (partitioned or plain) and copy the rows across"""
+    conn = op.get_bind()
+    op.execute("ALTER TABLE resume_uploads RENAME TO resume_uploads_old")
+    # The id sequence belongs to the old table; detach it so dropping that table keeps it
+    op.execute("ALTER SEQUENCE resume_uploads_id_seq OWNED BY NONE")
+    partition_clause = " PARTITION BY RANGE (upload_date)" if partitioned else ""
+    op.execute(f"CREATE TABLE resume_uploads (LIKE resume_uploads_old INCLUDING DEFAULTS){partition_clause}")
+    if partitioned:
+        oldest = conn.execute(sa.text("SELECT min(upload_date) FROM resume_uploads_old")).scalar()
+        today = datetime.now(timezone.utc).date()
+        month = _month_start(oldest.date() if oldest else today)
+        last = _month_start(today, MONTHS_AHEAD)
+        while month <= last:
+            end = _month_start(month, 1)
+            op.execute(
+                f"CREATE TABLE resume_uploads_y{month:%Y}m{month:%m} PARTITION OF resume_uploads "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        op.execute("CREATE TABLE resume_uploads_default PARTITION OF resume_uploads DEFAULT")
+    op.execute("INSERT INTO resume_uploads SELECT * FROM resume_uploads_old")
+    op.execute("DROP TABLE resume_uploads_old")
+    op.create_primary_key(
+        'resume_uploads_pkey', 'resume_uploads', ['id', 'upload_date'] if partitioned else ['id']
+    )
+    op.create_index('ix_resume_uploads_id', 'resume_uploads', ['id'])
+    op.create_index('ix_resume_uploads_content_hash', 'resume_uploads', ['content_hash'])
+    op.create_index('ix_resume_uploads_user_id_upload_date', 'resume_uploads', ['user_id', 'upload_date'])
+    op.create_foreign_key('resume_uploads_user_id_fkey', 'resume_uploads', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('resume_uploads_resume_id_fkey', 'resume_uploads', 'resumes', ['resume_id'], ['id'])
+    op.execute("ALTER SEQUENCE resume_uploads_id_seq OWNED BY resume_uploads.id")
+
+
+def upgrade():
+    op.add_column('resume_uploads', sa.Column('parsed_data_ref', sa.String(), nullable=True))
+    op.add_column('resume_uploads', sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True))
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild(partitioned=True)
+    else:
+        op.create_index('ix_resume_uploads_user_id_upload_date', 'resume_uploads', ['user_id', 'upload_date'])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Partitions are dropped with the partitioned table
+        _rebuild(partitioned=False)
+    op.drop_index('ix_resume_uploads_user_id_upload_date', table_name='resume_uploads')
+    op.drop_column('resume_uploads', 'archived_at')
+    op.drop_column('resume_uploads', 'parsed_data_ref')
@@ -0,0 +1,63 @@
+"""Drop the stored resumes.content_json copy, derived from content now
+
+Revision ID: b6f1d9a3e254
+Revises: 7b2e9d4c1f60
+Create Date: 2026-10-19 22:40:16.305118
+
+resumes.content is re-encoded with sorted keys, so its inflated bytes are the
+canonical JSON text that content_json used to hold, and content_json is
+dropped. Downgrade adds the column back and fills it from content.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f1d9a3e254'
+down_revision = '7b2e9d4c1f60'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+
+def _rewrite(column, convert):
+    """Set column to convert(content) for every resume, in id-ordered batches"""
+    conn = op.get_bind()
+    resumes = sa.table(
+        'resumes',
+        sa.column('id', sa.Integer),
+        sa.column('content', sa.LargeBinary),
+        sa.column('content_json', sa.Text),
+    )
+    update = (
+        sa.update(resumes)
+        .where(resumes.c.id == sa.bindparam('row_id'))
+        .values({column: sa.bindparam('value', type_=resumes.c[column].type)})
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(resumes.c.id, resumes.c.content)
+            .where(resumes.c.id > last_id)
+            .order_by(resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [{'row_id': row_id, 'value': convert(content)} for row_id, content in rows])
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    from python_api.compact_json import decode, encode
+    _rewrite('content', lambda content: encode(decode(content)))
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('content_json')
+
+
+def downgrade():
+    from python_api.compact_json import decode_bytes
+    op.add_column('resumes', sa.Column('content_json', sa.Text(), nullable=True))
+    _rewrite('content_json', lambda content: decode_bytes(content).decode('utf-8'))
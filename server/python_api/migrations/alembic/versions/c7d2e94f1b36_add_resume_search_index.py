@@ -0,0 +1,200 @@
+"""Add resume search index tables
+
+Revision ID: c7d2e94f1b36
+Revises: 8b4e6d0c2a51
+Create Date: 2026-10-19 11:40:05.927415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import date
+import hashlib
+import json
+import re
+import unicodedata
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e94f1b36'
+down_revision = '8b4e6d0c2a51'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# Snapshot of python_api.search_index and python_api.skills at this revision, so
+# the backfill does not depend on the live modules
+SKILL_TAXONOMY = [
+    "python", "javascript", "java", "c++", "react", "angular", "vue",
+    "node.js", "express", "django", "flask", "spring", "aws", "azure",
+    "gcp", "docker", "kubernetes", "sql", "nosql", "mongodb", "postgresql",
+    "mysql", "git", "agile", "scrum", "devops", "ci/cd", "machine learning"
+]
+SKILL_ALIASES = {
+    "js": "javascript", "node": "node.js", "nodejs": "node.js", "reactjs": "react",
+    "react.js": "react", "vuejs": "vue", "vue.js": "vue", "k8s": "kubernetes",
+    "postgres": "postgresql", "golang": "go", "amazon web services": "aws",
+    "google cloud": "gcp", "ml": "machine learning", "cicd": "ci/cd"
+}
+_TOKEN = re.compile(r"[^\W_]+(?:\.[^\W_]+)*[+#]*")
+_SKILL_TOKENS = [(skill, tuple(_TOKEN.findall(skill))) for skill in SKILL_TAXONOMY]
+_YEAR_MONTH = re.compile(r"(\d{4})(?:[-/.](\d{1,2}))?")
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_PRESENT = ("present", "current", "now", "today")
+
+
+def _normalize_skill(name):
+    normalized = " ".join(name.lower().split())
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def _tokens(text):
+    return _TOKEN.findall(unicodedata.normalize("NFKC", text or "").casefold())
+
+
+def _find_skills(text):
+    tokens = _tokens(text)
+    grams = set()
+    for n in range(1, max(len(t) for _, t in _SKILL_TOKENS) + 1):
+        grams.update(zip(*(tokens[i:] for i in range(n))))
+    return [skill for skill, skill_tokens in _SKILL_TOKENS if skill_tokens in grams]
+
+
+def _month_index(value):
+    value = (value or "").strip().lower()
+    if not value:
+        return None
+    if value in _PRESENT:
+        today = date.today()
+        return today.year * 12 + today.month - 1
+    match = _YEAR_MONTH.search(value)
+    if not match:
+        return None
+    month = int(match.group(2)) if match.group(2) else next(
+        (i + 1 for i, name in enumerate(_MONTHS) if name in value), 1
+    )
+    return int(match.group(1)) * 12 + min(max(month, 1), 12) - 1
+
+
+def _years_of_experience(experience):
+    spans = []
+    for item in experience:
+        start = _month_index(item.get("startDate"))
+        end = _month_index(item.get("endDate") or "present")
+        if start is not None and end is not None and end >= start:
+            spans.append((start, end))
+    months, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return months // 12
+
+
+def _extract_fields(content):
+    """Searchable fields of resume content, as search_index.extract_fields built them"""
+    experience = [e for e in content.get("experience", []) or [] if isinstance(e, dict)]
+    info = content.get("personalInfo", {}) or {}
+    skills = set()
+    for skill in content.get("skills", []) or []:
+        name = skill.get("name", "") if isinstance(skill, dict) else str(skill)
+        if name.strip():
+            skills.add(_normalize_skill(name))
+    text = " ".join([content.get("summary") or ""] + [e.get("description") or "" for e in experience])
+    skills.update(_find_skills(text))
+    return {
+        "skill": sorted(skills),
+        "title": sorted({token for e in experience for token in _tokens(e.get("title"))}),
+        "company": sorted({token for e in experience for token in _tokens(e.get("company"))}),
+        "location": sorted(set(_tokens(info.get("location")))),
+        "headline": (experience[0].get("title") or None) if experience else None,
+        "location_display": info.get("location") or None,
+        "years_experience": _years_of_experience(experience),
+    }
+
+
+def upgrade():
+    op.create_table(
+        'resume_search_docs',
+        sa.Column('resume_id', sa.Integer(), sa.ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('headline', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('years_experience', sa.Integer(), nullable=False),
+        sa.Column('fields_hash', sa.String(), nullable=False),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_resume_search_docs_user_id', 'resume_search_docs', ['user_id'])
+    op.create_table(
+        'resume_search_terms',
+        sa.Column('field', sa.String(), primary_key=True),
+        sa.Column('term', sa.String(), primary_key=True),
+        sa.Column('resume_id', sa.Integer(), sa.ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_resume_search_terms_resume_id', 'resume_search_terms', ['resume_id'])
+
+    # Index existing resumes in id order
+    resumes = sa.table(
+        'resumes',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('content', sa.JSON),
+    )
+    search_docs = sa.table(
+        'resume_search_docs',
+        sa.column('resume_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('headline', sa.String),
+        sa.column('location', sa.String),
+        sa.column('years_experience', sa.Integer),
+        sa.column('fields_hash', sa.String),
+    )
+    search_terms = sa.table(
+        'resume_search_terms',
+        sa.column('field', sa.String),
+        sa.column('term', sa.String),
+        sa.column('resume_id', sa.Integer),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(resumes.c.id, resumes.c.user_id, resumes.c.content)
+            .where(resumes.c.id > last_id)
+            .order_by(resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        docs, postings = [], []
+        for row in rows:
+            fields = _extract_fields(row.content or {})
+            docs.append({
+                'resume_id': row.id,
+                'user_id': row.user_id,
+                'headline': fields['headline'],
+                'location': fields['location_display'],
+                'years_experience': fields['years_experience'],
+                'fields_hash': hashlib.sha1(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest(),
+            })
+            postings.extend(
+                {'field': field, 'term': term, 'resume_id': row.id}
+                for field in ('skill', 'title', 'company', 'location')
+                for term in fields[field]
+            )
+        op.bulk_insert(search_docs, docs)
+        if postings:
+            op.bulk_insert(search_terms, postings)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_index('ix_resume_search_terms_resume_id', table_name='resume_search_terms')
+    op.drop_table('resume_search_terms')
+    op.drop_index('ix_resume_search_docs_user_id', table_name='resume_search_docs')
+    op.drop_table('resume_search_docs')
@@ -0,0 +1,34 @@
+"""Add unique (user_id, job_id) indexes on saved_jobs and applications
+
+Revision ID: d4b81e6a3c25
+Revises: 9a6f2c1d8e47
+Create Date: 2026-10-19 15:02:18.214976
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b81e6a3c25'
+down_revision = '9a6f2c1d8e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any existing duplicates so the unique indexes can be built
+    for table in ('saved_jobs', 'applications'):
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY user_id, job_id)"
+        )
+    op.create_unique_constraint('uq_saved_jobs_user_job', 'saved_jobs', ['user_id', 'job_id'])
+    op.create_index(
+        'uq_applications_user_job', 'applications', ['user_id', 'job_id'],
+        unique=True, postgresql_include=['status']
+    )
+
+
+def downgrade():
+    op.drop_index('uq_applications_user_job', table_name='applications')
+    op.drop_constraint('uq_saved_jobs_user_job', 'saved_jobs', type_='unique')
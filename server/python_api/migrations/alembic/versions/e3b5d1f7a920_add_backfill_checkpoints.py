@@ -0,0 +1,31 @@
+"""Add backfill_checkpoints for resumable batch jobs
+
+Revision ID: e3b5d1f7a920
+Revises: a1e7c3f95d62
+Create Date: 2026-10-19 18:03:12.514870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b5d1f7a920'
+down_revision = 'a1e7c3f95d62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'backfill_checkpoints',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('last_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('backfill_checkpoints')
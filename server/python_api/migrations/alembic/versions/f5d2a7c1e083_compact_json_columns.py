@@ -0,0 +1,62 @@
+"""Store resumes.content and resume_uploads.parsed_data as compact JSON
+
+Revision ID: f5d2a7c1e083
+Revises: a3c8e1f4b7d9
+Create Date: 2026-10-19 20:14:08.671520
+
+Each column is copied into a new binary column in id-ordered batches, encoded
+with python_api.compact_json (COMPACT_JSON_LEVEL applies), then swapped in for
+the JSON column. Downgrade decodes back into JSON the same way.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5d2a7c1e083'
+down_revision = 'a3c8e1f4b7d9'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+COLUMNS = [('resumes', 'content', False), ('resume_uploads', 'parsed_data', True)]
+
+
+def _convert(table_name, column, nullable, from_type, to_type, convert):
+    conn = op.get_bind()
+    op.add_column(table_name, sa.Column(f'{column}_new', to_type, nullable=True))
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column(column, from_type), sa.column(f'{column}_new', to_type))
+    update = (
+        sa.update(table)
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values({f'{column}_new': sa.bindparam('value', type_=to_type)})
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c[column])
+            .where(table.c.id > last_id, table.c[column].isnot(None))
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [{'row_id': row_id, 'value': convert(value)} for row_id, value in rows])
+        last_id = rows[-1][0]
+    with op.batch_alter_table(table_name) as batch_op:
+        batch_op.drop_column(column)
+        batch_op.alter_column(f'{column}_new', new_column_name=column, nullable=nullable, existing_type=to_type)
+
+
+def upgrade():
+    from python_api.compact_json import encode
+    for table_name, column, nullable in COLUMNS:
+        # Values go through as bytes already encoded, so the target is a plain binary column
+        _convert(table_name, column, nullable, sa.JSON(), sa.LargeBinary(), encode)
+
+
+def downgrade():
+    from python_api.compact_json import decode
+    for table_name, column, nullable in COLUMNS:
+        _convert(table_name, column, nullable, sa.LargeBinary(), sa.JSON(), decode)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, JSON, Index, UniqueConstraint, LargeBinary, BigInteger, type_coerce
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, column_property
 from .database import Base
+from .compact_json import CompactJSON, CompactJSONText
 
 class User(Base):
     __tablename__ = "users"
@@ -10,6 +11,7 @@ class User(Base):
     username = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
+    skill_bits = Column(LargeBinary, nullable=True)  # Bitset over SKILL_TAXONOMY, see skill_profile.py
     
     # Relationships
     resumes = relationship("Resume", back_populates="user", cascade="all, delete-orphan")
@@ -22,9 +24,15 @@ class Resume(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     template = Column(String, default="professional", nullable=False)
-    content = Column(JSON, nullable=False)
+    # Deferred so read endpoints can serve content_json without decoding the blob
+    content = deferred(Column(CompactJSON, nullable=False))
+    # The same stored bytes read back as canonical JSON text (inflated, never parsed)
+    content_json = column_property(type_coerce(content.columns[0], CompactJSONText()))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    version = Column(Integer, nullable=False)  # Incremented on every update, used for ETags
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
     user = relationship("User", back_populates="resumes")
@@ -49,11 +57,30 @@ class Job(Base):
     posted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=True)
     apply_url = Column(String, nullable=False)
+    source = Column(String, nullable=True)  # Upstream provider for ingested jobs, e.g. "adzuna"
+    external_id = Column(String, nullable=True)  # Job id at the upstream provider
+    
+    __table_args__ = (
+        UniqueConstraint("source", "external_id", name="uq_jobs_source_external_id"),
+    )
     
     # Relationships
     applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
     saved_by = relationship("SavedJob", back_populates="job", cascade="all, delete-orphan")
 
+class JobSkill(Base):
+    """Inverted index postings: skill -> job_id, with expiry copied for filtering"""
+    __tablename__ = "job_skills"
+    
+    skill = Column(String, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_job_skills_job_id", "job_id"),
+        Index("ix_job_skills_expires_at", "expires_at"),
+    )
+
 class Application(Base):
     __tablename__ = "applications"
     
@@ -65,6 +92,11 @@ class Application(Base):
     applied_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     notes = Column(Text, nullable=True)
     
+    __table_args__ = (
+        # One application per user and job; status is included so listing lookups are index-only
+        Index("uq_applications_user_job", "user_id", "job_id", unique=True, postgresql_include=["status"]),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="applications")
     job = relationship("Job", back_populates="applications")
@@ -78,6 +110,10 @@ class SavedJob(Base):
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     saved_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_saved_jobs_user_job"),
+    )
+    
     # Relationships
     job = relationship("Job", back_populates="saved_by")
 
@@ -85,6 +121,7 @@ class ResumeUpload(Base):
     """Additional table to track uploaded resume files and their processing status"""
     __tablename__ = "resume_uploads"
     
+    # On Postgres the table is partitioned by month of upload_date and its primary key is (id, upload_date)
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)  # Null until processed
@@ -94,8 +131,92 @@ class ResumeUpload(Base):
     file_size = Column(Integer, nullable=False)
     upload_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     status = Column(String, default="pending", nullable=False)  # pending, processing, completed, failed
-    parsed_data = Column(JSON, nullable=True)  # Extracted data from resume
+    parsed_data = Column(CompactJSON, nullable=True)  # Extracted data from resume (null once archived)
+    parsed_data_ref = Column(String, nullable=True)  # Blob key of archived parsed_data, see upload_archive.py
+    archived_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(Text, nullable=True)
+    content_hash = Column(String, nullable=True, index=True)  # sha256 of the file, keys the parse stage cache
+    stage_timings = Column(JSON, nullable=True)  # Stage name -> {"ms": float, "cached": bool}
+    last_completed_stage = Column(String, nullable=True)
+    version = Column(Integer, nullable=False)  # Incremented on every update, used for ETags
+    
+    __table_args__ = (
+        Index("ix_resume_uploads_user_id_upload_date", "user_id", "upload_date"),
+    )
+    __mapper_args__ = {"version_id_col": version}
     
     # Relationships
-    user = relationship("User") 
\ No newline at end of file
+    user = relationship("User") 
+
+class ResumeSearchDoc(Base):
+    """Normalized, searchable summary of a resume (one row per indexed resume)"""
+    __tablename__ = "resume_search_docs"
+    
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    headline = Column(String, nullable=True)  # Most recent job title
+    location = Column(String, nullable=True)
+    years_experience = Column(Integer, nullable=False, default=0)
+    fields_hash = Column(String, nullable=False)  # Skips re-indexing when extracted fields are unchanged
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+class ResumeSearchTerm(Base):
+    """Inverted index postings: (field, term) -> resume_id"""
+    __tablename__ = "resume_search_terms"
+    
+    field = Column(String, primary_key=True)  # skill, title, company, location
+    term = Column(String, primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_resume_search_terms_resume_id", "resume_id"),
+    )
+
+class IngestionState(Base):
+    """Per-query high-water mark of the job ingestion service"""
+    __tablename__ = "ingestion_state"
+    
+    query = Column(String, primary_key=True)
+    location = Column(String, primary_key=True)
+    country = Column(String, primary_key=True)
+    high_water_mark = Column(DateTime(timezone=True), nullable=True)  # Newest posting seen so far
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+
+class RateLimitCounter(Base):
+    """Fixed-window request counter shared by all workers (RATE_LIMIT_BACKEND=sql)"""
+    __tablename__ = "rate_limit_counters"
+    
+    key = Column(String, primary_key=True)  # "<rule index>:<user or ip>"
+    window_start = Column(BigInteger, primary_key=True)  # Epoch seconds
+    expires_at = Column(BigInteger, nullable=False, index=True)  # Epoch seconds the window ends
+    count = Column(Integer, nullable=False, default=0)
+
+class ParseStageResult(Base):
+    """Cached output of one parse pipeline stage for a file's content"""
+    __tablename__ = "parse_stage_results"
+    
+    content_hash = Column(String, primary_key=True)
+    stage = Column(String, primary_key=True)
+    stage_key = Column(String, primary_key=True)  # Versions of this stage and all stages before it
+    output = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+class BackfillCheckpoint(Base):
+    """Progress of a resumable batch job over a table, keyed by job name"""
+    __tablename__ = "backfill_checkpoints"
+    
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)  # Highest row id already handled
+    processed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+class ResumeRevision(Base):
+    """One saved version of a resume's content, stored as a snapshot or a delta (see resume_history.py)"""
+    __tablename__ = "resume_revisions"
+    
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    revision = Column(Integer, primary_key=True)  # 1 for the content the resume was created with
+    is_snapshot = Column(Boolean, nullable=False)  # data is the full content, otherwise a delta from the previous revision
+    data = Column(CompactJSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
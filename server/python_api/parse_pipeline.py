@@ -0,0 +1,138 @@
+"""
+Resume upload processing as staged, resumable steps.
+
+    extract_text -> normalize -> segment_sections -> extract_entities -> convert -> persist
+
+Each stage's output is stored in parse_stage_results keyed by the file's
+content hash and a stage key made of the versions of the stage and every stage
+before it. A retry after a failure (or a re-upload of the same file) starts
+from the first stage without a stored result, and bumping one stage's version
+after a parser change only reruns that stage and the ones after it.
+
+Per-stage timings and the last completed stage are recorded on the
+ResumeUpload row.
+"""
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+from .resume_parser import ResumeParser
+from .text_normalizer import normalize
+
+logger = logging.getLogger(__name__)
+
+# Stage functions get the upload and the outputs of every earlier stage by name
+StageFn = Callable[[models.ResumeUpload, Dict[str, Any]], Any]
+
+# (name, version, fn); bump a version whenever the stage's output would change
+STAGES: List[Tuple[str, int, StageFn]] = [
+    ("extract_text", 2, lambda upload, out: {"text": ResumeParser.extract_text(upload.file_path, upload.file_type)}),
+    ("normalize", 1, lambda upload, out: normalize(out["extract_text"]["text"])),
+    ("segment_sections", 1, lambda upload, out: ResumeParser.segment_sections(out["normalize"]["text"])),
+    ("extract_entities", 1, lambda upload, out: ResumeParser.extract_entities(
+        out["segment_sections"], out["normalize"]["tokens"]
+    )),
+    ("convert", 1, lambda upload, out: ResumeParser.convert_to_resume_content(out["extract_entities"])),
+]
+PERSIST_STAGE = "persist"
+
+def stage_keys() -> List[str]:
+    """Cache key of each stage: its version chained with all earlier versions"""
+    keys, chain = [], []
+    for name, version, _ in STAGES:
+        chain.append(f"{name}:{version}")
+        keys.append(",".join(chain))
+    return keys
+
+def file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_stage_result(db: Session, content_hash: str, stage: str, stage_key: str) -> Optional[Any]:
+    row = db.get(models.ParseStageResult, (content_hash, stage, stage_key))
+    return row.output if row is not None else None
+
+def save_stage_result(db: Session, content_hash: str, stage: str, stage_key: str, output: Any) -> None:
+    """Store a stage output, keeping the existing row if another worker got there first"""
+    crud.bulk_upsert(
+        db, models.ParseStageResult,
+        [{"content_hash": content_hash, "stage": stage, "stage_key": stage_key, "output": output}],
+        ["content_hash", "stage", "stage_key"], []
+    )
+    db.commit()
+
+def _record(db: Session, upload_id: int, timings: Dict[str, Any], stage: str, **fields) -> None:
+    crud.update_resume_upload(db, upload_id, schemas.ResumeUploadUpdate(
+        stage_timings=dict(timings), last_completed_stage=stage, **fields
+    ))
+
+def run_stages(db: Session, upload: models.ResumeUpload) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run (or load) every cached stage for an upload
+
+    Returns:
+        Tuple of (outputs by stage name, timings by stage name)
+    """
+    outputs: Dict[str, Any] = {}
+    timings: Dict[str, Any] = dict(upload.stage_timings or {})
+    for (name, _, fn), key in zip(STAGES, stage_keys()):
+        output = get_stage_result(db, upload.content_hash, name, key)
+        if output is None:
+            started = time.perf_counter()
+            output = fn(upload, outputs)
+            timings[name] = {"ms": round((time.perf_counter() - started) * 1000, 3), "cached": False}
+            save_stage_result(db, upload.content_hash, name, key, output)
+            _record(db, upload.id, timings, name)
+        else:
+            timings[name] = {"ms": 0.0, "cached": True}
+        outputs[name] = output
+    return outputs, timings
+
+def process_upload(db: Session, upload_id: int) -> None:
+    """Process an upload, resuming from the first stage without a stored result"""
+    db_upload = crud.get_resume_upload(db, upload_id)
+    if not db_upload:
+        logger.error(f"Resume upload {upload_id} not found")
+        return
+
+    try:
+        fields = {"status": "processing", "error_message": None}
+        if not db_upload.content_hash:
+            fields["content_hash"] = file_hash(db_upload.file_path)
+        db_upload = crud.update_resume_upload(db, upload_id, schemas.ResumeUploadUpdate(**fields))
+
+        outputs, timings = run_stages(db, db_upload)
+        parsed_data = outputs["extract_entities"]
+
+        started = time.perf_counter()
+        resume_id = db_upload.resume_id
+        if resume_id is None:
+            db_resume = crud.create_resume(db, schemas.ResumeCreate(
+                user_id=db_upload.user_id,
+                title=f"Resume from {db_upload.original_filename}",
+                template="professional",
+                content=outputs["convert"],
+                file_path=db_upload.file_path,
+                file_name=db_upload.original_filename,
+                file_type=db_upload.file_type,
+                file_size=db_upload.file_size
+            ))
+            resume_id = db_resume.id
+            # Link right away so a failure past this point never creates a second resume
+            crud.update_resume_upload(db, upload_id, schemas.ResumeUploadUpdate(resume_id=resume_id))
+        timings[PERSIST_STAGE] = {"ms": round((time.perf_counter() - started) * 1000, 3), "cached": False}
+
+        _record(db, upload_id, timings, PERSIST_STAGE, status="completed", resume_id=resume_id, parsed_data=parsed_data)
+        logger.info(f"Successfully processed resume upload {upload_id}")
+
+    except Exception as e:
+        logger.exception(f"Error processing resume upload {upload_id}: {str(e)}")
+        db.rollback()
+        crud.update_resume_upload(db, upload_id, schemas.ResumeUploadUpdate(status="failed", error_message=str(e)))
@@ -0,0 +1,212 @@
+"""
+Per-user / per-IP request rate limiting.
+
+Requests matching a rule in RATE_LIMITS are always charged against a bucket
+keyed by the rule and the client IP (the first X-Forwarded-For hop when
+RATE_LIMIT_TRUST_PROXY is set). When an authentication middleware running
+outside this one has set an authenticated scope["user"], a per-user bucket is
+charged on top. The user_id query parameter is never used: it is chosen by the
+client, so rotating it would hand out fresh buckets. Over-limit requests get a
+429 with a Retry-After header before reaching the endpoint.
+
+Two backends:
+    memory  Token buckets in a per-process dict. Middleware runs on the event
+            loop thread, so bucket updates need no lock; limits are per worker.
+    sql     Fixed-window counters in the rate_limit_counters table, shared by
+            all workers, updated with one INSERT ... ON CONFLICT per request.
+
+Rules are "<METHOD> <path prefix>=<requests>/<seconds>" separated by ";".
+"""
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, models
+from .database import SessionLocal
+
+load_dotenv()
+
+RATE_LIMITS = os.getenv("RATE_LIMITS", "POST /uploads/resume=10/60;GET /api/jobs=120/60")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+# Memory backend: drop idle buckets once this many exist
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    method: str
+    path_prefix: str
+    requests: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.seconds
+
+def parse_rules(value: str) -> List[RateLimitRule]:
+    """Parse RATE_LIMITS into rules"""
+    rules = []
+    for item in value.split(";"):
+        if not item.strip():
+            continue
+        target, _, limit = item.partition("=")
+        method, _, prefix = target.strip().partition(" ")
+        requests, _, seconds = limit.partition("/")
+        rules.append(RateLimitRule(method.upper(), prefix.strip(), int(requests), float(seconds or 1)))
+    return rules
+
+class MemoryBackend:
+    """Per-process token buckets: burst of rule.requests, refilled at rule.rate per second"""
+
+    def __init__(self, max_buckets: int = RATE_LIMIT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Tuple[int, str], List[float]] = {}
+
+    def hit(self, rule_index: int, rule: RateLimitRule, key: str, now: Optional[float] = None) -> float:
+        """Take a token. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get((rule_index, key))
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune(now)
+            self._buckets[(rule_index, key)] = [rule.requests - 1.0, now, rule.seconds]
+            return 0.0
+        tokens = min(rule.requests, bucket[0] + (now - bucket[1]) * rule.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rule.rate
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have been idle long enough to be full again (oldest half if none)"""
+        idle = [key for key, (_, last, seconds) in self._buckets.items() if now - last >= seconds]
+        for key in idle or list(self._buckets)[: len(self._buckets) // 2]:
+            self._buckets.pop(key, None)
+
+class SQLBackend:
+    """Fixed-window counters shared through the database"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._last_cleanup = 0.0
+
+    def hit(self, rule_index: int, rule: RateLimitRule, key: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        window_start = int(now // rule.seconds * rule.seconds)
+        window_end = int(window_start + rule.seconds)
+        db: Session = self.session_factory()
+        try:
+            count = self._increment(db, f"{rule_index}:{key}", window_start, window_end)
+            if now - self._last_cleanup > 60:
+                self._last_cleanup = now
+                db.query(models.RateLimitCounter).filter(
+                    models.RateLimitCounter.expires_at < now
+                ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        if count <= rule.requests:
+            return 0.0
+        return window_end - now
+
+    def _increment(self, db: Session, key: str, window_start: int, window_end: int) -> int:
+        C = models.RateLimitCounter
+        stmt = crud.upsert_insert(db, C).values(key=key, window_start=window_start, expires_at=window_end, count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key", "window_start"], set_={"count": C.count + 1}
+        ).returning(C.count)
+        return db.execute(stmt).scalar_one()
+
+class RateLimitStats:
+    """Per-worker decision counters (only updated on the event loop thread)"""
+
+    def __init__(self):
+        self.allowed = 0
+        self.limited = 0
+
+    def count(self, limited: bool) -> None:
+        if limited:
+            self.limited += 1
+        else:
+            self.allowed += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"allowed": self.allowed, "limited": self.limited}
+
+rate_limit_stats = RateLimitStats()
+
+def make_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "sql":
+        return SQLBackend()
+    return MemoryBackend()
+
+def _client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope.get("headers") or []:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+def _client_keys(scope) -> List[str]:
+    """Buckets to charge: always the IP, plus the authenticated user when there is one"""
+    keys = [f"ip:{_client_ip(scope)}"]
+    user = scope.get("user")
+    if user is not None and getattr(user, "is_authenticated", False):
+        keys.append(f"user:{user.identity}")
+    return keys
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After for callers over their limit"""
+
+    def __init__(self, app, rules: Optional[List[RateLimitRule]] = None, backend=None):
+        self.app = app
+        self.rules = parse_rules(RATE_LIMITS) if rules is None else rules
+        self.backend = backend or make_backend()
+        self._blocking = isinstance(self.backend, SQLBackend)
+
+    def _match(self, scope) -> Optional[Tuple[int, RateLimitRule]]:
+        method, path = scope.get("method", ""), scope.get("path", "")
+        for index, rule in enumerate(self.rules):
+            if rule.method == method and path.startswith(rule.path_prefix):
+                return index, rule
+        return None
+
+    async def __call__(self, scope, receive, send):
+        matched = self._match(scope) if scope["type"] == "http" else None
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        index, rule = matched
+        retry_after = 0.0
+        for key in _client_keys(scope):
+            if self._blocking:
+                retry_after = await run_in_threadpool(self.backend.hit, index, rule, key)
+            else:
+                retry_after = self.backend.hit(index, rule, key)
+            if retry_after > 0:
+                break
+        rate_limit_stats.count(limited=retry_after > 0)
+        if retry_after <= 0:
+            await self.app(scope, receive, send)
+            return
+        body = orjson.dumps({"detail": "Rate limit exceeded"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
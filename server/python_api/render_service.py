@@ -0,0 +1,100 @@
+"""
+Resume export service: runs renders in a worker pool and caches the artifacts.
+
+Rendered files are keyed by a hash of (content, template, renderer version,
+format), so repeated downloads of an unchanged resume are served from disk and
+any renderer upgrade naturally invalidates old artifacts.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+import logging
+from dotenv import load_dotenv
+
+from .resume_renderer import ResumeRenderer, RENDERER_VERSION
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Set up render cache directory
+RENDER_DIR = os.getenv("RENDER_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rendered"))
+os.makedirs(RENDER_DIR, exist_ok=True)
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 1)))
+RENDER_CACHE_MAX_FILES = int(os.getenv("RENDER_CACHE_MAX_FILES", "5000"))
+
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """Lazily start the render process pool (None when RENDER_WORKERS is 0)"""
+    global _pool
+    if _pool is None and RENDER_WORKERS > 0:
+        _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+    return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def render_cache_key(content_json: str, template: str, fmt: str) -> str:
+    """Hash of everything that affects the rendered bytes"""
+    digest = hashlib.sha256()
+    for part in (RENDERER_VERSION, fmt, template, content_json):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def cached_render_path(key: str, fmt: str) -> str:
+    return os.path.join(RENDER_DIR, f"{key}.{fmt}")
+
+async def render_to_cache(content: Dict[str, Any], content_json: str, template: str, fmt: str) -> str:
+    """
+    Return the path of the rendered artifact, rendering it off the event loop on a miss
+
+    Args:
+        content: Resume content
+        content_json: Canonical JSON of the content, used for the cache key
+        template: Resume template name
+        fmt: "pdf" or "docx"
+
+    Returns:
+        Path to the cached file
+    """
+    key = render_cache_key(content_json, template, fmt)
+    path = cached_render_path(key, fmt)
+    if os.path.exists(path):
+        return path
+
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(get_pool(), ResumeRenderer.render, content, template, fmt)
+
+    # Write atomically so concurrent requests never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=RENDER_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    _prune_cache()
+    return path
+
+def _prune_cache() -> None:
+    """Remove the least recently written artifacts beyond RENDER_CACHE_MAX_FILES"""
+    try:
+        entries = [e for e in os.scandir(RENDER_DIR) if e.is_file() and not e.name.endswith(".tmp")]
+        if len(entries) <= RENDER_CACHE_MAX_FILES:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - RENDER_CACHE_MAX_FILES]:
+            os.remove(entry.path)
+    except OSError as e:
+        logger.warning(f"Error pruning render cache: {str(e)}")
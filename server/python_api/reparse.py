@@ -0,0 +1,164 @@
+"""
+Batch re-parse of stored resume uploads.
+
+Re-runs ResumeParser.parse_resume over resume_uploads after a parser
+improvement and writes parsed_data back. Rows are read in id order in
+keyset-paginated chunks (WHERE id > last_id ORDER BY id LIMIT n), parsed in a
+process pool and written with one executemany UPDATE per chunk, so memory is
+bounded by the chunk size however large the table is. The last id written is
+stored in backfill_checkpoints after every chunk, so an interrupted run picks
+up where it stopped.
+
+The job throttles itself to a target share of wall time spent in the
+database (--target-db-load), sleeping between chunks when it runs ahead.
+
+Run from the server directory:
+    python -m python_api.reparse                   # resume from the checkpoint
+    python -m python_api.reparse --restart         # start again from the first row
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+from .resume_parser import ResumeParser
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "reparse_uploads"
+REPARSE_WORKERS = int(os.getenv("REPARSE_WORKERS", str(os.cpu_count() or 1)))
+REPARSE_CHUNK_SIZE = int(os.getenv("REPARSE_CHUNK_SIZE", "500"))
+REPARSE_TARGET_DB_LOAD = float(os.getenv("REPARSE_TARGET_DB_LOAD", "0.25"))
+
+def parse_row(row: Tuple[int, str, str]) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """Parse one upload in a worker process. Returns (upload id, parsed data or None)."""
+    upload_id, file_path, file_type = row
+    if not os.path.exists(file_path):
+        return upload_id, None
+    return upload_id, ResumeParser.parse_resume(file_path, file_type)
+
+def load_checkpoint(db: Session, name: str = CHECKPOINT_NAME) -> models.BackfillCheckpoint:
+    checkpoint = db.get(models.BackfillCheckpoint, name)
+    if checkpoint is None:
+        checkpoint = models.BackfillCheckpoint(name=name, last_id=0, processed=0, failed=0)
+        db.add(checkpoint)
+        db.commit()
+    return checkpoint
+
+def fetch_chunk(db: Session, last_id: int, chunk_size: int) -> List[Tuple[int, str, str]]:
+    """Next chunk of uploads after last_id, reading only the columns the parser needs"""
+    U = models.ResumeUpload
+    return [
+        tuple(row) for row in db.execute(
+            select(U.id, U.file_path, U.file_type).where(U.id > last_id).order_by(U.id).limit(chunk_size)
+        )
+    ]
+
+def write_chunk(db: Session, results: List[Tuple[int, Dict[str, Any]]]) -> None:
+    """Write parsed_data for a chunk with one executemany UPDATE (caller commits)"""
+    if not results:
+        return
+    table = models.ResumeUpload.__table__
+    # Core UPDATE bypasses the ORM version counter, so bump it here to invalidate ETags
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("upload_id"))
+        .values(
+            parsed_data=bindparam("new_parsed_data"), parsed_data_ref=None, archived_at=None,
+            version=table.c.version + 1
+        )
+    )
+    db.execute(stmt, [{"upload_id": upload_id, "new_parsed_data": parsed} for upload_id, parsed in results])
+
+def run(
+    session_factory=SessionLocal,
+    executor: Optional[Executor] = None,
+    chunk_size: int = REPARSE_CHUNK_SIZE,
+    target_db_load: float = REPARSE_TARGET_DB_LOAD,
+    restart: bool = False,
+    max_chunks: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Re-parse uploads from the checkpoint onwards
+
+    Args:
+        session_factory: Callable returning a database session
+        executor: Pool to parse in (a process pool of REPARSE_WORKERS if omitted)
+        chunk_size: Rows per keyset page and per UPDATE
+        target_db_load: Share of wall time the job may keep the database busy (0-1)
+        restart: Ignore the checkpoint and start from the first row
+        max_chunks: Stop after this many chunks (for partial runs)
+
+    Returns:
+        Counters for this run: processed, updated, failed
+    """
+    owns_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=max(1, REPARSE_WORKERS))
+    stats = {"processed": 0, "updated": 0, "failed": 0}
+    db = session_factory()
+    try:
+        checkpoint = load_checkpoint(db)
+        if restart:
+            checkpoint.last_id, checkpoint.processed, checkpoint.failed = 0, 0, 0
+            db.commit()
+        chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            started = time.perf_counter()
+            rows = fetch_chunk(db, checkpoint.last_id, chunk_size)
+            db_seconds = time.perf_counter() - started
+            if not rows:
+                break
+
+            results = list(executor.map(parse_row, rows, chunksize=max(1, len(rows) // 32)))
+            parsed = [(upload_id, data) for upload_id, data in results if data is not None]
+
+            write_started = time.perf_counter()
+            write_chunk(db, parsed)
+            checkpoint.last_id = rows[-1][0]
+            checkpoint.processed += len(rows)
+            checkpoint.failed += len(rows) - len(parsed)
+            checkpoint.updated_at = datetime.now(timezone.utc)
+            db.commit()
+            db_seconds += time.perf_counter() - write_started
+
+            stats["processed"] += len(rows)
+            stats["updated"] += len(parsed)
+            stats["failed"] += len(rows) - len(parsed)
+            chunks += 1
+
+            # Keep db_seconds / wall time at or below the target
+            elapsed = time.perf_counter() - started
+            pause = db_seconds / target_db_load - elapsed if target_db_load > 0 else 0
+            if pause > 0:
+                time.sleep(pause)
+            logger.info(f"Re-parsed up to upload {checkpoint.last_id}: {stats}")
+    finally:
+        db.close()
+        if owns_executor:
+            executor.shutdown()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse stored resume uploads and update parsed_data")
+    parser.add_argument("--chunk-size", type=int, default=REPARSE_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--target-db-load", type=float, default=REPARSE_TARGET_DB_LOAD,
+                        help="Share of wall time the job may spend in the database (0-1)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    stats = run(chunk_size=args.chunk_size, target_db_load=args.target_db_load, restart=args.restart)
+    logger.info(f"Re-parse finished: {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Read replicas and read-your-writes routing.
+
+Handlers that only read take database.get_read_db, whose RoutingSession picks
+one healthy replica (round robin) for all of its queries and falls back to the
+primary when none is healthy or lagging by at most REPLICA_MAX_LAG_SECONDS.
+Flushes and INSERT/UPDATE/DELETE statements always go to the primary.
+
+Read-your-writes: when a request's session commits a write, the response sets
+the READ_YOUR_WRITES_COOKIE cookie to the commit time. The cookie comes back
+with the client's next requests on any worker, and their reads only use a
+replica that had replayed past that time at its last lag check.
+"""
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "10"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "30"))
+READ_YOUR_WRITES_COOKIE = os.getenv("READ_YOUR_WRITES_COOKIE", "db_written_at")
+
+def replica_lag(conn: Connection) -> float:
+    """Seconds the replica behind conn is behind its primary (0 for non-Postgres stand-ins)"""
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    # An idle primary sends no new WAL, so only count time when replay is behind receive
+    return float(conn.execute(text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )).scalar() or 0.0)
+
+class ReplicaSet:
+    """Replica engines with periodic health and lag checks"""
+
+    def __init__(
+        self,
+        engines: List[Engine],
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_CHECK_INTERVAL,
+        lag_fn: Callable[[Connection], float] = replica_lag,
+    ):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_fn = lag_fn
+        self.status: List[Dict[str, Any]] = []
+        # (engine, wall-clock time the replica had replayed up to when checked)
+        self._healthy: List[Tuple[Engine, float]] = []
+        self._next_check = 0.0
+        self._checking = threading.Lock()
+        self._turn = itertools.count()
+
+    def _check(self, engine: Engine) -> Dict[str, Any]:
+        try:
+            with engine.connect() as conn:
+                lag = self.lag_fn(conn)
+            return {"healthy": lag <= self.max_lag, "lag_seconds": round(lag, 3)}
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.host or engine.url.database} unavailable: {str(e)}")
+            return {"healthy": False, "lag_seconds": None}
+
+    def check(self) -> None:
+        """Re-check every replica now"""
+        checked_at = time.time()
+        status = [{"replica": i, **self._check(engine)} for i, engine in enumerate(self.engines)]
+        self._healthy = [
+            (engine, checked_at - result["lag_seconds"])
+            for engine, result in zip(self.engines, status) if result["healthy"]
+        ]
+        self.status = status
+        self._next_check = time.monotonic() + self.check_interval
+
+    def choose(self, caught_up_to: Optional[float] = None) -> Optional[Engine]:
+        """
+        A healthy replica, or None to use the primary
+
+        With caught_up_to (a time.time() commit time), only replicas that had
+        replayed past it at their last check qualify.
+        """
+        # One request re-checks when the results are stale; the others use the previous results
+        if time.monotonic() >= self._next_check and self._checking.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self._checking.release()
+        healthy = [
+            engine for engine, replayed_to in self._healthy
+            if caught_up_to is None or replayed_to >= caught_up_to
+        ]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+class RoutingSession(Session):
+    """
+    Session bound to the primary that sends reads to a replica when info["read_only"] is set
+
+    The replica is chosen on the first read and kept for the rest of the
+    session, so one request never mixes replicas with different lag.
+    info["read_after"] restricts the choice to replicas caught up to that time.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = ReplicaSet([]) if replicas is None else replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            if "replica" not in self.info:
+                self.info["replica"] = self.replicas.choose(self.info.get("read_after"))
+            replica = self.info["replica"]
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_wrote_statement(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_commit(session):
+    # Hand the commit time to ReadYourWritesMiddleware through the request's scope state
+    state = session.info.get("request_state")
+    if session.info.get("wrote") and state is not None:
+        state["db_written_at"] = time.time()
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware setting READ_YOUR_WRITES_COOKIE on responses to requests that committed a write"""
+
+    def __init__(self, app, cookie: str = READ_YOUR_WRITES_COOKIE, window: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.cookie = cookie
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message):
+            written_at = state.get("db_written_at")
+            if message["type"] == "http.response.start" and written_at is not None:
+                cookie = f"{self.cookie}={written_at:.6f}; Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+def read_after(request: Request) -> Optional[float]:
+    """Commit time from the read-your-writes cookie, if the caller wrote within the window"""
+    try:
+        written_at = float(request.cookies.get(READ_YOUR_WRITES_COOKIE, ""))
+    except ValueError:
+        return None
+    return written_at if time.time() - written_at < READ_YOUR_WRITES_SECONDS else None
@@ -0,0 +1,108 @@
+"""
+In-process read-through cache of Resume rows.
+
+Entries are detached Resume instances keyed by (resume_id, user_id) and
+evicted least-recently-used once the cache is full. Every lookup is validated
+against the row's current version stamp (version counter + created_at), which
+is a cheap single-row query, so entries written by another gunicorn worker are
+never served stale. Local writes invalidate entries directly.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from dotenv import load_dotenv
+
+from . import models
+
+load_dotenv()
+
+ResumeKey = Tuple[int, Optional[int]]
+
+def _deep_sizeof(value: Any) -> int:
+    """Approximate memory held by a decoded JSON value"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(k) + _deep_sizeof(v) for k, v in value.items())
+    elif isinstance(value, list):
+        size += sum(_deep_sizeof(item) for item in value)
+    return size
+
+def _resume_sizeof(resume: models.Resume) -> int:
+    """Approximate memory held by a cached resume (JSON blobs dominate)"""
+    state = resume.__dict__
+    return (
+        sys.getsizeof(resume)
+        + _deep_sizeof(state.get("content"))
+        + sys.getsizeof(state.get("content_json") or "")
+    )
+
+class ResumeCache:
+    """Size-bounded LRU cache of detached Resume instances"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ResumeKey, Tuple[Hashable, models.Resume, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ResumeKey, stamp: Hashable) -> Optional[models.Resume]:
+        """Return the cached resume if its stamp still matches the database"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: ResumeKey, stamp: Hashable, resume: models.Resume) -> None:
+        """Store a detached resume, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        size = _resume_sizeof(resume)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (stamp, resume, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, resume_id: int, user_id: Optional[int] = None) -> None:
+        """Drop cached entries for a resume (both owner-scoped and unscoped lookups)"""
+        with self._lock:
+            self._discard((resume_id, user_id))
+            self._discard((resume_id, None))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and approximate memory footprint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "approx_bytes": self._bytes
+            }
+
+    def _discard(self, key: ResumeKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+# Shared per-process cache instance
+resume_cache = ResumeCache(int(os.getenv("RESUME_CACHE_SIZE", "1024")))
@@ -0,0 +1,295 @@
+"""
+Revision history of resume content.
+
+Every save that changes Resume.content adds a row to resume_revisions. Most
+rows hold only a delta from the previous revision, a list of operations
+produced by diff():
+
+    ["=", path, value]               set the key or index at path to value
+    ["-", path]                      remove the key at path
+    ["*", path, start, stop, items]  replace list[start:stop] at path with items
+
+Paths are lists of dict keys and list indices from the content root. Every
+REVISION_SNAPSHOT_INTERVAL revisions (and whenever a delta would be larger than
+the content itself) the full content is stored instead, so rebuilding any
+revision reads one snapshot and fewer than REVISION_SNAPSHOT_INTERVAL deltas.
+
+Autosaves add up, so the compaction job thins old history: revisions newer than
+REVISION_KEEP_ALL_DAYS are all kept, older ones down to the last revision of
+each day, and revisions older than REVISION_RETENTION_DAYS are dropped. The
+latest revision is always kept. Revision numbers of kept rows never change.
+
+A revision is numbered with the Resume.version its save wrote. The version is
+bumped by an optimistic-locking UPDATE, so concurrent saves never produce the
+same number: the losing save fails on the resume row before its revision is
+added. Saves that leave content alone bump the version without adding a
+revision, so numbers can skip.
+
+Run from the server directory:
+    python -m python_api.resume_history
+"""
+import argparse
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, case, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REVISION_SNAPSHOT_INTERVAL = int(os.getenv("REVISION_SNAPSHOT_INTERVAL", "50"))
+REVISION_KEEP_ALL_DAYS = int(os.getenv("REVISION_KEEP_ALL_DAYS", "7"))
+REVISION_RETENTION_DAYS = int(os.getenv("REVISION_RETENTION_DAYS", "365"))
+
+Path = List[Any]
+
+def diff(old: Any, new: Any, path: Optional[Path] = None) -> List[list]:
+    """Operations that turn old into new"""
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [["-", path + [key]] for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops += diff(old[key], value, path + [key])
+            else:
+                ops.append(["=", path + [key], value])
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        # Trim the common head and tail, then patch or splice what is left
+        start = 0
+        while start < len(old) and start < len(new) and old[start] == new[start]:
+            start += 1
+        end_old, end_new = len(old), len(new)
+        while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+            end_old -= 1
+            end_new -= 1
+        if end_old - start == end_new - start:
+            ops = []
+            for index in range(start, end_old):
+                ops += diff(old[index], new[index], path + [index])
+            return ops
+        return [["*", path, start, end_old, new[start:end_new]]]
+    return [["=", path, new]]
+
+def apply(content: Any, ops: Iterable[list]) -> Any:
+    """Apply diff() operations to content in place and return the result"""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if kind == "=" and not path:
+            content = op[2]
+            continue
+        target = content
+        for key in path[:-1] if kind != "*" else path:
+            target = target[key]
+        if kind == "=":
+            target[path[-1]] = op[2]
+        elif kind == "-":
+            del target[path[-1]]
+        else:
+            target[op[2]:op[3]] = op[4]
+    return content
+
+def _entry(previous: Any, content: Any, deltas_since_snapshot: int, interval: int) -> Tuple[bool, Any]:
+    """(is_snapshot, data) to store for content following previous"""
+    if previous is None or deltas_since_snapshot + 1 >= interval:
+        return True, content
+    ops = diff(previous, content)
+    if len(orjson.dumps(ops)) >= len(orjson.dumps(content)):
+        return True, content
+    return False, ops
+
+def record_revision(
+    db: Session,
+    resume_id: int,
+    version: int,
+    previous: Any,
+    content: Any,
+    interval: Optional[int] = None,
+) -> Optional[models.ResumeRevision]:
+    """
+    Add a revision for a save of content (previous is the content it replaces)
+
+    version is the Resume.version the save has already flushed, and becomes
+    the revision number. Flushes but does not commit, so the revision is
+    written with the save.
+
+    Returns:
+        The new revision, or None if content did not change
+    """
+    R = models.ResumeRevision
+    last_snapshot = (
+        select(func.max(R.revision)).where(R.resume_id == resume_id, R.is_snapshot).scalar_subquery()
+    )
+    last, deltas = db.execute(
+        select(func.max(R.revision), func.count(case((R.revision > last_snapshot, 1))))
+        .where(R.resume_id == resume_id)
+    ).one()
+    if last is not None and previous == content:
+        return None
+    if last is None:
+        previous = None
+    interval = interval or REVISION_SNAPSHOT_INTERVAL
+    is_snapshot, data = _entry(previous, content, deltas, interval)
+    db_revision = R(resume_id=resume_id, revision=version, is_snapshot=is_snapshot, data=data)
+    db.add(db_revision)
+    db.flush()
+    return db_revision
+
+def list_revisions(db: Session, resume_id: int, skip: int = 0, limit: int = 100) -> List[Tuple[int, datetime]]:
+    """(revision, created_at) of a resume's revisions, newest first"""
+    R = models.ResumeRevision
+    return db.execute(
+        select(R.revision, R.created_at)
+        .where(R.resume_id == resume_id)
+        .order_by(R.revision.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+def get_revision(db: Session, resume_id: int, revision: int) -> Optional[Tuple[Any, datetime]]:
+    """(content, created_at) of one revision, rebuilt from the nearest snapshot at or before it"""
+    R = models.ResumeRevision
+    base = (
+        select(func.max(R.revision))
+        .where(R.resume_id == resume_id, R.is_snapshot, R.revision <= revision)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(R.revision, R.data, R.created_at)
+        .where(R.resume_id == resume_id, R.revision >= base, R.revision <= revision)
+        .order_by(R.revision)
+    ).all()
+    if not rows or rows[-1].revision != revision:
+        return None
+    content = rows[0].data
+    for row in rows[1:]:
+        content = apply(content, row.data)
+    return content, rows[-1].created_at
+
+def delete_history(db: Session, resume_id: int) -> None:
+    db.execute(delete(models.ResumeRevision).where(models.ResumeRevision.resume_id == resume_id))
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def kept_revisions(
+    revisions: List[Tuple[int, datetime]],
+    now: datetime,
+    keep_all_days: int = REVISION_KEEP_ALL_DAYS,
+    retention_days: int = REVISION_RETENTION_DAYS,
+) -> Set[int]:
+    """Revision numbers the retention policy keeps, from (revision, created_at) in revision order"""
+    keep_all_after = now - timedelta(days=keep_all_days)
+    drop_before = now - timedelta(days=retention_days)
+    kept = set()
+    last_of_day: Dict[Any, int] = {}
+    for revision, created_at in revisions:
+        created_at = _utc(created_at)
+        if created_at >= keep_all_after:
+            kept.add(revision)
+        elif created_at >= drop_before:
+            last_of_day[created_at.date()] = revision
+    kept.update(last_of_day.values())
+    if revisions:
+        kept.add(revisions[-1][0])
+    return kept
+
+def compact_resume(
+    db: Session,
+    resume_id: int,
+    now: Optional[datetime] = None,
+    keep_all_days: int = REVISION_KEEP_ALL_DAYS,
+    retention_days: int = REVISION_RETENTION_DAYS,
+    interval: int = REVISION_SNAPSHOT_INTERVAL,
+) -> int:
+    """
+    Drop the revisions of one resume that the retention policy does not keep
+
+    The kept revisions are re-encoded as a new chain of snapshots and deltas.
+    Commits.
+
+    Returns:
+        Number of revisions dropped
+    """
+    R = models.ResumeRevision
+    rows = db.execute(
+        select(R.revision, R.created_at, R.is_snapshot, R.data).where(R.resume_id == resume_id).order_by(R.revision)
+    ).all()
+    kept = kept_revisions([(row.revision, row.created_at) for row in rows],
+                          now or datetime.now(timezone.utc), keep_all_days, retention_days)
+    dropped = [row.revision for row in rows if row.revision not in kept]
+    if not dropped:
+        return 0
+
+    # Rebuild every revision in order, re-encoding the kept ones against the previous kept one
+    stmt = (
+        update(R.__table__)
+        .where(R.resume_id == resume_id, R.revision == bindparam("rev"))
+        .values(is_snapshot=bindparam("is_snapshot"), data=bindparam("data"))
+    )
+    params = []
+    content = previous = None
+    deltas = 0
+    for row in rows:
+        content = row.data if row.is_snapshot else apply(content, row.data)
+        if row.revision not in kept:
+            continue
+        # apply() works in place, so later revisions must not share objects with the stored ones
+        snapshot = orjson.loads(orjson.dumps(content))
+        is_snapshot, data = _entry(previous, snapshot, deltas, interval)
+        deltas = 0 if is_snapshot else deltas + 1
+        params.append({"rev": row.revision, "is_snapshot": is_snapshot, "data": data})
+        previous = snapshot
+    db.execute(delete(R).where(R.resume_id == resume_id, R.revision.in_(dropped)))
+    db.execute(stmt, params)
+    db.commit()
+    return len(dropped)
+
+def compact_history(db: Session, keep_all_days: int = REVISION_KEEP_ALL_DAYS) -> Dict[str, int]:
+    """Compact every resume with revisions older than keep_all_days"""
+    R = models.ResumeRevision
+    cutoff = datetime.now(timezone.utc) - timedelta(days=keep_all_days)
+    stats = {"resumes": 0, "dropped": 0}
+    last_id = 0
+    while True:
+        resume_id = db.execute(
+            select(func.min(R.resume_id)).where(R.resume_id > last_id, R.created_at < cutoff)
+        ).scalar()
+        if resume_id is None:
+            break
+        dropped = compact_resume(db, resume_id, keep_all_days=keep_all_days)
+        stats["resumes"] += 1
+        stats["dropped"] += dropped
+        last_id = resume_id
+    return stats
+
+def run_once(session_factory=SessionLocal, keep_all_days: int = REVISION_KEEP_ALL_DAYS) -> Dict[str, int]:
+    db = session_factory()
+    try:
+        stats = compact_history(db, keep_all_days)
+    finally:
+        db.close()
+    logger.info(f"Revision compaction finished: {stats}")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Drop old resume revisions according to the retention policy")
+    parser.add_argument("--keep-all-days", type=int, default=REVISION_KEEP_ALL_DAYS, help="Keep every revision newer than this")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run_once(keep_all_days=args.keep_all_days)
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,102 @@
 import os
-import json
-import tempfile
+import re
 import uuid
-from typing import Dict, Any, Optional, Tuple
+import zipfile
+import zlib
+from io import BytesIO
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+from .skills import skills_in_tokens
+from .text_normalizer import decode_bytes, normalize, normalize_text, tokenize
+
 logger = logging.getLogger(__name__)
 
 # Set up upload directory
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+DOCX_TYPES = ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",)
+
+# Heading text (lower-cased) -> section name
+SECTION_HEADINGS = {
+    "summary": "summary", "profile": "summary", "professional summary": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience", "employment history": "experience",
+    "professional experience": "experience", "work history": "experience",
+    "education": "education", "skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "certifications": "certifications", "certificates": "certifications",
+    "languages": "languages", "projects": "projects"
+}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\d[\d ().-]{7,}\d")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.IGNORECASE)
+_DATE = r"(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.? )?\d{4}|[Pp]resent|[Cc]urrent"
+_DATE_RANGE = re.compile(rf"({_DATE})\s*(?:-|–|—|to)\s*({_DATE})")
+_PDF_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+_PDF_TEXT = re.compile(rb"\((?:[^()\\]|\\.)*\)\s*Tj|\[(?:[^\]])*\]\s*TJ|T\*|\d+(?:\.\d+)? -?\d+(?:\.\d+)? Td")
+_PDF_STRING = re.compile(rb"\(((?:[^()\\]|\\.)*)\)")
+_DOCX_PARAGRAPH = re.compile(r"<w:p[ >].*?</w:p>", re.DOTALL)
+_DOCX_TEXT = re.compile(r"<w:t(?: [^>]*)?>([^<]*)</w:t>")
+
+def _pdf_unescape(value: bytes) -> str:
+    value = re.sub(rb"\\([()\\])", rb"\1", value).replace(b"\\n", b"\n")
+    return value.decode("latin-1")
+
+def _pdf_text(data: bytes) -> str:
+    """Text of the text-showing operators in a PDF's (optionally Flate-compressed) content streams"""
+    lines = []
+    for match in _PDF_STREAM.finditer(data):
+        stream = match.group(1)
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass  # Uncompressed stream
+        line = []
+        for op in _PDF_TEXT.finditer(stream):
+            token = op.group()
+            if token.endswith(b"Tj") or token.endswith(b"TJ"):
+                line.extend(_pdf_unescape(s) for s in _PDF_STRING.findall(token))
+            elif line:
+                lines.append("".join(line))
+                line = []
+        if line:
+            lines.append("".join(line))
+    return "\n".join(lines)
+
+def _docx_text(data: bytes) -> str:
+    """Paragraph text of a DOCX document"""
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        document = archive.read("word/document.xml").decode("utf-8")
+    paragraphs = ["".join(_DOCX_TEXT.findall(p)) for p in _DOCX_PARAGRAPH.findall(document)]
+    return "\n".join(p.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">") for p in paragraphs)
+
+def _entries(text: str) -> List[Tuple[str, str, str, str]]:
+    """Split a section into blank-line separated entries: (first line, rest, start date, end date)"""
+    entries = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        if not lines:
+            continue
+        dates = _DATE_RANGE.search(block)
+        title = _DATE_RANGE.sub("", lines[0]).strip(" |,-–—()")
+        entries.append((title, "\n".join(lines[1:]), dates.group(1) if dates else "", dates.group(2) if dates else ""))
+    return entries
+
+def _list_items(text: str) -> List[str]:
+    return [item.strip(" -•*") for item in re.split(r"[\n;]", text) if item.strip(" -•*")]
+
 class ResumeParser:
     """Utility for parsing and processing uploaded resume files"""
     
+    @staticmethod
+    def upload_path(original_filename: str) -> Tuple[str, str]:
+        """Unique path in UPLOAD_DIR for a new upload. Returns (file_path, unique_filename)."""
+        # Create a unique filename to prevent collisions
+        file_extension = os.path.splitext(original_filename)[1]
+        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        return os.path.join(UPLOAD_DIR, unique_filename), unique_filename
+    
     @staticmethod
     def save_uploaded_file(file_content: bytes, original_filename: str) -> Tuple[str, str]:
         """
@@ -26,10 +109,7 @@ class ResumeParser:
         Returns:
             Tuple of (file_path, unique_filename)
         """
-        # Create a unique filename to prevent collisions
-        file_extension = os.path.splitext(original_filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
+        file_path, unique_filename = ResumeParser.upload_path(original_filename)
         
         # Save the file
         with open(file_path, "wb") as f:
@@ -42,6 +122,9 @@ class ResumeParser:
         """
         Parse a resume file to extract structured data
         
+        Runs the extract text -> normalize -> segment sections -> extract
+        entities stages in one go; parse_pipeline runs the same stages with caching and timings.
+        
         Args:
             file_path: Path to the resume file
             file_type: MIME type of the file
@@ -50,39 +133,111 @@ class ResumeParser:
             Dictionary of parsed data or None if parsing failed
         """
         try:
-            # This is a simplified implementation
-            # In a real-world scenario, you would use specialized libraries
-            # like PyPDF2 for PDFs, python-docx for Word docs, etc.
-            
-            # Example structure for the parsed data
-            parsed_data = {
-                "personal_info": {
-                    "name": "",
-                    "email": "",
-                    "phone": "",
-                    "location": "",
-                    "website": "",
-                    "linkedin": ""
-                },
-                "summary": "",
-                "education": [],
-                "experience": [],
-                "skills": [],
-                "certifications": [],
-                "languages": [],
-                "projects": []
-            }
-            
-            # Here you would add code to extract text from different file types
-            # and then use NLP/ML techniques to identify and categorize sections
-            
-            # For now, we'll just return an empty structure
-            return parsed_data
+            normalized = normalize(ResumeParser.extract_text(file_path, file_type))
+            sections = ResumeParser.segment_sections(normalized["text"])
+            return ResumeParser.extract_entities(sections, normalized["tokens"])
             
         except Exception as e:
             logger.error(f"Error parsing resume: {str(e)}")
             return None
     
+    @staticmethod
+    def extract_text(file_path: str, file_type: str) -> str:
+        """
+        Extract plain text from a resume file
+        
+        Args:
+            file_path: Path to the resume file
+            file_type: MIME type of the file
+            
+        Returns:
+            Extracted text, lines separated by newlines
+        """
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if file_type == "application/pdf" or data.startswith(b"%PDF"):
+            return _pdf_text(data)
+        if file_type in DOCX_TYPES or data.startswith(b"PK"):
+            return _docx_text(data)
+        return decode_bytes(data)
+    
+    @staticmethod
+    def segment_sections(text: str) -> Dict[str, str]:
+        """
+        Split resume text into sections by recognised headings
+        
+        Args:
+            text: Plain resume text
+            
+        Returns:
+            Dictionary of section name -> section text; text before the first
+            heading is stored under "header"
+        """
+        sections: Dict[str, List[str]] = {"header": []}
+        current = "header"
+        for line in text.splitlines():
+            heading = SECTION_HEADINGS.get(line.strip().strip(":").lower())
+            if heading:
+                current = heading
+                sections.setdefault(current, [])
+            else:
+                sections[current].append(line.rstrip())
+        return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    
+    @staticmethod
+    def extract_entities(sections: Dict[str, str], tokens: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Extract structured resume data from segmented sections
+        
+        Args:
+            sections: Output of segment_sections
+            tokens: Token stream of the whole document from text_normalizer
+                (computed from the sections if omitted)
+            
+        Returns:
+            Dictionary of parsed data, in the shape convert_to_resume_content expects
+        """
+        header = sections.get("header", "")
+        everything = "\n".join(sections.values())
+        lines = [line.strip() for line in header.splitlines() if line.strip()]
+        email = _EMAIL.search(everything)
+        phone = _PHONE.search(header)
+        linkedin = _LINKEDIN.search(everything)
+        name = next((line for line in lines if not _EMAIL.search(line) and not _PHONE.search(line)), "")
+        
+        skill_names = [s.strip() for s in re.split(r"[,;\n|•]", sections.get("skills", "")) if s.strip()]
+        if tokens is None:
+            tokens = tokenize(normalize_text(everything))
+        listed = {n.casefold() for n in skill_names}
+        skill_names += [s for s in skills_in_tokens(tokens) if s not in listed]
+        
+        return {
+            "personal_info": {
+                "name": name,
+                "email": email.group() if email else "",
+                "phone": phone.group().strip() if phone else "",
+                "location": "",
+                "website": "",
+                "linkedin": linkedin.group() if linkedin else ""
+            },
+            "summary": sections.get("summary", ""),
+            "education": [
+                {"institution": title, "description": body, "start_date": start, "end_date": end}
+                for title, body, start, end in _entries(sections.get("education", ""))
+            ],
+            "experience": [
+                {"title": title, "description": body, "start_date": start, "end_date": end}
+                for title, body, start, end in _entries(sections.get("experience", ""))
+            ],
+            "skills": [{"name": name} for name in skill_names],
+            "certifications": _list_items(sections.get("certifications", "")),
+            "languages": _list_items(sections.get("languages", "")),
+            "projects": [
+                {"name": title, "description": body}
+                for title, body, _, _ in _entries(sections.get("projects", ""))
+            ]
+        }
+    
     @staticmethod
     def convert_to_resume_content(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """
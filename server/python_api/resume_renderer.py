@@ -0,0 +1,225 @@
+import io
+import zipfile
+import zlib
+from typing import Dict, Any, List, Tuple
+from xml.sax.saxutils import escape
+
+# Bump whenever rendered output changes so cached artifacts are regenerated
+RENDERER_VERSION = "1"
+
+# Layout settings per resume template
+TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "professional": {
+        "name_size": 20, "heading_size": 12, "body_size": 10, "uppercase_headings": True,
+        "sections": ["summary", "experience", "education", "skills", "projects", "certifications", "languages"]
+    },
+    "modern": {
+        "name_size": 24, "heading_size": 13, "body_size": 10, "uppercase_headings": False,
+        "sections": ["summary", "skills", "experience", "projects", "education", "certifications", "languages"]
+    },
+    "minimal": {
+        "name_size": 16, "heading_size": 11, "body_size": 10, "uppercase_headings": False,
+        "sections": ["experience", "education", "skills"]
+    },
+}
+DEFAULT_TEMPLATE = "professional"
+
+SECTION_TITLES = {
+    "summary": "Summary", "experience": "Experience", "education": "Education", "skills": "Skills",
+    "projects": "Projects", "certifications": "Certifications", "languages": "Languages"
+}
+
+# A block is (style, text) where style is one of: name, contact, heading, subheading, body, bullet
+Block = Tuple[str, str]
+
+class ResumeRenderer:
+    """Renders resume content into PDF and DOCX documents"""
+
+    @staticmethod
+    def build_blocks(content: Dict[str, Any], template: str) -> List[Block]:
+        """Flatten resume content into styled text blocks in template order"""
+        layout = TEMPLATES.get(template, TEMPLATES[DEFAULT_TEMPLATE])
+        info = content.get("personalInfo", {}) or {}
+        name = info.get("name") or " ".join(filter(None, [info.get("firstName"), info.get("lastName")]))
+        contact = " | ".join(
+            filter(None, [info.get(key) for key in ("email", "phone", "location", "website", "linkedin")])
+        )
+        blocks: List[Block] = [("name", name or "Resume")]
+        if info.get("headline"):
+            blocks.append(("contact", info["headline"]))
+        if contact:
+            blocks.append(("contact", contact))
+
+        for section in layout["sections"]:
+            section_blocks = ResumeRenderer._section_blocks(section, content, info)
+            if section_blocks:
+                title = SECTION_TITLES[section]
+                blocks.append(("heading", title.upper() if layout["uppercase_headings"] else title))
+                blocks.extend(section_blocks)
+        return blocks
+
+    @staticmethod
+    def _section_blocks(section: str, content: Dict[str, Any], info: Dict[str, Any]) -> List[Block]:
+        if section == "summary":
+            summary = content.get("summary") or info.get("summary")
+            return [("body", summary)] if summary else []
+        if section == "skills":
+            names = [s.get("name", "") if isinstance(s, dict) else str(s) for s in content.get("skills", [])]
+            names = [n for n in names if n]
+            return [("body", ", ".join(names))] if names else []
+        if section in ("certifications", "languages"):
+            items = [i.get("name", "") if isinstance(i, dict) else str(i) for i in content.get(section, [])]
+            return [("bullet", item) for item in items if item]
+
+        blocks: List[Block] = []
+        for item in content.get(section, []):
+            if section == "experience":
+                heading = " - ".join(filter(None, [item.get("title"), item.get("company")]))
+            elif section == "education":
+                heading = " - ".join(filter(None, [item.get("degree"), item.get("institution")]))
+            else:
+                heading = item.get("name") or item.get("title") or ""
+            dates = " - ".join(filter(None, [item.get("startDate"), item.get("endDate")]))
+            if heading or dates:
+                blocks.append(("subheading", f"{heading} ({dates})" if dates else heading))
+            if item.get("description"):
+                blocks.append(("body", item["description"]))
+            for highlight in item.get("highlights", []) or []:
+                blocks.append(("bullet", highlight))
+        return blocks
+
+    @staticmethod
+    def render_pdf(content: Dict[str, Any], template: str) -> bytes:
+        """Render resume content as a PDF using the built-in Helvetica fonts"""
+        sizes = _font_sizes(template)
+        page_width, page_height, margin = 612, 792, 54
+        pages: List[List[str]] = [[]]
+        y = page_height - margin
+
+        for style, text in ResumeRenderer.build_blocks(content, template):
+            size = sizes[style]
+            font = "F2" if style in ("name", "heading", "subheading") else "F1"
+            indent = 12 if style == "bullet" else 0
+            if style == "bullet":
+                text = "- " + text
+            if style == "heading":
+                y -= size * 0.6
+            # Approximate Helvetica's average glyph width to wrap lines
+            max_chars = max(20, int((page_width - 2 * margin - indent) / (size * 0.5)))
+            for line in _wrap(text, max_chars):
+                if y - size < margin:
+                    pages.append([])
+                    y = page_height - margin
+                y -= size * 1.3
+                pages[-1].append(f"BT /{font} {size} Tf {margin + indent} {y:.1f} Td ({_pdf_escape(line)}) Tj ET")
+
+        # Object layout: 1 catalog, 2 pages, 3-4 fonts, then (page, content) pairs
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            None,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        page_refs = []
+        for commands in pages:
+            stream = zlib.compress("\n".join(commands).encode("cp1252", "replace"))
+            page_number = len(objects) + 1
+            page_refs.append(f"{page_number} 0 R")
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_width} {page_height}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+            )
+            objects.append(
+                f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream"
+            )
+        objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>".encode()
+
+        out = io.BytesIO()
+        out.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(out.tell())
+            out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref_offset = out.tell()
+        out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            out.write(f"{offset:010d} 00000 n \n".encode())
+        out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+        return out.getvalue()
+
+    @staticmethod
+    def render_docx(content: Dict[str, Any], template: str) -> bytes:
+        """Render resume content as a minimal WordprocessingML (DOCX) document"""
+        sizes = _font_sizes(template)
+        paragraphs = []
+        for style, text in ResumeRenderer.build_blocks(content, template):
+            bold = "<w:b/>" if style in ("name", "heading", "subheading") else ""
+            indent = '<w:pPr><w:ind w:left="360"/></w:pPr>' if style == "bullet" else ""
+            prefix = "• " if style == "bullet" else ""
+            paragraphs.append(
+                f'<w:p>{indent}<w:r><w:rPr>{bold}<w:sz w:val="{sizes[style] * 2}"/></w:rPr>'
+                f'<w:t xml:space="preserve">{escape(prefix + text)}</w:t></w:r></w:p>'
+            )
+        document = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{"".join(paragraphs)}</w:body></w:document>'
+        )
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as docx:
+            docx.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+            docx.writestr("_rels/.rels", DOCX_RELS)
+            docx.writestr("word/document.xml", document)
+        return out.getvalue()
+
+    @staticmethod
+    def render(content: Dict[str, Any], template: str, fmt: str) -> bytes:
+        """Render resume content in the requested format ("pdf" or "docx")"""
+        if fmt == "pdf":
+            return ResumeRenderer.render_pdf(content, template)
+        if fmt == "docx":
+            return ResumeRenderer.render_docx(content, template)
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+def _font_sizes(template: str) -> Dict[str, int]:
+    """Point size for each block style in a template"""
+    layout = TEMPLATES.get(template, TEMPLATES[DEFAULT_TEMPLATE])
+    body = layout["body_size"]
+    return {
+        "name": layout["name_size"], "heading": layout["heading_size"], "subheading": body + 1,
+        "contact": body - 1, "body": body, "bullet": body
+    }
+
+def _wrap(text: str, max_chars: int) -> List[str]:
+    """Greedy word wrap"""
+    lines, current = [], ""
+    for word in str(text).split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
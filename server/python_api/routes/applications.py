@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import crud, schemas
+from ..database import get_db
+
+router = APIRouter(prefix="/api", tags=["applications"])
+
+def _bulk_write(db: Session, write, *args) -> schemas.BulkWriteResult:
+    """Run a bulk write, reporting unknown job/resume ids as a client error"""
+    try:
+        return schemas.BulkWriteResult(count=write(db, *args))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown job or resume id"
+        )
+
+@router.post("/jobs/saved/bulk", response_model=schemas.BulkWriteResult)
+def bulk_save_jobs(request: schemas.BulkSavedJobs, db: Session = Depends(get_db)):
+    """Save many jobs for a user in one transaction"""
+    return _bulk_write(db, crud.save_jobs, request.user_id, request.job_ids)
+
+@router.post("/jobs/saved/bulk-delete", response_model=schemas.BulkWriteResult)
+def bulk_unsave_jobs(request: schemas.BulkSavedJobs, db: Session = Depends(get_db)):
+    """Unsave many jobs for a user in one transaction"""
+    return _bulk_write(db, crud.unsave_jobs, request.user_id, request.job_ids)
+
+@router.post("/applications/bulk-status", response_model=schemas.BulkWriteResult)
+def bulk_update_application_status(request: schemas.BulkApplicationStatusUpdate, db: Session = Depends(get_db)):
+    """Create or update the application status of many jobs in one transaction"""
+    return _bulk_write(db, crud.upsert_application_statuses, request)
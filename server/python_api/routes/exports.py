@@ -0,0 +1,92 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+
+from .. import crud, export_archive
+from ..database import get_db, get_read_db
+from ..http_cache import RangeNotSatisfiable, parse_range, set_cache_headers
+from ..schemas import MAX_BULK_ITEMS
+from ..render_service import EXPORT_MEDIA_TYPES, render_to_cache
+
+router = APIRouter(prefix="/resumes", tags=["exports"])
+archive_router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+@router.get("/{resume_id}/export")
+async def export_resume(
+    resume_id: int,
+    user_id: int,
+    format: str = Query("pdf", description="Export format: pdf or docx"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Render a resume to PDF or DOCX using its template
+    
+    Rendered files are cached, so repeated downloads of an unchanged resume are free
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}"
+        )
+    
+    db_resume = await run_in_threadpool(crud.get_resume, db, resume_id, user_id)
+    if not db_resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    content = db_resume.content
+    path = await render_to_cache(content, db_resume.content_json, db_resume.template, format)
+    
+    filename = f"{db_resume.title}.{format}".replace('"', "")
+    return FileResponse(path, media_type=EXPORT_MEDIA_TYPES[format], filename=filename)
+
+@archive_router.get("/resumes")
+def export_resumes_archive(
+    user_ids: List[int] = Query([], description="Users whose resumes to export"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream all resumes of a set of users as a zip of NDJSON and original files
+    
+    The archive is reproducible, so an interrupted download can be resumed with
+    Range (and If-Range set to the ETag) as long as no resume or file changed
+    """
+    if not 0 < len(user_ids) <= MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Between 1 and {MAX_BULK_ITEMS} user_ids are required"
+        )
+    # Both the dry run and the stream read the primary: a replica chosen per statement could
+    # differ between the two. The session stays open until the stream finishes.
+    plan = export_archive.plan_export(db, user_ids)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": 'attachment; filename="resumes.zip"',
+    }
+    try:
+        byte_range = parse_range(range_header, plan.size) if if_range in (None, plan.etag) else None
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{plan.size}"}
+        )
+    start, end = byte_range or (0, plan.size)
+    headers["Content-Length"] = str(end - start)
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{plan.size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    response = StreamingResponse(
+        export_archive.iter_archive(db, plan, start, end),
+        status_code=status_code,
+        media_type="application/zip",
+        headers=headers,
+    )
+    return set_cache_headers(response, plan.etag)
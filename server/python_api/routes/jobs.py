@@ -1,24 +1,40 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Query, HTTPException, Depends
+from typing import List, Optional, Tuple
 import httpx
-import os
+import logging
+import zlib
 from dotenv import load_dotenv
 from ..schemas import JobResponse
-from ..database import get_db
+from ..database import get_read_db
+from ..skills import extract_skills
+from .. import adzuna, crud, ingestion, job_index, models, search_index, skill_profile
+from ..job_records import JobRecord, add_snippets, collapse_records, parse_fields, record_response, records_response
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
-# Adzuna API credentials
-ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY")
-ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
-ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+def _parse_fields(fields: Optional[str]):
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _apply_state(job: JobRecord, state: Optional[Tuple[bool, Optional[str]]]) -> None:
+    """Fill saved/status from a crud.get_job_states entry"""
+    if state is not None:
+        saved, application_status = state
+        job.saved = bool(saved)
+        job.status = application_status or "new"
 
 @router.get("", response_model=List[JobResponse])
 async def get_jobs(
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Query(None, description="Job title or keyword"),
     location: Optional[str] = Query(None, description="Location"),
     country: str = Query("us", description="Country code"),
@@ -26,102 +42,114 @@ async def get_jobs(
     experience: Optional[str] = Query(None, description="Experience level"),
     remote: Optional[str] = Query(None, description="Remote or onsite"),
     salary: Optional[str] = Query(None, description="Salary range"),
-    db: Session = Depends(get_db),
+    user_id: Optional[int] = Query(None, description="Fill saved/status for this user"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all but description)"),
+    db: Session = Depends(get_read_db),
 ):
     """
     Fetch jobs from Adzuna API based on search criteria
+    
+    The page's postings are stored after the response is sent, so the full
+    description of any listed job is available from GET /api/jobs/{job_id}?source=adzuna.
     """
+    selected = _parse_fields(fields)
     try:
-        # Build Adzuna API URL
-        url = f"{ADZUNA_BASE_URL}/{country}/search/1"
+        params = adzuna.build_search_params(title, location, type, salary)
         
-        # Prepare query parameters
-        params = {
-            "app_id": ADZUNA_APP_ID,
-            "app_key": ADZUNA_API_KEY,
-            "results_per_page": 20,
-            "content-type": "application/json",
-        }
-        
-        # Add search parameters if provided
-        if title:
-            params["what"] = title
-        if location:
-            params["where"] = location
-        if salary:
-            # Parse salary range
-            try:
-                min_salary, max_salary = salary.split("-")
-                params["salary_min"] = min_salary
-                params["salary_max"] = max_salary
-            except ValueError:
-                pass
-        
-        # Add filters for job type
-        if type:
-            type_mapping = {
-                "full_time": "full_time",
-                "part_time": "part_time",
-                "contract": "contract",
-                "temporary": "temp",
-                "internship": "internship"
-            }
-            if type in type_mapping:
-                params["contract_type"] = type_mapping[type]
+        # Materialized skill bitset of the user, if any (no resume parsing here).
+        # Database calls run in the threadpool so they don't block the event loop.
+        profile = await run_in_threadpool(skill_profile.get_profile, db, user_id) if user_id is not None else None
         
         # Make request to Adzuna API
         async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            data = response.json()
+            data = await adzuna.fetch_page(client, country, 1, params)
             
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, 
-                                    detail=f"Error fetching jobs: {data.get('error', 'Unknown error')}")
-            
-            # Transform Adzuna results to our JobResponse model
+            # Transform Adzuna results into compact records (encoded directly, no JobResponse copies)
             jobs = []
             for result in data.get("results", []):
-                # Calculate match percentage for demo purposes
-                import random
-                match_score = random.randint(60, 98)
-                
-                job_data = {
-                    "id": result.get("id", ""),
-                    "title": result.get("title", ""),
-                    "company": result.get("company", {}).get("display_name", "Unknown Company"),
-                    "location": result.get("location", {}).get("display_name", ""),
-                    "description": result.get("description", ""),
-                    "postedAt": result.get("created", ""),
-                    "salary": result.get("salary_is_predicted", "Not specified"),
-                    "type": result.get("contract_type", "Not specified"),
-                    "isRemote": "remote" in result.get("description", "").lower(),
-                    "skills": extract_skills(result.get("description", "")),
-                    "match": match_score,
-                    "status": "new",
-                    "saved": False
-                }
-                jobs.append(job_data)
+                skills = extract_skills(result.get("description", ""))
+                if profile is not None:
+                    match_score = skill_profile.match_score(profile, skill_profile.encode(skills))
+                else:
+                    # Demo match percentage, stable per job so repeated searches give identical
+                    # bodies (and hit the compressed response cache)
+                    match_score = 60 + zlib.crc32(str(result.get("id", "")).encode()) % 39
+                jobs.append(JobRecord.from_adzuna(result, skills, match_score))
+            
+            if user_id is not None:
+                # Saved/applied state of the whole page in one query, matched on the ingested external id
+                states = await run_in_threadpool(
+                    crud.get_job_states, db, user_id, models.Job.external_id, [job.id for job in jobs],
+                    models.Job.source == adzuna.SOURCE
+                )
+                for job in jobs:
+                    _apply_state(job, states.get(job.id))
             
-            return jobs
+            # Store every posting of the page, alternates included, for the detail endpoint
+            background_tasks.add_task(_store_results, db, data.get("results", []))
+            
+            # Collapse the same posting listed by several agencies
+            jobs = collapse_records(jobs)
+            if "snippet" in selected:
+                add_snippets(jobs, (title or "").split())
+            return records_response(jobs, selected)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
-def extract_skills(description):
+def _store_results(db: Session, results: List[dict]) -> None:
+    """Upsert live results into the jobs table; a failure only costs the detail lookup"""
+    try:
+        ingestion.store_jobs(db, results, collapse=False)
+    except Exception:
+        db.rollback()
+        logger.exception("Storing %d live job results failed", len(results))
+
+@router.get("/for-resume/{resume_id}", response_model=List[JobResponse])
+def get_jobs_for_resume(
+    resume_id: int,
+    user_id: int,
+    limit: int = Query(20, le=100, description="Number of jobs to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all but description)"),
+    db: Session = Depends(get_read_db),
+):
     """
-    Extract skills from job description
-    This is a simplified version - a real implementation would use NLP
+    Rank stored jobs for a resume using the precomputed skill index
     """
-    common_skills = [
-        "python", "javascript", "java", "c++", "react", "angular", "vue", 
-        "node.js", "express", "django", "flask", "spring", "aws", "azure",
-        "gcp", "docker", "kubernetes", "sql", "nosql", "mongodb", "postgresql",
-        "mysql", "git", "agile", "scrum", "devops", "ci/cd", "machine learning"
-    ]
+    selected = _parse_fields(fields)
+    if crud.get_resume_version(db, resume_id, user_id) is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
     
-    skills = []
-    for skill in common_skills:
-        if skill.lower() in description.lower():
-            skills.append(skill)
+    skills = search_index.resume_skills(db, resume_id)
+    ranked = job_index.rank_jobs(db, skills, limit)
+    states = crud.get_job_states(db, user_id, models.Job.id, [job.id for job, _ in ranked])
+    jobs = []
+    for job, matched in ranked:
+        record = JobRecord.from_job(job, job_index.job_skills(job)[:5], round(100 * matched / len(skills)))
+        _apply_state(record, states.get(job.id))
+        jobs.append(record)
+    if "snippet" in selected:
+        add_snippets(jobs, skills)
+    return records_response(jobs, selected)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: str,
+    source: Optional[str] = Query(None, description="Look up by the id at this source (e.g. adzuna) instead"),
+    user_id: Optional[int] = Query(None, description="Fill saved/status for this user"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get the full details of a stored job, including its complete description
+    """
+    if source:
+        job = crud.get_job_by_external_id(db, source, job_id)
+    else:
+        job = crud.get_job(db, int(job_id)) if job_id.isdigit() else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    return skills[:5]  # Return up to 5 skills 
\ No newline at end of file
+    record = JobRecord.from_job(job, job_index.job_skills(job)[:5], None)
+    if user_id is not None:
+        _apply_state(record, crud.get_job_states(db, user_id, models.Job.id, [job.id]).get(job.id))
+    return record_response(record)
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List
+from sqlalchemy.orm import Session
+
+from .. import crud, resume_history, schemas
+from ..database import get_db, get_read_db
+from ..serialization import json_response, resume_to_json
+
+router = APIRouter(prefix="/resumes", tags=["revisions"])
+
+def _check_resume(db: Session, resume_id: int, user_id: int) -> None:
+    if crud.get_resume_version(db, resume_id, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+
+def _revision_or_404(db: Session, resume_id: int, revision: int):
+    found = resume_history.get_revision(db, resume_id, revision)
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found"
+        )
+    return found
+
+@router.get("/{resume_id}/revisions", response_model=List[schemas.ResumeRevisionSummary])
+def list_revisions(
+    resume_id: int,
+    user_id: int,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    """List the saved revisions of a resume's content, newest first"""
+    _check_resume(db, resume_id, user_id)
+    return [
+        schemas.ResumeRevisionSummary(revision=revision, created_at=created_at)
+        for revision, created_at in resume_history.list_revisions(db, resume_id, skip, limit)
+    ]
+
+@router.get("/{resume_id}/revisions/{revision}", response_model=schemas.ResumeRevisionResponse)
+def get_revision(resume_id: int, revision: int, user_id: int, db: Session = Depends(get_read_db)):
+    """Get the content of a resume as of one revision"""
+    _check_resume(db, resume_id, user_id)
+    content, created_at = _revision_or_404(db, resume_id, revision)
+    return schemas.ResumeRevisionResponse(
+        resume_id=resume_id, revision=revision, created_at=created_at, content=content
+    )
+
+@router.post("/{resume_id}/revisions/{revision}/restore", response_model=schemas.ResumeResponse)
+def restore_revision(resume_id: int, revision: int, user_id: int, db: Session = Depends(get_db)):
+    """
+    Make an earlier revision the current content of a resume
+
+    The restore is saved as a new revision, so it can be undone in turn
+    """
+    _check_resume(db, resume_id, user_id)
+    content, _ = _revision_or_404(db, resume_id, revision)
+    db_resume = crud.update_resume(db, resume_id, user_id, schemas.ResumeUpdate(content=content))
+    return json_response(resume_to_json(db_resume))
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from .. import search_index
+from ..database import get_read_db
+from ..schemas import ResumeSearchResult
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+@router.get("/resumes", response_model=List[ResumeSearchResult])
+def search_resumes(
+    q: Optional[str] = Query(None, description='Free-text query, e.g. "Python + Kubernetes in Austin"'),
+    skills: List[str] = Query([], description="Required skills"),
+    location: Optional[str] = Query(None, description="Required location"),
+    min_years: int = Query(0, ge=0, description="Minimum years of experience"),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search indexed resumes across all users by skill, title and location
+    """
+    keywords: List[str] = []
+    skills = list(skills)
+    if q:
+        query_skills, keywords, query_location = search_index.parse_query(q)
+        skills += query_skills
+        location = location or query_location
+    
+    results = search_index.search_resumes(db, skills, keywords, location, min_years, skip, limit)
+    return [
+        ResumeSearchResult(
+            resume_id=doc.resume_id,
+            user_id=doc.user_id,
+            headline=doc.headline,
+            location=doc.location,
+            years_experience=doc.years_experience,
+            score=score
+        )
+        for doc, score in results
+    ]
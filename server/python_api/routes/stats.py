@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+
+from ..compression import compressed_cache, compression_stats
+from ..database import engine, pool_stats, replica_set
+from ..rate_limit import rate_limit_stats
+from ..resume_cache import resume_cache
+
+router = APIRouter(prefix="/internal/stats", tags=["stats"])
+
+@router.get("/resume-cache")
+def get_resume_cache_stats():
+    """Hit ratio and memory footprint of this worker's resume cache"""
+    return resume_cache.stats()
+
+@router.get("/compression")
+def get_compression_stats():
+    """CPU time spent compressing responses against bytes saved, for this worker"""
+    return {**compression_stats.snapshot(), "cached_entries": len(compressed_cache)}
+
+@router.get("/rate-limit")
+def get_rate_limit_stats():
+    """Requests allowed and rejected by the rate limiter on this worker"""
+    return rate_limit_stats.snapshot()
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    """Connection pool usage and checkout wait times for this worker"""
+    return pool_stats.snapshot(engine.pool)
+
+@router.get("/replicas")
+def get_replica_stats():
+    """Health and lag of each read replica at the last check"""
+    return {"replicas": replica_set.status}
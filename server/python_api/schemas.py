@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 # Resume Upload Schemas
@@ -16,6 +16,9 @@ class ResumeUploadUpdate(BaseModel):
     resume_id: Optional[int] = None
     parsed_data: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    content_hash: Optional[str] = None
+    stage_timings: Optional[Dict[str, Any]] = None
+    last_completed_stage: Optional[str] = None
 
 class ResumeUploadResponse(ResumeUploadBase):
     id: int
@@ -27,6 +30,8 @@ class ResumeUploadResponse(ResumeUploadBase):
     resume_id: Optional[int] = None
     parsed_data: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    stage_timings: Optional[Dict[str, Any]] = None
+    last_completed_stage: Optional[str] = None
     
     class Config:
         orm_mode = True
@@ -66,6 +71,14 @@ class ResumeResponse(ResumeBase):
     class Config:
         orm_mode = True
 
+class ResumeRevisionSummary(BaseModel):
+    revision: int
+    created_at: datetime
+
+class ResumeRevisionResponse(ResumeRevisionSummary):
+    resume_id: int
+    content: Dict[str, Any]
+
 # User Schemas (simplified for authentication)
 class UserBase(BaseModel):
     username: str
@@ -91,12 +104,28 @@ class TokenData(BaseModel):
     user_id: Optional[int] = None
 
 # Job Schemas
-class JobResponse(BaseModel):
+class JobAlternate(BaseModel):
+    """Another posting of the same job (e.g. reposted by a different agency)"""
     id: str
+    company: str
+    location: str
+
+class JobCreate(BaseModel):
     title: str
     company: str
     location: str
+    type: str
     description: str
+    skills: List[str] = []
+    apply_url: str
+    expires_at: Optional[datetime] = None
+
+class JobResponse(BaseModel):
+    id: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None  # Omitted from list responses unless requested with fields=
     type: Optional[str] = None
     salary: Optional[str] = None
     isRemote: Optional[bool] = False
@@ -105,6 +134,37 @@ class JobResponse(BaseModel):
     match: Optional[int] = None
     status: Optional[str] = "new"
     saved: Optional[bool] = False
+    alternates: List[JobAlternate] = []
+    snippet: Optional[str] = None  # Highlighted preview of the description (list responses)
     
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+# Resume Search Schemas
+class ResumeSearchResult(BaseModel):
+    resume_id: int
+    user_id: int
+    headline: Optional[str] = None
+    location: Optional[str] = None
+    years_experience: int
+    score: int
+
+# Saved Job and Application Schemas
+MAX_BULK_ITEMS = 500
+
+class BulkSavedJobs(BaseModel):
+    user_id: int
+    job_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class ApplicationStatusUpdate(BaseModel):
+    job_id: int
+    status: str
+    resume_id: Optional[int] = None  # Overrides the batch resume_id for new applications
+
+class BulkApplicationStatusUpdate(BaseModel):
+    user_id: int
+    resume_id: int  # Resume attached to applications created by this batch
+    updates: List[ApplicationStatusUpdate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkWriteResult(BaseModel):
+    count: int
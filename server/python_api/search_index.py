@@ -0,0 +1,205 @@
+"""
+Resume search index.
+
+Resume content is an opaque JSON blob, so searchable fields (skills, job titles,
+companies, location, years of experience) are extracted into side tables when
+a resume is created or updated: one ResumeSearchDoc per resume plus inverted
+index postings in ResumeSearchTerm keyed by (field, term). Searches merge the
+posting lists of the query terms in a single grouped scan of the primary key
+index and rank the matches, without ever touching resume content.
+"""
+import hashlib
+import json
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, desc, func, or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .skills import SKILL_TAXONOMY, find_skills, normalize_skill
+from .text_normalizer import normalize_text, tokenize
+
+_YEAR_MONTH = re.compile(r"(\d{4})(?:[-/.](\d{1,2}))?")
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_PRESENT = ("present", "current", "now", "today")
+# Fields every query term must match; other fields only boost the score
+REQUIRED_FIELDS = ("skill", "location")
+# "+" separates terms unless it is part of a name like "c++"
+_QUERY_SEPARATOR = re.compile(r"\s*(?<!\+)\+(?!\+)\s*|\s*[,&]\s*|\s+and\s+", re.IGNORECASE)
+
+def _tokens(text: Optional[str]) -> List[str]:
+    """Index and query terms, tokenized like the skills matcher (NFKC, case-folded)"""
+    return tokenize(normalize_text(text or ""))
+
+def _month_index(value: Optional[str]) -> Optional[int]:
+    """Parse a resume date ("2019-06", "Jun 2019", "2019", "Present") into a month count"""
+    value = (value or "").strip().lower()
+    if not value:
+        return None
+    if value in _PRESENT:
+        today = date.today()
+        return today.year * 12 + today.month - 1
+    match = _YEAR_MONTH.search(value)
+    if not match:
+        return None
+    month = int(match.group(2)) if match.group(2) else next(
+        (i + 1 for i, name in enumerate(_MONTHS) if name in value), 1
+    )
+    return int(match.group(1)) * 12 + min(max(month, 1), 12) - 1
+
+def years_of_experience(experience: List[Dict[str, Any]]) -> int:
+    """Total years covered by experience entries, counting overlapping jobs once"""
+    spans = []
+    for item in experience:
+        start = _month_index(item.get("startDate"))
+        end = _month_index(item.get("endDate") or "present")
+        if start is not None and end is not None and end >= start:
+            spans.append((start, end))
+    months, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return months // 12
+
+def extract_fields(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract normalized searchable fields from resume content"""
+    experience = [e for e in content.get("experience", []) or [] if isinstance(e, dict)]
+    info = content.get("personalInfo", {}) or {}
+
+    skills: Set[str] = set()
+    for skill in content.get("skills", []) or []:
+        name = skill.get("name", "") if isinstance(skill, dict) else str(skill)
+        if name.strip():
+            skills.add(normalize_skill(name))
+    text = " ".join([content.get("summary") or ""] + [e.get("description") or "" for e in experience])
+    skills.update(find_skills(text))
+
+    titles = {token for e in experience for token in _tokens(e.get("title"))}
+    companies = {token for e in experience for token in _tokens(e.get("company"))}
+    return {
+        "skill": sorted(skills),
+        "title": sorted(titles),
+        "company": sorted(companies),
+        "location": sorted(set(_tokens(info.get("location")))),
+        "headline": (experience[0].get("title") or None) if experience else None,
+        "location_display": info.get("location") or None,
+        "years_experience": years_of_experience(experience),
+    }
+
+def index_resume(db: Session, resume_id: int, user_id: int, content: Dict[str, Any]) -> bool:
+    """Refresh the search index entries of a resume (caller commits). Returns whether anything changed."""
+    fields = extract_fields(content or {})
+    fields_hash = hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+    doc = db.get(models.ResumeSearchDoc, resume_id)
+    if doc is not None and doc.fields_hash == fields_hash:
+        return False  # Nothing searchable changed (the common autosave case)
+    if doc is None:
+        doc = models.ResumeSearchDoc(resume_id=resume_id)
+        db.add(doc)
+    doc.user_id = user_id
+    doc.headline = fields["headline"]
+    doc.location = fields["location_display"]
+    doc.years_experience = fields["years_experience"]
+    doc.fields_hash = fields_hash
+
+    db.query(models.ResumeSearchTerm).filter(
+        models.ResumeSearchTerm.resume_id == resume_id
+    ).delete(synchronize_session=False)
+    db.add_all(
+        models.ResumeSearchTerm(field=field, term=term, resume_id=resume_id)
+        for field in ("skill", "title", "company", "location")
+        for term in fields[field]
+    )
+    return True
+
+def remove_resume(db: Session, resume_id: int) -> None:
+    """Drop a resume from the search index (caller commits)"""
+    db.query(models.ResumeSearchTerm).filter(
+        models.ResumeSearchTerm.resume_id == resume_id
+    ).delete(synchronize_session=False)
+    db.query(models.ResumeSearchDoc).filter(
+        models.ResumeSearchDoc.resume_id == resume_id
+    ).delete(synchronize_session=False)
+
+def resume_skills(db: Session, resume_id: int) -> List[str]:
+    """Indexed skills of a resume, read from the postings instead of the content blob"""
+    return [
+        term for (term,) in db.query(models.ResumeSearchTerm.term).filter(
+            models.ResumeSearchTerm.resume_id == resume_id,
+            models.ResumeSearchTerm.field == "skill"
+        )
+    ]
+
+def parse_query(query: str) -> Tuple[List[str], List[str], Optional[str]]:
+    """
+    Split a recruiter query like "Python + Kubernetes in Austin"
+
+    Returns:
+        Tuple of (skills, title keywords, location)
+    """
+    location = None
+    parts = re.split(r"\s+in\s+", query.strip(), flags=re.IGNORECASE)
+    if len(parts) > 1:
+        query, location = " in ".join(parts[:-1]), parts[-1]
+    skills, keywords = [], []
+    known_skills = set(SKILL_TAXONOMY)
+    for term in _QUERY_SEPARATOR.split(query):
+        if not term.strip():
+            continue
+        skill = normalize_skill(term)
+        if skill in known_skills:
+            skills.append(skill)
+        else:
+            keywords.extend(_tokens(term))
+    return skills, keywords, location
+
+def search_resumes(
+    db: Session,
+    skills: List[str],
+    keywords: List[str],
+    location: Optional[str] = None,
+    min_years: int = 0,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Tuple[models.ResumeSearchDoc, int]]:
+    """
+    Rank indexed resumes: all skills and location tokens are required, title and
+    company keywords boost the score.
+
+    Returns:
+        List of (search doc, score) ordered best first
+    """
+    T, D = models.ResumeSearchTerm, models.ResumeSearchDoc
+    required = [("skill", normalize_skill(s)) for s in skills]
+    required += [("location", token) for token in _tokens(location)]
+    optional = [(field, k) for k in keywords for field in ("title", "company")]
+    # Each distinct term is one posting per resume, so repeats would make the HAVING count unreachable
+    required = list(dict.fromkeys(required))
+    optional = list(dict.fromkeys(optional))
+    if not required and not optional:
+        return []
+
+    # One pass over the posting lists of all query terms: every required term
+    # (skill, location) must match, title/company hits only add to the score
+    required_hit = func.sum(case((T.field.in_(REQUIRED_FIELDS), 1), else_=0))
+    hits = (
+        select(T.resume_id, func.count().label("score"))
+        .where(or_(*[and_(T.field == f, T.term == t) for f, t in required + optional]))
+        .group_by(T.resume_id)
+        .having(required_hit == len(required))
+        .subquery()
+    )
+    query = select(D, hits.c.score).join(hits, D.resume_id == hits.c.resume_id)
+    if min_years:
+        query = query.where(D.years_experience >= min_years)
+    query = query.order_by(desc(hits.c.score), desc(D.years_experience), desc(D.resume_id))
+    return [(doc, hits) for doc, hits in db.execute(query.offset(skip).limit(limit)).all()]
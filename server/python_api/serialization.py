@@ -0,0 +1,47 @@
+"""
+Fast JSON encoding for the resume and upload read endpoints.
+
+Rows coming out of the ORM are already trusted, so read endpoints skip the
+pydantic response_model round trip and encode straight to bytes with orjson.
+Resume ``content_json`` is the stored content column read back as canonical
+JSON text (see compact_json.CompactJSONText) and is spliced into the response
+as-is, so the JSON blob is never parsed on the read path.
+"""
+from typing import Any, Iterable
+import orjson
+from fastapi.responses import Response
+
+from . import models
+
+# Scalar columns of each response schema (everything except the JSON blobs)
+RESUME_FIELDS = (
+    "id", "user_id", "title", "template", "created_at", "updated_at",
+    "file_path", "file_name", "file_type", "file_size"
+)
+UPLOAD_FIELDS = (
+    "id", "user_id", "original_filename", "file_type", "file_size",
+    "upload_date", "status", "resume_id", "parsed_data", "error_message",
+    "stage_timings", "last_completed_stage"
+)
+
+def dump_content(content: Any) -> str:
+    """Canonical JSON text for a resume content blob (compact, sorted keys)"""
+    return orjson.dumps(content, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+
+def resume_to_json(db_resume: models.Resume) -> bytes:
+    """Encode a resume row as a ResumeResponse JSON object"""
+    head = orjson.dumps({field: getattr(db_resume, field) for field in RESUME_FIELDS})
+    content = db_resume.content_json.encode("utf-8")
+    return head[:-1] + b',"content":' + content + b"}"
+
+def upload_to_json(db_upload: models.ResumeUpload) -> bytes:
+    """Encode a resume upload row as a ResumeUploadResponse JSON object"""
+    return orjson.dumps({field: getattr(db_upload, field) for field in UPLOAD_FIELDS})
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap already-encoded JSON bytes in a response"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+def json_list_response(items: Iterable[bytes]) -> Response:
+    """Join already-encoded JSON objects into a JSON array response"""
+    return json_response(b"[" + b",".join(items) + b"]")
@@ -0,0 +1,128 @@
+"""
+Materialized per-user skill profiles.
+
+A user's skills are the union of the indexed skills of all their resumes,
+stored on users.skill_bits as a bitset over SKILL_TAXONOMY (bit i set means
+the user has SKILL_TAXONOMY[i]). The profile is recomputed from the search
+index postings whenever a resume's searchable fields change, and kept in a
+small in-process cache, so scoring a page of jobs is a handful of AND +
+popcount operations with no resume parsing. Users whose skill_bits is still
+NULL (no resume write since the column was added) get their profile computed
+from the postings on a cache miss instead.
+
+SKILL_TAXONOMY is append-only: bit positions are persisted.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .skills import SKILL_TAXONOMY, normalize_skill
+
+load_dotenv()
+
+SKILL_BITS = {skill: 1 << i for i, skill in enumerate(SKILL_TAXONOMY)}
+_BYTES = (len(SKILL_TAXONOMY) + 7) // 8
+
+def encode(skills: Iterable[str]) -> int:
+    """Bitset of the taxonomy skills in skills (other skills are ignored)"""
+    bits = 0
+    for skill in skills:
+        bits |= SKILL_BITS.get(normalize_skill(skill), 0)
+    return bits
+
+def decode(bits: int) -> List[str]:
+    """Taxonomy skills set in a bitset, in taxonomy order"""
+    return [skill for skill, bit in SKILL_BITS.items() if bits & bit]
+
+def match_score(profile: int, job_bits: int) -> int:
+    """Percentage of a job's skills covered by a profile"""
+    required = job_bits.bit_count()
+    if not required:
+        return 0
+    return round(100 * (profile & job_bits).bit_count() / required)
+
+def _to_bytes(bits: int) -> bytes:
+    return bits.to_bytes(max(_BYTES, (bits.bit_length() + 7) // 8), "little")
+
+class ProfileCache:
+    """LRU cache of skill bitsets by user id, with a TTL for writes made by other workers"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, Optional[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[int]]:
+        """Return (found, bits); bits is None for users without a profile"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                return False, None
+            self._entries.move_to_end(user_id)
+            return True, entry[1]
+
+    def put(self, user_id: int, bits: Optional[int]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), bits)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+profile_cache = ProfileCache(
+    int(os.getenv("SKILL_PROFILE_CACHE_SIZE", "10000")),
+    float(os.getenv("SKILL_PROFILE_CACHE_TTL_SECONDS", "60"))
+)
+
+def _indexed_skills(db: Session, user_id: int) -> List[str]:
+    """Distinct skills in the search index postings of a user's resumes"""
+    T, D = models.ResumeSearchTerm, models.ResumeSearchDoc
+    return db.execute(
+        select(T.term).distinct()
+        .join(D, D.resume_id == T.resume_id)
+        .where(D.user_id == user_id, T.field == "skill")
+    ).scalars().all()
+
+def refresh_profile(db: Session, user_id: int) -> int:
+    """Recompute a user's profile from the search index postings (caller commits)"""
+    db.flush()  # Make pending index postings visible to the query
+    bits = encode(_indexed_skills(db, user_id))
+    db.execute(update(models.User).where(models.User.id == user_id).values(skill_bits=_to_bytes(bits)))
+    profile_cache.invalidate(user_id)
+    return bits
+
+def get_profile(db: Session, user_id: int) -> Optional[int]:
+    """
+    A user's skill bitset, or None if the user has no indexed skills
+
+    A NULL skill_bits is computed from the postings without being written back:
+    this runs on read-only (replica) sessions, and the next resume write stores it.
+    """
+    found, bits = profile_cache.get(user_id)
+    if found:
+        return bits
+    stored = db.execute(select(models.User.skill_bits).where(models.User.id == user_id)).scalar()
+    if stored is not None:
+        bits = int.from_bytes(stored, "little")
+    else:
+        skills = _indexed_skills(db, user_id)
+        bits = encode(skills) if skills else None
+    profile_cache.put(user_id, bits)
+    return bits
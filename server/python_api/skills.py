@@ -0,0 +1,60 @@
+"""
+Shared skill taxonomy and normalization.
+
+Used by job skill extraction and by resume indexing so both sides of a match
+speak the same skill vocabulary.
+"""
+import re
+from typing import List, Optional
+
+from .text_normalizer import normalize_text, tokenize
+
+# Canonical skills we recognise in free text, in display priority order
+SKILL_TAXONOMY = [
+    "python", "javascript", "java", "c++", "react", "angular", "vue",
+    "node.js", "express", "django", "flask", "spring", "aws", "azure",
+    "gcp", "docker", "kubernetes", "sql", "nosql", "mongodb", "postgresql",
+    "mysql", "git", "agile", "scrum", "devops", "ci/cd", "machine learning"
+]
+
+# Common spellings mapped onto canonical taxonomy names
+SKILL_ALIASES = {
+    "js": "javascript", "node": "node.js", "nodejs": "node.js", "reactjs": "react",
+    "react.js": "react", "vuejs": "vue", "vue.js": "vue", "k8s": "kubernetes",
+    "postgres": "postgresql", "golang": "go", "amazon web services": "aws",
+    "google cloud": "gcp", "ml": "machine learning", "cicd": "ci/cd"
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_skill(name: str) -> str:
+    """Lower-case, collapse whitespace and map aliases onto canonical names"""
+    normalized = _WHITESPACE.sub(" ", name.strip().lower())
+    return SKILL_ALIASES.get(normalized, normalized)
+
+# Taxonomy skills as token sequences ("ci/cd" -> ("ci", "cd")), matched on whole tokens
+# so "java" never matches "javascript"
+_SKILL_TOKENS = [(skill, tuple(tokenize(skill))) for skill in SKILL_TAXONOMY]
+_MAX_SKILL_TOKENS = max(len(tokens) for _, tokens in _SKILL_TOKENS)
+
+def skills_in_tokens(tokens: List[str]) -> List[str]:
+    """Taxonomy skills present in a token stream from text_normalizer, in taxonomy order"""
+    grams = set()
+    for n in range(1, _MAX_SKILL_TOKENS + 1):
+        grams.update(zip(*(tokens[i:] for i in range(n))))
+    return [skill for skill, skill_tokens in _SKILL_TOKENS if skill_tokens in grams]
+
+def find_skills(text: str) -> list:
+    """Find taxonomy skills mentioned in free text, in taxonomy order"""
+    return skills_in_tokens(tokenize(normalize_text(text)))
+
+def extract_skills(description, tokens: Optional[List[str]] = None):
+    """
+    Extract skills from job description
+    
+    Pass tokens when the text has already been through text_normalizer to
+    skip normalizing it again.
+    """
+    if tokens is None:
+        tokens = tokenize(normalize_text(description or ""))
+    return skills_in_tokens(tokens)[:5]  # Return up to 5 skills
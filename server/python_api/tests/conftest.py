@@ -1,3 +1,4 @@
+import json
 import os
 import pytest
 import tempfile
@@ -5,20 +6,64 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+import orjson
 
 from ..database import Base, get_db
 from ..main import app
+from ..rate_limit import MemoryBackend, RateLimitMiddleware
 from ..resume_parser import UPLOAD_DIR
+from ..resume_cache import resume_cache
+from ..skill_profile import profile_cache
+
+def build_content(target_bytes: int = 50_000) -> dict:
+    """Build a realistic resume content blob of roughly target_bytes"""
+    content = {
+        "personalInfo": {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100",
+                         "location": "Austin, TX", "website": "", "linkedin": ""},
+        "summary": "Backend engineer focused on distributed systems. " * 10,
+        "education": [], "experience": [], "skills": [], "certifications": [],
+        "languages": [], "projects": []
+    }
+    i = 0
+    while len(json.dumps(content)) < target_bytes:
+        content["experience"].append({
+            "title": f"Senior Engineer {i}", "company": f"Company {i}", "location": "Remote",
+            "startDate": "2019-01", "endDate": "2021-06",
+            "description": "Built and operated services handling millions of requests per day. " * 4,
+            "highlights": [f"Shipped feature {i}-{j} with measurable impact" for j in range(5)]
+        })
+        content["skills"].append({"name": f"skill-{i}", "proficiency": 3})
+        i += 1
+    return content
+
+def edit(content, rng):
+    """A random autosave-sized edit of a copy of resume content"""
+    content = orjson.loads(orjson.dumps(content))
+    experience = content["experience"]
+    choice = rng.random()
+    if choice < 0.4:
+        experience[rng.randrange(len(experience))]["description"] += " More detail."
+    elif choice < 0.6:
+        experience.insert(rng.randrange(len(experience) + 1), {"title": f"Role {rng.random()}", "description": "", "highlights": []})
+    elif choice < 0.7 and len(experience) > 1:
+        del experience[rng.randrange(len(experience))]
+    elif choice < 0.8 and "languages" in content:
+        del content["languages"]
+    elif choice < 0.8:
+        content["languages"] = ["French"]
+    else:
+        content["summary"] = f"Summary {rng.random()}"
+    return content
 
 # Create a temporary directory for uploads during tests
 @pytest.fixture(scope="session")
 def test_upload_dir():
+    global UPLOAD_DIR
     original_upload_dir = UPLOAD_DIR
     
     # Create a temporary directory for test uploads
     with tempfile.TemporaryDirectory() as temp_dir:
         # Override the upload directory globally
-        global UPLOAD_DIR
         UPLOAD_DIR = temp_dir
         
         yield temp_dir
@@ -42,6 +87,10 @@ def test_db():
     # Create the tables in the test database
     Base.metadata.create_all(bind=engine)
     
+    # Row ids restart in every fresh database, so drop anything cached by earlier tests
+    resume_cache.clear()
+    profile_cache.clear()
+    
     # Return the session and engine
     db = TestingSessionLocal()
     try:
@@ -65,6 +114,12 @@ def client(test_db, test_upload_dir):
     
     # Create a test client
     with TestClient(app) as client:
+        # Every request comes from the same client IP, so start each test with fresh rate limit buckets
+        layer = app.middleware_stack
+        while layer is not None:
+            if isinstance(layer, RateLimitMiddleware):
+                layer.backend = MemoryBackend()
+            layer = getattr(layer, "app", None)
         yield client
     
     # Clean up after the test
@@ -112,4 +112,96 @@ def test_delete_resume_upload(client, test_upload_dir):
     
     # Verify it's gone
     response = client.get(f"/uploads/resume/{upload_id}")
-    assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+    assert response.status_code == status.HTTP_404_NOT_FOUND 
+
+
+def test_get_resume_serves_stored_content(client, test_db):
+    """Test that resume reads return the stored content"""
+    from .. import crud, schemas
+    content = {"summary": "Engineer", "skills": [{"name": "python", "proficiency": 4}]}
+    db_resume = crud.create_resume(
+        test_db, schemas.ResumeCreate(user_id=1, title="My Resume", content=content)
+    )
+    assert db_resume.content_json is not None
+    
+    response = client.get(f"/resumes/{db_resume.id}?user_id=1")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["title"] == "My Resume"
+    assert data["content"] == content
+    
+    response = client.get("/resumes/user/1")
+    assert [item["id"] for item in response.json()] == [db_resume.id]
+
+def test_get_resume_conditional(client, test_db):
+    """Test ETag revalidation of a resume"""
+    from .. import crud, schemas
+    db_resume = crud.create_resume(
+        test_db, schemas.ResumeCreate(user_id=1, title="Cached", content={"summary": "v1"})
+    )
+    url = f"/resumes/{db_resume.id}?user_id=1"
+    
+    response = client.get(url)
+    etag = response.headers["etag"]
+    assert "no-cache" in response.headers["cache-control"]
+    
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    
+    # An update bumps the version, so the old ETag no longer matches
+    crud.update_resume(test_db, db_resume.id, 1, schemas.ResumeUpdate(content={"summary": "v2"}))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+    assert response.json()["content"] == {"summary": "v2"}
+
+def test_resume_cache_invalidation(client, test_db):
+    """Test that cached resumes are served until a write invalidates them"""
+    from .. import crud, schemas
+    from ..resume_cache import resume_cache
+    db_resume = crud.create_resume(
+        test_db, schemas.ResumeCreate(user_id=1, title="Cached", content={"summary": "v1"})
+    )
+    
+    crud.get_resume(test_db, db_resume.id, 1)
+    assert crud.get_resume(test_db, db_resume.id, 1).content == {"summary": "v1"}
+    assert resume_cache.stats()["hits"] == 1
+    
+    crud.update_resume(test_db, db_resume.id, 1, schemas.ResumeUpdate(content={"summary": "v2"}))
+    assert crud.get_resume(test_db, db_resume.id, 1).content == {"summary": "v2"}
+    
+    response = client.get("/internal/stats/resume-cache")
+    assert response.json()["entries"] == 1
+    assert response.json()["approx_bytes"] > 0
+    
+    assert crud.delete_resume(test_db, db_resume.id, 1)
+    assert crud.get_resume(test_db, db_resume.id, 1) is None
+
+def test_export_resume(client, test_db):
+    """Test rendering a resume to PDF and DOCX"""
+    import io
+    import zipfile
+    from .. import crud, schemas
+    content = {
+        "personalInfo": {"name": "Jane Doe", "email": "jane@example.com"},
+        "summary": "Backend engineer",
+        "experience": [{"title": "Engineer", "company": "Acme", "highlights": ["Built (things)"]}],
+        "skills": [{"name": "python", "proficiency": 4}]
+    }
+    db_resume = crud.create_resume(
+        test_db, schemas.ResumeCreate(user_id=1, title="Jane", content=content)
+    )
+    
+    response = client.get(f"/resumes/{db_resume.id}/export?user_id=1&format=pdf")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-1.4")
+    
+    response = client.get(f"/resumes/{db_resume.id}/export?user_id=1&format=docx")
+    assert response.status_code == status.HTTP_200_OK
+    document = zipfile.ZipFile(io.BytesIO(response.content)).read("word/document.xml").decode()
+    assert "Jane Doe" in document and "Built (things)" in document
+    
+    response = client.get(f"/resumes/{db_resume.id}/export?user_id=1&format=odt")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
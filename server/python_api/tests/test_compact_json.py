@@ -0,0 +1,45 @@
+from sqlalchemy import text
+
+from .. import compact_json, crud, models, schemas
+from ..serialization import dump_content
+from .conftest import build_content
+
+def test_encode_round_trip():
+    """Test large values are deflated with the dictionary and small ones stored raw"""
+    content = build_content(10_000)
+    data = compact_json.encode(content)
+    assert data[0] == compact_json.FORMAT_DEFLATE_V1
+    assert len(data) < len(compact_json.encode(content, level=0)) / 5
+    assert compact_json.decode(data) == content
+    
+    small = compact_json.encode({"a": 1})
+    assert small == b'\x00{"a":1}'
+    assert compact_json.decode(small) == {"a": 1}
+
+def test_decode_plain_json():
+    """Test values written before a column was converted still decode"""
+    assert compact_json.decode(b'{"skills": ["Python"]}') == {"skills": ["Python"]}
+    assert compact_json.decode(memoryview(b"[1, 2]")) == [1, 2]
+
+def test_column_is_transparent(test_db):
+    """Test crud and the API schemas see the same dicts through the compact columns"""
+    content = build_content(5_000)
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(user_id=1, title="Compact", content=content))
+    test_db.expire_all()
+    assert crud.get_resume(test_db, resume.id).content == content
+    stored = test_db.execute(text("SELECT content FROM resumes")).scalar()
+    assert stored[0] == compact_json.FORMAT_DEFLATE_V1 and compact_json.decode(stored) == content
+    
+    # content_json is derived from the same stored bytes, not kept as a second copy
+    test_db.expire_all()
+    assert test_db.get(models.Resume, resume.id).content_json == dump_content(content)
+    assert "content_json" not in models.Resume.__table__.c
+    
+    upload = crud.create_resume_upload(test_db, schemas.ResumeUploadCreate(
+        user_id=1, original_filename="resume.txt", file_type="text/plain", file_size=10
+    ), "/nonexistent/resume.txt")
+    assert upload.parsed_data is None
+    upload.parsed_data = {"skills": [{"name": "Python"}]}
+    test_db.commit()
+    test_db.expire_all()
+    assert crud.get_resume_upload(test_db, upload.id).parsed_data == {"skills": [{"name": "Python"}]}
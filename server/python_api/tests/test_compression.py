@@ -0,0 +1,77 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from ..compression import CompressionMiddleware, choose_encoding, compressed_cache, compression_stats
+
+BODY = b'{"jobs": "' + b"python kubernetes aws " * 200 + b'"}'
+
+@pytest.fixture
+def app_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    
+    @app.get("/api/jobs")
+    def jobs():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"jobs-v1"'})
+    
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+    
+    @app.get("/pdf")
+    def pdf():
+        return Response(BODY, media_type="application/pdf")
+    
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"line %d\n" % i for i in range(100)), media_type="application/x-ndjson")
+    
+    compressed_cache.clear()
+    compression_stats.reset()
+    return TestClient(app)
+
+def raw_get(client, path, accept_encoding="gzip"):
+    """Fetch a response without httpx decoding the body"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_choose_encoding():
+    """Test Accept-Encoding negotiation, honouring q=0"""
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("identity") is None
+
+def test_compresses_large_json_and_caches(app_client):
+    """Test large JSON is gzipped with a weak ETag and served from the cache on repeats"""
+    response, raw = raw_get(app_client, "/api/jobs")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"jobs-v1"'
+    assert int(response.headers["content-length"]) == len(raw) < len(BODY)
+    assert gzip.decompress(raw) == BODY
+    
+    raw_get(app_client, "/api/jobs")
+    stats = compression_stats.snapshot()
+    assert (stats["cache_misses"], stats["cache_hits"]) == (1, 1)
+    assert stats["bytes_saved"] > 0
+
+def test_skips_small_binary_and_unaccepted(app_client):
+    """Test small, binary and non-negotiated responses pass through untouched"""
+    for path in ("/small", "/pdf"):
+        response, _ = raw_get(app_client, path)
+        assert "content-encoding" not in response.headers
+    response, raw = raw_get(app_client, "/api/jobs", accept_encoding="identity")
+    assert "content-encoding" not in response.headers and raw == BODY
+
+def test_compresses_streams_incrementally(app_client):
+    """Test streamed responses are compressed chunk by chunk"""
+    response, raw = raw_get(app_client, "/stream")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(raw, 31) == b"".join(b"line %d\n" % i for i in range(100))
+    assert compression_stats.snapshot()["streamed"] == 1
@@ -0,0 +1,110 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from .. import database, models
+from ..database import Base, InstrumentedQueuePool, engine_options, get_db, get_read_db, pool_sizes, pool_stats
+from ..replicas import ReadYourWritesMiddleware, ReplicaSet, RoutingSession
+
+def test_pool_sizes_split_connection_budget(monkeypatch):
+    """Test DB_MAX_CONNECTIONS is shared across workers unless sizes are set explicitly"""
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", "60")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert pool_sizes() == (10, 5)
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    assert pool_sizes() == (3, 5)
+
+def test_pgbouncer_mode(monkeypatch):
+    """Test transaction-pooling mode drops our pool and server-side prepared statements"""
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+    monkeypatch.setattr(database, "DB_POOL_MODE", "null")
+    options = engine_options("postgresql+psycopg://user@pgbouncer/app")
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+    assert "pool_size" not in options
+
+def test_pool_records_waits_and_timeouts(tmp_path):
+    """Test checkout waits and pool timeouts are counted"""
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url, pool_size=1, max_overflow=0, pool_timeout=0.05))
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    pool_stats.reset()
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    stats = pool_stats.snapshot(engine.pool)
+    assert (stats["timeouts"], stats["size"], stats["checked_out"]) == (1, 1, 0)
+    assert stats["max_wait_ms"] >= 50
+    engine.dispose()
+
+def make_databases(tmp_path, lag: float = 0.0):
+    """Primary and replica SQLite files holding different rows, so reads show where they went"""
+    engines = {}
+    for name in ("primary", "replica"):
+        url = f"sqlite:///{tmp_path / name}.db"
+        engines[name] = create_engine(url, **engine_options(url))
+        Base.metadata.create_all(engines[name])
+        with sessionmaker(bind=engines[name])() as db:
+            db.add(models.Resume(user_id=1, title=name, content={}))
+            db.commit()
+    replicas = ReplicaSet([engines["replica"]], max_lag=5, check_interval=3600, lag_fn=lambda conn: lag)
+    return engines, sessionmaker(class_=RoutingSession, autoflush=False, bind=engines["primary"], replicas=replicas)
+
+def titles(db):
+    return sorted(r.title for r in db.query(models.Resume))
+
+def test_routing_session_reads_replica_and_writes_primary(tmp_path):
+    """Test read-only sessions read the replica until they write, and writes go to the primary"""
+    engines, factory = make_databases(tmp_path)
+    with factory() as db:
+        assert titles(db) == ["primary"]
+    with factory() as db:
+        db.info["read_only"] = True
+        assert titles(db) == ["replica"]
+        assert db.info["replica"] is engines["replica"]  # Pinned for the rest of the session
+        db.add(models.Resume(user_id=1, title="new", content={}))
+        db.flush()
+        assert titles(db) == ["new", "primary"]
+        db.commit()
+    
+    (tmp_path / "lagging").mkdir()
+    lagging_engines, lagging = make_databases(tmp_path / "lagging", lag=30)
+    with lagging() as db:
+        db.info["read_only"] = True
+        assert titles(db) == ["primary"]
+    for engine in [*engines.values(), *lagging_engines.values()]:
+        engine.dispose()
+
+def test_read_your_writes(tmp_path, monkeypatch):
+    """Test a caller who just wrote reads from the primary until a replica has caught up"""
+    engines, factory = make_databases(tmp_path)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+    
+    @app.get("/read")
+    def read(db: Session = Depends(get_read_db)):
+        return titles(db)
+    
+    @app.post("/write")
+    def write(db: Session = Depends(get_db)):
+        db.add(models.Resume(user_id=7, title="written", content={}))
+        db.commit()
+        return {}
+    
+    client = TestClient(app)
+    assert client.get("/read").json() == ["replica"]
+    assert "db_written_at" not in client.cookies
+    client.post("/write")
+    assert "db_written_at" in client.cookies
+    assert client.get("/read").json() == ["primary", "written"]
+    assert TestClient(app).get("/read").json() == ["replica"]  # Other callers are unaffected
+    
+    # Once the replica reports having replayed past the write, the writer reads it again
+    factory.kw["replicas"].check()
+    assert client.get("/read").json() == ["replica"]
+    for engine in engines.values():
+        engine.dispose()
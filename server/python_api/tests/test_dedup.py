@@ -0,0 +1,24 @@
+from ..dedup import find_duplicate_groups
+from ..job_records import JobAlternateRecord, JobRecord, collapse_records
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and operate Python services "
+    "on Kubernetes. You will own our payments APIs end to end, work closely with product "
+    "and mentor junior engineers. Experience with PostgreSQL and AWS is a plus."
+)
+
+def test_find_duplicate_groups():
+    """Test that lightly edited reposts are grouped and unrelated jobs are not"""
+    repost = DESCRIPTION.replace("a plus", "nice to have").replace("mentor", "coach")
+    unrelated = "Retail store associate needed for weekend shifts. Customer service experience required."
+    assert find_duplicate_groups([DESCRIPTION, unrelated, repost]) == [[0, 2], [1]]
+
+def test_collapse_records_keeps_first_with_alternates():
+    """Test collapsing duplicate job records into one with alternates"""
+    jobs = [
+        JobRecord(id="1", title="Backend Engineer", company="Acme", location="Austin", description=DESCRIPTION),
+        JobRecord(id="2", title="Backend Engineer", company="Agency", location="Austin", description=DESCRIPTION + " Apply now!"),
+    ]
+    collapsed = collapse_records(jobs)
+    assert [job.id for job in collapsed] == ["1"]
+    assert collapsed[0].alternates == [JobAlternateRecord(id="2", company="Agency", location="Austin")]
@@ -0,0 +1,62 @@
+import io
+import zipfile
+
+import orjson
+
+from .. import crud, export_archive, schemas
+
+def make_resumes(test_db, tmp_path):
+    """Resumes of three users; user 1 has one with a file, one whose file is gone and one without"""
+    pdf = tmp_path / "cv.pdf"
+    pdf.write_bytes(b"%PDF-1.4 " + bytes(range(256)) * 40)
+    ids = []
+    for user_id, file_path in [(1, str(pdf)), (2, None), (1, str(tmp_path / "gone.pdf")), (3, None), (1, None)]:
+        resume = crud.create_resume(test_db, schemas.ResumeCreate(
+            user_id=user_id, title=f"Resume {len(ids)}", content={"summary": f"Summary {len(ids)}"},
+            file_path=file_path, file_name="cv.pdf" if file_path else None,
+        ))
+        ids.append(resume.id)
+    return ids, pdf.read_bytes()
+
+def test_export_archive_contents(client, test_db, tmp_path):
+    """Test the export is a valid zip of the selected users' resumes and files, identical on every request"""
+    ids, pdf = make_resumes(test_db, tmp_path)
+    response = client.get("/api/exports/resumes", params={"user_ids": [1, 2]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert int(response.headers["content-length"]) == len(response.content)
+    
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["resumes.ndjson", f"files/{ids[0]}/cv.pdf"]
+    lines = [orjson.loads(line) for line in archive.read("resumes.ndjson").splitlines()]
+    assert [line["id"] for line in lines] == [ids[0], ids[1], ids[2], ids[4]]
+    assert lines[1]["content"] == {"summary": "Summary 1"}
+    assert archive.read(f"files/{ids[0]}/cv.pdf") == pdf
+    
+    again = client.get("/api/exports/resumes", params={"user_ids": [2, 1]})
+    assert again.content == response.content and again.headers["etag"] == response.headers["etag"]
+    crud.update_resume(test_db, ids[1], 2, schemas.ResumeUpdate(content={"summary": "Edited"}))
+    assert client.get("/api/exports/resumes", params={"user_ids": [1, 2]}).headers["etag"] != response.headers["etag"]
+
+def test_export_archive_ranges(client, test_db, tmp_path, monkeypatch):
+    """Test any byte range of the export matches the same bytes of the full archive"""
+    monkeypatch.setattr(export_archive, "EXPORT_CHUNK_SIZE", 1000)
+    make_resumes(test_db, tmp_path)
+    params = {"user_ids": [1, 2, 3]}
+    full = client.get("/api/exports/resumes", params=params)
+    body, etag = full.content, full.headers["etag"]
+    
+    for start in (0, 1, 100, 500, 5000, len(body) - 200, len(body) - 1):
+        response = client.get("/api/exports/resumes", params=params, headers={"Range": f"bytes={start}-", "If-Range": etag})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes {start}-{len(body) - 1}/{len(body)}"
+        assert response.content == body[start:]
+    for header, expected in [("bytes=10-19", body[10:20]), ("bytes=-30", body[-30:]), ("bytes=3000-3999", body[3000:4000])]:
+        assert client.get("/api/exports/resumes", params=params, headers={"Range": header}).content == expected
+    
+    stale = client.get("/api/exports/resumes", params=params, headers={"Range": "bytes=100-", "If-Range": '"old"'})
+    assert stale.status_code == 200 and stale.content == body
+    past_end = client.get("/api/exports/resumes", params=params, headers={"Range": f"bytes={len(body)}-"})
+    assert past_end.status_code == 416 and past_end.headers["content-range"] == f"bytes */{len(body)}"
+    assert client.get("/api/exports/resumes").status_code == 422
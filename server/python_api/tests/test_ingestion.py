@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+
+from .. import adzuna, ingestion, models
+
+def make_result(job_id, created, description):
+    return {
+        "id": job_id, "title": "Backend Engineer", "created": created,
+        "company": {"display_name": "Acme"}, "location": {"display_name": "Austin, TX"},
+        "description": description, "redirect_url": f"https://example.com/{job_id}"
+    }
+
+def days_ago(days, hour=10):
+    """ISO timestamp relative to now, so fixtures stay inside JOB_TTL_DAYS"""
+    moment = datetime.now(timezone.utc).replace(hour=hour, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def stub_adzuna(pages):
+    """Local stand-in for the Adzuna search API serving fixed pages"""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = int(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, json={"results": pages.get(page, [])})
+    
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+def test_ingestion_incremental_sync(test_db):
+    """Test bulk upsert, dedup and high-water marks against a stub API"""
+    description = "Build Python services on Kubernetes and AWS for our payments platform team. " * 3
+    pages = {1: [
+        make_result(3, days_ago(3), description),
+        make_result(2, days_ago(4), description + " Posted by an agency."),
+        make_result(1, days_ago(5), "Java and Spring developer for a retail bank."),
+    ]}
+    client, requests = stub_adzuna(pages)
+    session_factory = lambda: test_db
+    
+    stats = asyncio.run(ingestion.run_once(session_factory, client, [("backend engineer", "Austin")]))
+    assert stats["stored"] == 2  # Job 2 is a near-duplicate of job 3
+    jobs = test_db.query(models.Job).order_by(models.Job.external_id).all()
+    assert [job.external_id for job in jobs] == ["1", "3"]
+    assert {s.skill for s in test_db.query(models.JobSkill).filter(models.JobSkill.job_id == jobs[1].id)} == {
+        "python", "kubernetes", "aws"
+    }
+    
+    # A second run only keeps postings newer than the high-water mark
+    pages[1].insert(0, make_result(4, days_ago(2, hour=8), "Data engineer building SQL pipelines."))
+    stats = asyncio.run(ingestion.run_once(session_factory, client, [("backend engineer", "Austin")]))
+    assert stats["stored"] == 1
+    assert test_db.query(models.Job).count() == 3
+    assert requests[-1].url.params["sort_by"] == "date"
+    assert "max_days_old" in requests[-1].url.params
+
+def test_fetch_page_wraps_error_bodies():
+    """Test HTML or empty error pages raise AdzunaError instead of a decode error"""
+    bodies = iter([(502, b"<html>Bad Gateway</html>"), (429, b""), (200, b"not json"), (400, b'{"error": "bad key"}')])
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        code, body = next(bodies)
+        return httpx.Response(code, content=body)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    for expected in (502, 429, 200, 400):
+        with pytest.raises(adzuna.AdzunaError) as error:
+            asyncio.run(adzuna.fetch_page(client, "us", 1, {}))
+        assert error.value.status_code == expected
+    assert error.value.message == "bad key"
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import orjson
+from fastapi import status
+
+from .. import adzuna, crud, models, schemas
+from ..compression import compressed_cache, compression_stats
+from ..job_records import JobRecord, collapse_records, make_snippet, records_response, snippet_pattern
+
+def make_job(db, title, description, expires_at=None):
+    return crud.create_job(db, schemas.JobCreate(
+        title=title, company="Acme", location="Austin, TX", type="full_time",
+        description=description, apply_url="https://example.com/apply", expires_at=expires_at
+    ))
+
+def test_jobs_for_resume(client, test_db):
+    """Test ranking stored jobs against a resume's indexed skills"""
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Resume",
+        content={"skills": [{"name": "Python"}, {"name": "k8s"}]}
+    ))
+    both = make_job(test_db, "Platform Engineer", "Python and Kubernetes on AWS")
+    python_only = make_job(test_db, "Backend Engineer", "Python services")
+    make_job(test_db, "Java Engineer", "Java and Spring")
+    make_job(
+        test_db, "Expired Platform Engineer", "Python and Kubernetes",
+        expires_at=datetime.now(timezone.utc) - timedelta(days=1)
+    )
+    
+    response = client.get(f"/api/jobs/for-resume/{resume.id}?user_id=1")
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert [job["id"] for job in results] == [str(both.id), str(python_only.id)]
+    assert [job["match"] for job in results] == [100, 50]
+    
+    assert crud.expire_jobs(test_db) == 1
+    
+    response = client.get(f"/api/jobs/for-resume/{resume.id}?user_id=2")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_bulk_saved_jobs_and_application_status(client, test_db):
+    """Test bulk save/unsave and application status upserts"""
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(user_id=1, title="Resume", content={}))
+    jobs = [make_job(test_db, f"Engineer {i}", "Python") for i in range(3)]
+    job_ids = [job.id for job in jobs]
+    
+    response = client.post("/api/jobs/saved/bulk", json={"user_id": 1, "job_ids": job_ids + job_ids[:1]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"count": 3}
+    # Saving again is a no-op rather than a duplicate row
+    client.post("/api/jobs/saved/bulk", json={"user_id": 1, "job_ids": job_ids})
+    assert test_db.query(models.SavedJob).count() == 3
+    
+    response = client.post("/api/jobs/saved/bulk-delete", json={"user_id": 1, "job_ids": job_ids[:2]})
+    assert response.json() == {"count": 2}
+    assert [s.job_id for s in test_db.query(models.SavedJob)] == job_ids[2:]
+    
+    updates = [{"job_id": job_id, "status": "applied"} for job_id in job_ids]
+    response = client.post("/api/applications/bulk-status", json={"user_id": 1, "resume_id": resume.id, "updates": updates})
+    assert response.json() == {"count": 3}
+    updates = [{"job_id": job_ids[0], "status": "interview"}]
+    client.post("/api/applications/bulk-status", json={"user_id": 1, "resume_id": resume.id, "updates": updates})
+    statuses = {a.job_id: a.status for a in test_db.query(models.Application)}
+    assert statuses == {job_ids[0]: "interview", job_ids[1]: "applied", job_ids[2]: "applied"}
+    
+    response = client.post("/api/jobs/saved/bulk", json={"user_id": 1, "job_ids": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_job_listings_saved_and_status(client, test_db, monkeypatch):
+    """Test saved/status flags on listings are resolved for the requesting user"""
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Resume", content={"skills": [{"name": "Python"}]}
+    ))
+    saved, applied, other = [make_job(test_db, f"Engineer {i}", "Python") for i in range(3)]
+    for job, external_id in ((saved, "101"), (applied, "102"), (other, "103")):
+        job.source, job.external_id = "adzuna", external_id
+    test_db.commit()
+    crud.save_jobs(test_db, 1, [saved.id])
+    crud.upsert_application_statuses(test_db, schemas.BulkApplicationStatusUpdate(
+        user_id=1, resume_id=resume.id, updates=[{"job_id": applied.id, "status": "interview"}]
+    ))
+    
+    response = client.get(f"/api/jobs/for-resume/{resume.id}?user_id=1")
+    states = {job["id"]: (job["saved"], job["status"]) for job in response.json()}
+    assert states == {
+        str(saved.id): (True, "new"), str(applied.id): (False, "interview"), str(other.id): (False, "new")
+    }
+    
+    async def fetch_page(client, country, page, params):
+        return {"results": [
+            {"id": external_id, "title": f"Posting {external_id}", "description": f"Posting {external_id} description"}
+            for external_id in (101, 102, 999)
+        ]}
+    monkeypatch.setattr(adzuna, "fetch_page", fetch_page)
+    
+    # The async handler must not run its database queries on the event loop
+    on_loop = []
+    get_job_states = crud.get_job_states
+    def checked_get_job_states(*args):
+        on_loop.append(asyncio._get_running_loop() is not None)
+        return get_job_states(*args)
+    monkeypatch.setattr(crud, "get_job_states", checked_get_job_states)
+    
+    response = client.get("/api/jobs?title=engineer&user_id=1")
+    assert response.status_code == status.HTTP_200_OK
+    states = {job["id"]: (job["saved"], job["status"]) for job in response.json()}
+    assert states == {"101": (True, "new"), "102": (False, "interview"), "999": (False, "new")}
+    assert on_loop == [False]
+
+def test_job_record_matches_job_response():
+    """Test JobRecord encodes to the same JSON shape as JobResponse"""
+    record = JobRecord.from_adzuna(
+        {"id": 7, "title": "Engineer", "description": "Remote Python role"}, ["python"], 90
+    )
+    encoded = orjson.loads(records_response(collapse_records([record])).body)
+    assert encoded == [schemas.JobResponse(**encoded[0]).dict()]
+    assert encoded[0]["id"] == "7" and encoded[0]["isRemote"] is True
+
+def test_make_snippet_highlights_terms():
+    """Test snippets are cut around the first hit, escaped and highlighted"""
+    text = "Intro " * 60 + "We use <b>Python</b> and python tooling daily. " + "Outro " * 60
+    snippet = make_snippet(text, snippet_pattern(["python"]), length=80)
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "&lt;b&gt;<em>Python</em>&lt;/b&gt; and <em>python</em> tooling" in snippet
+    assert len(snippet) < 200
+    assert make_snippet("Short text", None) == "Short text"
+
+def test_job_listing_fields_and_detail(client, test_db, monkeypatch):
+    """Test list responses carry snippets instead of descriptions, sparse fieldsets and job detail"""
+    description = "Backend role. " * 40 + "You will write Python services."
+    
+    async def fetch_page(client, country, page, params):
+        return {"results": [{"id": "101", "title": "Python Engineer", "description": description}]}
+    monkeypatch.setattr(adzuna, "fetch_page", fetch_page)
+    
+    listed = client.get("/api/jobs?title=python").json()[0]
+    assert "description" not in listed
+    assert "<em>Python</em>" in listed["snippet"]
+    
+    listed = client.get("/api/jobs?title=python&fields=title,description").json()[0]
+    assert listed == {"id": "101", "title": "Python Engineer", "description": description}
+    assert client.get("/api/jobs?fields=title,salaryy").status_code == status.HTTP_400_BAD_REQUEST
+    
+    # The listed posting was never ingested, but listing it stored it
+    detail = client.get("/api/jobs/101?source=adzuna").json()
+    assert detail["description"] == description
+    assert client.get(f"/api/jobs/{detail['id']}").json()["description"] == description
+    assert client.get("/api/jobs/999").status_code == status.HTTP_404_NOT_FOUND
+
+def test_repeated_job_search_hits_compression_cache(client, monkeypatch):
+    """Test an identical anonymous search is served from the compressed response cache"""
+    async def fetch_page(client, country, page, params):
+        return {"results": [
+            {"id": str(i), "title": "Python Engineer", "description": f"Team {i} builds Python services. " * 20}
+            for i in range(10)
+        ]}
+    monkeypatch.setattr(adzuna, "fetch_page", fetch_page)
+    compressed_cache.clear()
+    compression_stats.reset()
+    
+    first = client.get("/api/jobs?title=python", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/jobs?title=python", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.content == second.content
+    stats = compression_stats.snapshot()
+    assert (stats["cache_misses"], stats["cache_hits"]) == (1, 1)
@@ -0,0 +1,97 @@
+import codecs
+
+from .. import crud, models, parse_pipeline, schemas
+from ..resume_parser import ResumeParser
+from ..skills import extract_skills, skills_in_tokens
+from ..text_normalizer import decode_bytes, normalize
+
+RESUME_TEXT = """Jane Doe
+jane@example.com | +1 512 555 0100
+
+Summary
+Backend engineer building Python services.
+
+Experience
+Senior Engineer, Acme 2019 - Present
+Built Kubernetes platform.
+
+Skills
+Python, Docker, PostgreSQL
+"""
+
+def make_upload(db, tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text(RESUME_TEXT)
+    return crud.create_resume_upload(db, schemas.ResumeUploadCreate(
+        user_id=1, original_filename="resume.txt", file_type="text/plain", file_size=len(RESUME_TEXT)
+    ), str(path))
+
+def test_segment_and_extract_entities():
+    """Test section segmentation and entity extraction on plain text"""
+    sections = ResumeParser.segment_sections(RESUME_TEXT)
+    assert set(sections) == {"header", "summary", "experience", "skills"}
+    parsed = ResumeParser.extract_entities(sections)
+    assert parsed["personal_info"]["name"] == "Jane Doe"
+    assert parsed["personal_info"]["email"] == "jane@example.com"
+    assert parsed["experience"][0] == {
+        "title": "Senior Engineer, Acme", "description": "Built Kubernetes platform.",
+        "start_date": "2019", "end_date": "Present"
+    }
+    assert [s["name"] for s in parsed["skills"]][:3] == ["Python", "Docker", "PostgreSQL"]
+
+def test_pipeline_resumes_from_last_completed_stage(test_db, tmp_path, monkeypatch):
+    """Test a failed upload resumes from cached stages and records timings"""
+    stages = list(parse_pipeline.STAGES)
+    
+    def broken(upload, outputs):
+        raise RuntimeError("entity model unavailable")
+    monkeypatch.setattr(parse_pipeline, "STAGES", [
+        (name, version, broken if name == "extract_entities" else fn) for name, version, fn in stages
+    ])
+    upload = make_upload(test_db, tmp_path)
+    parse_pipeline.process_upload(test_db, upload.id)
+    upload = crud.get_resume_upload(test_db, upload.id)
+    assert (upload.status, upload.last_completed_stage) == ("failed", "segment_sections")
+    assert upload.error_message == "entity model unavailable"
+    
+    monkeypatch.setattr(parse_pipeline, "STAGES", stages)
+    parse_pipeline.process_upload(test_db, upload.id)
+    upload = crud.get_resume_upload(test_db, upload.id)
+    assert (upload.status, upload.last_completed_stage) == ("completed", "persist")
+    assert {name: t["cached"] for name, t in upload.stage_timings.items()} == {
+        "extract_text": True, "normalize": True, "segment_sections": True, "extract_entities": False, "convert": False, "persist": False
+    }
+    resume = crud.get_resume(test_db, upload.resume_id)
+    assert resume.content["personalInfo"]["email"] == "jane@example.com"
+    
+    # A new version of one stage reruns it and the stages after it only
+    bumped = [(name, version + (name == "convert"), fn) for name, version, fn in stages]
+    monkeypatch.setattr(parse_pipeline, "STAGES", bumped)
+    second = make_upload(test_db, tmp_path)
+    parse_pipeline.process_upload(test_db, second.id)
+    timings = crud.get_resume_upload(test_db, second.id).stage_timings
+    assert [name for name, t in timings.items() if not t["cached"]] == ["convert", "persist"]
+    assert test_db.query(models.Resume).count() == 2
+
+def test_retry_endpoint(client, test_db, tmp_path):
+    """Test only failed uploads can be retried"""
+    upload = make_upload(test_db, tmp_path)
+    response = client.post(f"/uploads/resume/{upload.id}/retry")
+    assert response.status_code == 409
+    crud.update_resume_upload(test_db, upload.id, schemas.ResumeUploadUpdate(status="failed"))
+    response = client.post(f"/uploads/resume/{upload.id}/retry")
+    assert response.status_code == 202
+    assert crud.get_resume_upload(test_db, upload.id).status == "completed"
+
+def test_normalize_decodes_and_tokenizes():
+    """Test encoding detection, NFKC, hyphenation repair and tokenization"""
+    assert decode_bytes("Café – résumé".encode("cp1252")) == "Café – résumé"
+    assert decode_bytes("Café".encode("utf-8")) == "Café"
+    assert decode_bytes(codecs.BOM_UTF16_LE + "Café".encode("utf-16-le")) == "Café"
+    normalized = normalize("Ｐｙｔｈｏｎ  and   CI/CD\r\nsoftware devel-\n  opment, Node.js, C++ at STRAẞE")
+    assert normalized["text"] == "Python and CI/CD\nsoftware development, Node.js, C++ at STRAẞE"
+    assert normalized["tokens"] == [
+        "python", "and", "ci", "cd", "software", "development", "node.js", "c++", "at", "strasse"
+    ]
+    assert skills_in_tokens(normalized["tokens"]) == ["python", "c++", "node.js", "ci/cd"]
+    assert extract_skills("JavaScript developer") == ["javascript"]
@@ -0,0 +1,63 @@
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from starlette.authentication import SimpleUser, UnauthenticatedUser
+
+from ..rate_limit import MemoryBackend, RateLimitMiddleware, RateLimitRule, SQLBackend, _client_keys, parse_rules
+
+def make_client(backend):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, rules=parse_rules("GET /api/jobs=3/60"), backend=backend)
+    
+    @app.get("/api/jobs")
+    def jobs():
+        return []
+    
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+    
+    return TestClient(app)
+
+def test_parse_rules():
+    """Test RATE_LIMITS parsing"""
+    assert parse_rules("POST /uploads/resume=10/60; GET /api/jobs=5/1") == [
+        RateLimitRule("POST", "/uploads/resume", 10, 60.0), RateLimitRule("GET", "/api/jobs", 5, 1.0)
+    ]
+
+def test_memory_backend_refills():
+    """Test token buckets allow a burst, then refill over time"""
+    backend, rule = MemoryBackend(), RateLimitRule("GET", "/", 2, 10)
+    assert backend.hit(0, rule, "a", now=0) == 0 and backend.hit(0, rule, "a", now=0) == 0
+    assert backend.hit(0, rule, "a", now=0) == 5  # One token every 5 seconds
+    assert backend.hit(0, rule, "b", now=0) == 0  # Separate bucket per caller
+    assert backend.hit(0, rule, "a", now=5) == 0
+
+def test_middleware_returns_429_per_ip():
+    """Test over-limit callers get 429 with Retry-After, however they vary user_id"""
+    client = make_client(MemoryBackend())
+    for user_id in range(3):
+        assert client.get(f"/api/jobs?user_id={user_id}").status_code == status.HTTP_200_OK
+    response = client.get("/api/jobs?user_id=99")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["retry-after"]) == 20
+    assert client.get("/health").status_code == status.HTTP_200_OK
+
+class AuthenticatedUser(SimpleUser):
+    @property
+    def identity(self) -> str:
+        return self.username
+
+def test_client_keys_add_authenticated_user_only():
+    """Test the IP bucket is always charged and a user bucket only comes from auth"""
+    scope = {"client": ("10.0.0.1", 1234), "query_string": b"user_id=7", "headers": []}
+    assert _client_keys(scope) == ["ip:10.0.0.1"]
+    assert _client_keys({**scope, "user": UnauthenticatedUser()}) == ["ip:10.0.0.1"]
+    assert _client_keys({**scope, "user": AuthenticatedUser("7")}) == ["ip:10.0.0.1", "user:7"]
+
+def test_sql_backend_shares_counters(test_db):
+    """Test the SQL backend counts across instances (as separate workers would)"""
+    session_factory = sessionmaker(bind=test_db.get_bind())
+    workers = [make_client(SQLBackend(session_factory)) for _ in range(2)]
+    codes = [workers[i % 2].get("/api/jobs?user_id=1").status_code for i in range(4)]
+    assert codes == [200, 200, 200, 429]
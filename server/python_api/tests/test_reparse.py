@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+from .. import crud, models, reparse, schemas
+from .test_parse_pipeline import RESUME_TEXT
+
+def make_uploads(db, tmp_path, count):
+    ids = []
+    for i in range(count):
+        path = tmp_path / f"resume-{i}.txt"
+        if i != 1:  # Upload 1's file is missing from storage
+            path.write_text(RESUME_TEXT)
+        ids.append(crud.create_resume_upload(db, schemas.ResumeUploadCreate(
+            user_id=1, original_filename=path.name, file_type="text/plain", file_size=len(RESUME_TEXT)
+        ), str(path)).id)
+    return ids
+
+def test_reparse_resumes_from_checkpoint(test_db, tmp_path):
+    """Test the backfill writes parsed_data in chunks, bumps versions and resumes from its checkpoint"""
+    ids = make_uploads(test_db, tmp_path, 5)
+    factory = sessionmaker(autoflush=False, bind=test_db.get_bind())
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = reparse.run(factory, executor, chunk_size=2, target_db_load=0, max_chunks=1)
+        assert first == {"processed": 2, "updated": 1, "failed": 1}
+        rest = reparse.run(factory, executor, chunk_size=2, target_db_load=0)
+        assert rest == {"processed": 3, "updated": 3, "failed": 0}
+
+    test_db.expire_all()
+    uploads = [crud.get_resume_upload(test_db, upload_id) for upload_id in ids]
+    assert uploads[0].parsed_data["personal_info"]["email"] == "jane@example.com"
+    assert uploads[1].parsed_data is None
+    assert [u.version for u in uploads] == [2, 1, 2, 2, 2]
+    checkpoint = test_db.get(models.BackfillCheckpoint, reparse.CHECKPOINT_NAME)
+    assert (checkpoint.last_id, checkpoint.processed, checkpoint.failed) == (ids[-1], 5, 1)
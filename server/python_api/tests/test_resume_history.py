@@ -0,0 +1,92 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from sqlalchemy import update
+
+from .. import crud, models, resume_history, schemas
+from .conftest import build_content, edit
+
+def test_diff_apply_round_trip():
+    """Test applying a diff to the old content gives the new content"""
+    rng = random.Random(7)
+    content = build_content(3_000)
+    for _ in range(300):
+        new = edit(content, rng)
+        ops = resume_history.diff(content, new)
+        assert resume_history.apply(orjson.loads(orjson.dumps(content)), ops) == new
+        content = new
+
+def save(test_db, resume_id, content):
+    crud.update_resume(test_db, resume_id, 1, schemas.ResumeUpdate(content=content))
+
+def test_revisions_rebuild_and_restore(client, test_db):
+    """Test every save is recorded as a revision that rebuilds exactly, and restoring one adds a new revision"""
+    rng = random.Random(11)
+    content = build_content(3_000)
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(user_id=1, title="History", content=content))
+    history = [content]
+    for _ in range(120):
+        content = edit(content, rng)
+        save(test_db, resume.id, content)
+        history.append(content)
+    save(test_db, resume.id, content)  # Unchanged content adds no revision
+    
+    rows = test_db.query(models.ResumeRevision).filter_by(resume_id=resume.id).all()
+    assert len(rows) == len(history)
+    assert [row.revision for row in rows if row.is_snapshot][:3] == [1, 51, 101]
+    for revision in (1, 2, 49, 50, 77, len(history)):
+        content, _ = resume_history.get_revision(test_db, resume.id, revision)
+        assert content == history[revision - 1]
+    
+    listed = client.get(f"/resumes/{resume.id}/revisions", params={"user_id": 1, "limit": 2}).json()
+    assert [item["revision"] for item in listed] == [len(history), len(history) - 1]
+    response = client.get(f"/resumes/{resume.id}/revisions/3", params={"user_id": 1})
+    assert response.json()["content"] == history[2]
+    assert client.get(f"/resumes/{resume.id}/revisions/3", params={"user_id": 2}).status_code == 404
+    assert client.get(f"/resumes/{resume.id}/revisions/999", params={"user_id": 1}).status_code == 404
+    
+    restored = client.post(f"/resumes/{resume.id}/revisions/3/restore", params={"user_id": 1})
+    assert restored.status_code == 200 and restored.json()["content"] == history[2]
+    assert resume_history.get_revision(test_db, resume.id, len(history) + 1)[0] == history[2]
+    
+    crud.delete_resume(test_db, resume.id, 1)
+    assert test_db.query(models.ResumeRevision).count() == 0
+
+def test_revision_numbers_follow_resume_version(test_db):
+    """Test revisions are numbered with the version their save wrote, skipping saves that keep content"""
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(user_id=1, title="Draft", content={"summary": "v1"}))
+    crud.update_resume(test_db, resume.id, 1, schemas.ResumeUpdate(title="Renamed"))
+    updated = crud.update_resume(test_db, resume.id, 1, schemas.ResumeUpdate(content={"summary": "v2"}))
+    
+    assert updated.version == 3
+    assert [revision for revision, _ in resume_history.list_revisions(test_db, resume.id)] == [3, 1]
+    assert resume_history.get_revision(test_db, resume.id, 3)[0] == {"summary": "v2"}
+    assert resume_history.get_revision(test_db, resume.id, 2) is None
+
+def test_compaction_keeps_policy_revisions(test_db):
+    """Test compaction drops old autosaves but every kept revision still rebuilds exactly"""
+    rng = random.Random(5)
+    content = build_content(2_000)
+    resume = crud.create_resume(test_db, schemas.ResumeCreate(user_id=1, title="Old", content=content))
+    history = [content]
+    for _ in range(59):
+        content = edit(content, rng)
+        save(test_db, resume.id, content)
+        history.append(content)
+    # Revisions 1-20 are 400 days old, 21-40 are 100 days old (four per day), 41-60 are recent
+    now = datetime.now(timezone.utc).replace(hour=12, minute=0)
+    R = models.ResumeRevision
+    for revision in range(1, 41):
+        age = timedelta(days=400) if revision <= 20 else timedelta(days=100 + (revision - 21) // 4, minutes=-revision)
+        test_db.execute(update(R).where(R.resume_id == resume.id, R.revision == revision).values(created_at=now - age))
+    test_db.commit()
+    
+    dropped = resume_history.compact_resume(test_db, resume.id, now=now, interval=8)
+    kept = [revision for revision, _ in resume_history.list_revisions(test_db, resume.id, limit=100)]
+    assert dropped == 20 + 15
+    assert sorted(kept) == [24, 28, 32, 36, 40] + list(range(41, 61))
+    for revision in kept:
+        assert resume_history.get_revision(test_db, resume.id, revision)[0] == history[revision - 1]
+    assert resume_history.get_revision(test_db, resume.id, 3) is None
+    assert resume_history.compact_resume(test_db, resume.id, now=now) == 0
@@ -0,0 +1,61 @@
+from fastapi import status
+
+from .. import crud, schemas
+from ..search_index import parse_query, years_of_experience
+
+def make_resume(db, user_id, skills, location, title="Engineer", start="2015-01", end="2020-01"):
+    content = {
+        "personalInfo": {"name": f"User {user_id}", "location": location},
+        "experience": [{"title": title, "company": "Acme Corp", "startDate": start, "endDate": end}],
+        "skills": [{"name": name, "proficiency": 3} for name in skills]
+    }
+    return crud.create_resume(db, schemas.ResumeCreate(user_id=user_id, title="Resume", content=content))
+
+def test_parse_query():
+    """Test splitting a recruiter query into skills, keywords and location"""
+    assert parse_query("Python + Kubernetes in Austin") == (["python", "kubernetes"], [], "Austin")
+    assert parse_query("C++, k8s, senior engineer") == (["c++", "kubernetes"], ["senior", "engineer"], None)
+
+def test_years_of_experience_merges_overlaps():
+    """Test that overlapping jobs are only counted once"""
+    experience = [
+        {"startDate": "2010-01", "endDate": "2014-01"},
+        {"startDate": "Jun 2012", "endDate": "2016-01"},
+        {"startDate": "2018", "endDate": "2019"},
+    ]
+    assert years_of_experience(experience) == 7
+
+def test_search_resumes(client, test_db):
+    """Test ranking resumes for a recruiter query"""
+    austin = make_resume(test_db, 1, ["Python", "k8s"], "Austin, TX", title="Senior Engineer")
+    make_resume(test_db, 2, ["python"], "Austin, TX")
+    make_resume(test_db, 3, ["python", "kubernetes"], "Boston, MA", title="Staff Engineer")
+    
+    response = client.get("/api/search/resumes", params={"q": "Python + Kubernetes in Austin"})
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert [r["resume_id"] for r in results] == [austin.id]
+    assert results[0]["years_experience"] == 5
+    
+    # Editing the resume re-indexes it
+    crud.update_resume(test_db, austin.id, 1, schemas.ResumeUpdate(content={"skills": [{"name": "java"}]}))
+    response = client.get("/api/search/resumes", params={"q": "Python + Kubernetes in Austin"})
+    assert response.json() == []
+    
+    # Title keywords boost but do not filter
+    response = client.get("/api/search/resumes", params={"skills": "python", "q": "staff"})
+    assert [(r["user_id"], r["score"]) for r in response.json()] == [(3, 2), (2, 1)]
+    
+    # Repeated skills and location tokens count once
+    response = client.get("/api/search/resumes", params={"skills": ["Python", "python"], "location": "Austin Austin"})
+    assert [r["user_id"] for r in response.json()] == [2]
+
+def test_search_matches_full_width_and_accented_text(client, test_db):
+    """Test index and query terms go through the same NFKC, case-folded tokenizer"""
+    zurich = make_resume(test_db, 1, ["python"], "Zürich", title="Ｄａｔａ Engineer")
+    make_resume(test_db, 2, ["python"], "Zurich", title="Engineer")
+    
+    response = client.get("/api/search/resumes", params={"skills": "python", "location": "ZÜRICH", "q": "data"})
+    assert [(r["resume_id"], r["score"]) for r in response.json()] == [(zurich.id, 3)]
+    response = client.get("/api/search/resumes", params={"skills": "python", "location": "Ｚüｒｉｃｈ"})
+    assert [r["resume_id"] for r in response.json()] == [zurich.id]
@@ -0,0 +1,61 @@
+import random
+
+from fastapi import status
+
+from .. import adzuna, crud, models, schemas, skill_profile
+
+def test_skill_profile_materialized_on_resume_writes(test_db):
+    """Test the profile is the union of the user's resume skills, kept in sync on writes"""
+    test_db.add(models.User(id=1, username="jane", password="x"))
+    test_db.commit()
+    assert skill_profile.get_profile(test_db, 1) is None
+    
+    first = crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Backend", content={"skills": [{"name": "Python"}, {"name": "k8s"}]}
+    ))
+    crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Frontend", content={"skills": [{"name": "React"}, {"name": "Python"}]}
+    ))
+    assert skill_profile.decode(skill_profile.get_profile(test_db, 1)) == ["python", "react", "kubernetes"]
+    
+    crud.update_resume(test_db, first.id, 1, schemas.ResumeUpdate(content={"skills": [{"name": "AWS"}]}))
+    assert skill_profile.decode(skill_profile.get_profile(test_db, 1)) == ["python", "react", "aws"]
+    
+    crud.delete_resume(test_db, first.id, 1)
+    assert skill_profile.decode(skill_profile.get_profile(test_db, 1)) == ["python", "react"]
+
+def test_profile_computed_for_users_without_skill_bits(test_db):
+    """Test users from before the column (NULL skill_bits) still get a profile"""
+    test_db.add(models.User(id=1, username="jane", password="x"))
+    test_db.commit()
+    crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Backend", content={"skills": [{"name": "Python"}, {"name": "Docker"}]}
+    ))
+    test_db.query(models.User).update({models.User.skill_bits: None})
+    test_db.commit()
+    skill_profile.profile_cache.clear()
+    assert skill_profile.decode(skill_profile.get_profile(test_db, 1)) == ["python", "docker"]
+    assert test_db.get(models.User, 1).skill_bits is None  # Computed on read, not written back
+
+def test_match_score():
+    """Test popcount scoring against a job's skills"""
+    profile = skill_profile.encode(["python", "aws"])
+    assert skill_profile.match_score(profile, skill_profile.encode(["python", "aws", "docker", "sql"])) == 50
+    assert skill_profile.match_score(profile, 0) == 0
+
+def test_get_jobs_scores_with_profile(client, test_db, monkeypatch):
+    """Test job listings are scored from the stored profile instead of at random"""
+    test_db.add(models.User(id=1, username="jane", password="x"))
+    test_db.commit()
+    crud.create_resume(test_db, schemas.ResumeCreate(
+        user_id=1, title="Backend", content={"skills": [{"name": "Python"}, {"name": "Docker"}]}
+    ))
+    
+    async def fetch_page(client, country, page, params):
+        return {"results": [{"id": "1", "title": "Engineer", "description": "Python, Docker, AWS and SQL"}]}
+    monkeypatch.setattr(adzuna, "fetch_page", fetch_page)
+    monkeypatch.setattr(random, "randint", lambda a, b: 0)
+    
+    response = client.get("/api/jobs?user_id=1")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["match"] == 50
@@ -0,0 +1,47 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from .. import crud, models, schemas, upload_archive
+
+PARSED = {"personal_info": {"name": "Jane Doe"}, "skills": [{"name": "Python"}] * 50}
+
+def make_upload(db, days_old, status="completed"):
+    upload = crud.create_resume_upload(db, schemas.ResumeUploadCreate(
+        user_id=1, original_filename="resume.txt", file_type="text/plain", file_size=10
+    ), "/nonexistent/resume.txt")
+    upload.status = status
+    upload.parsed_data = PARSED
+    upload.upload_date = datetime.now(timezone.utc) - timedelta(days=days_old)
+    db.commit()
+    return upload.id
+
+def test_archive_and_rehydrate(client, test_db, tmp_path, monkeypatch):
+    """Test cold parsed_data moves to blob storage and reads bring it back transparently"""
+    monkeypatch.setattr(upload_archive, "blob_store", upload_archive.FileBlobStore(str(tmp_path)))
+    old_id = make_upload(test_db, 400)
+    recent_id = make_upload(test_db, 5)
+    pending_id = make_upload(test_db, 400, status="pending")
+    etag = client.get(f"/uploads/resume/{old_id}").headers["etag"]
+    
+    stats = upload_archive.archive_uploads(test_db, older_than_days=180, chunk_size=1)
+    assert stats["archived"] == 1 and stats["stored_bytes"] < stats["json_bytes"]
+    U = models.ResumeUpload
+    rows = dict(test_db.execute(select(U.id, U.parsed_data_ref).where(U.parsed_data.is_(None))).all())
+    assert list(rows) == [old_id]
+    assert os.path.exists(os.path.join(str(tmp_path), *rows[old_id].split("/")))
+    assert {old_id, recent_id, pending_id} - set(rows) == {recent_id, pending_id}
+    
+    test_db.expire_all()
+    response = client.get(f"/uploads/resume/{old_id}")
+    assert response.json()["parsed_data"] == PARSED
+    assert response.headers["etag"] == etag
+    listed = client.get("/uploads/resume/user/1").json()
+    assert all(upload["parsed_data"] == PARSED for upload in listed)
+    
+    # Unrelated updates keep the data archived; delete removes the blob
+    crud.update_resume_upload(test_db, old_id, schemas.ResumeUploadUpdate(error_message="note"))
+    assert test_db.get(U, old_id).parsed_data_ref == rows[old_id]
+    assert client.delete(f"/uploads/resume/{old_id}").status_code == 204
+    assert not os.path.exists(os.path.join(str(tmp_path), *rows[old_id].split("/")))
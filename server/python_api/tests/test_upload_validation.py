@@ -0,0 +1,100 @@
+import asyncio
+import os
+import zlib
+
+import pytest
+from fastapi import status
+
+from .. import main, resume_parser
+from ..upload_validation import EICAR, ObjectStreamPages, SignatureScanner, UploadRejected, UploadValidator
+
+def upload(client, name, content, content_type):
+    return client.post("/uploads/resume/", files={"file": (name, content, content_type)}, data={"user_id": 1})
+
+def pdf_with_pages(pages: int) -> bytes:
+    objects = b"".join(b"%d 0 obj << /Type /Page /Parent 1 0 R >> endobj\n" % (i + 2) for i in range(pages))
+    return b"%PDF-1.4\n1 0 obj << /Type /Pages /Count " + str(pages).encode() + b" >> endobj\n" + objects + b"%%EOF"
+
+def pdf_with_object_stream(pages: int) -> bytes:
+    """PDF 1.5 layout: the page tree lives in a compressed object stream"""
+    objects = [b"<< /Type /Pages /Count %d >>" % pages] + [b"<< /Type /Page /Parent 2 0 R >>"] * pages
+    packed = zlib.compress(b" ".join(objects))
+    return (
+        b"%PDF-1.5\n1 0 obj << /Type /ObjStm /N " + str(len(objects)).encode()
+        + b" /Filter /FlateDecode /Length " + str(len(packed)).encode() + b" >> stream\n"
+        + packed + b"\nendstream endobj\n%%EOF"
+    )
+
+def test_upload_rejects_mismatched_and_unsupported_types(client):
+    """Test magic bytes must be a supported type matching the extension and content type"""
+    before = set(os.listdir(resume_parser.UPLOAD_DIR))
+    response = upload(client, "resume.pdf", b"plain text pretending to be a PDF", "application/pdf")
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    assert "does not match extension" in response.json()["detail"]
+    response = upload(client, "resume.txt", b"%PDF-1.4 real pdf", "text/plain")
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    response = upload(client, "resume.doc", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 64, "application/msword")
+    assert response.json()["detail"] == "Unsupported file type: legacy Office document"
+    assert upload(client, "resume.txt", b"", "text/plain").status_code == status.HTTP_400_BAD_REQUEST
+    assert set(os.listdir(resume_parser.UPLOAD_DIR)) == before
+
+def test_upload_stores_sniffed_type(client):
+    """Test the stored file type comes from the content, not the client's claim"""
+    response = upload(client, "resume.pdf", pdf_with_pages(2), "application/octet-stream")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["file_type"] == "application/pdf"
+
+def test_upload_rejects_infected_file(client):
+    """Test the scanner sees the upload stream"""
+    response = upload(client, "resume.txt", b"Jane Doe\n" + EICAR, "text/plain")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "File failed virus scan: Eicar-Test-Signature"
+
+def test_validator_limits_across_chunks():
+    """Test size, page and signature checks on markers split across chunks"""
+    validator = UploadValidator("resume.pdf", "application/pdf", max_pdf_pages=3)
+    data = pdf_with_pages(4)
+    split = data.index(b"/Type /Page ") + 8
+    validator.feed(data[:split])
+    with pytest.raises(UploadRejected) as rejected:
+        validator.feed(data[split:])
+    assert (rejected.value.status_code, validator.pages) == (422, 4)
+    
+    validator = UploadValidator("resume.txt", "text/plain", max_bytes=10)
+    validator.feed(b"0123456789")
+    with pytest.raises(UploadRejected) as rejected:
+        validator.feed(b"!")
+    assert rejected.value.status_code == 413
+    
+    scanner = SignatureScanner()
+    assert scanner.feed(b"header " + EICAR[:20]) is None
+    assert scanner.feed(EICAR[20:]) == "Eicar-Test-Signature"
+
+def test_pdf_pages_in_object_streams(client):
+    """Test pages hidden in compressed object streams still count against MAX_PDF_PAGES"""
+    data = pdf_with_object_stream(30)
+    assert b"/Type /Page" not in data
+    # Inflated as the bytes stream through, whatever the chunk boundaries
+    for size in (1, 7, 64, len(data)):
+        counter = ObjectStreamPages()
+        assert sum(counter.feed(data[i:i + size]) for i in range(0, len(data), size)) == 30
+    assert ObjectStreamPages(max_inflated=100).feed(data) < 30
+    response = upload(client, "resume.pdf", data, "application/pdf")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "PDF has more than 20 pages"
+    assert upload(client, "resume.pdf", pdf_with_object_stream(2), "application/pdf").status_code == 202
+
+def test_blocking_scanner_runs_off_event_loop(client, monkeypatch):
+    """Test a scanner doing blocking I/O (clamd) is called from the threadpool"""
+    on_loop = []
+    
+    class BlockingScanner(SignatureScanner):
+        blocking = True
+        
+        def feed(self, chunk):
+            on_loop.append(asyncio._get_running_loop() is not None)
+            return super().feed(chunk)
+    
+    monkeypatch.setattr(main, "make_scanner", BlockingScanner)
+    assert upload(client, "resume.txt", b"Jane Doe", "text/plain").status_code == status.HTTP_202_ACCEPTED
+    assert on_loop == [False]
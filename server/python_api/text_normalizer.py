@@ -0,0 +1,67 @@
+"""
+Text normalization shared by resume parsing, skill extraction and indexing.
+
+normalize() runs once per document: it applies Unicode NFKC, repairs words
+hyphenated across line breaks, collapses whitespace (keeping line breaks, which
+section segmentation relies on) and produces a case-folded token stream.
+parse_pipeline caches the result as the "normalize" stage so every later
+stage reads the same text and tokens instead of lowercasing and rescanning.
+
+decode_bytes() picks the encoding of plain-text uploads: a byte order mark
+if present, UTF-8 if the bytes are valid UTF-8, otherwise Windows-1252 (what
+Word and most Windows editors save "ANSI" text as).
+"""
+import codecs
+import re
+import unicodedata
+from typing import Any, Dict, List
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# A letter, a hyphen ending the line and a letter opening the next (joined if lower-case)
+_HYPHENATED = re.compile(r"(?<=[^\W\d_])-[ \t]*\r?\n[ \t]*(?=[^\W\d_])")
+_SOFT_HYPHEN = "\u00ad"
+_SPACES = re.compile(r"[^\S\n]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+# Words, numbers and dotted names ("node.js"), keeping trailing "+" / "#" ("c++", "c#")
+_TOKEN = re.compile(r"[^\W_]+(?:\.[^\W_]+)*[+#]*")
+
+def decode_bytes(data: bytes) -> str:
+    """Decode plain-text upload bytes, detecting BOMs, UTF-8 and Windows-1252"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding, errors="replace")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        return data.decode("cp1252")
+    except UnicodeDecodeError:
+        # cp1252 leaves five bytes undefined; latin-1 maps every byte
+        return data.decode("latin-1")
+
+def _join_hyphenated(match: re.Match) -> str:
+    following = match.string[match.end()]
+    return "" if following.islower() else match.group()
+
+def normalize_text(text: str) -> str:
+    """NFKC, hyphenation repair and whitespace cleanup; case and line breaks are kept"""
+    text = unicodedata.normalize("NFKC", text).replace(_SOFT_HYPHEN, "")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _HYPHENATED.sub(_join_hyphenated, text)
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded tokens of already normalized text"""
+    return _TOKEN.findall(text.casefold())
+
+def normalize(text: str) -> Dict[str, Any]:
+    """Normalize a document once for all consumers: {"text": ..., "tokens": [...]}"""
+    normalized = normalize_text(text)
+    return {"text": normalized, "tokens": tokenize(normalized)}
@@ -0,0 +1,235 @@
+"""
+Archival of cold resume upload data.
+
+Finished uploads older than ARCHIVE_AFTER_DAYS are rarely read again, but their
+parsed_data JSON is the bulk of resume_uploads and weighs on every scan, vacuum
+and backup. The archive job moves that JSON to gzip-compressed blobs (one per
+upload, keyed by upload month and id) and leaves the blob key in
+parsed_data_ref. crud rehydrates parsed_data from the blob when an archived
+upload is read, so API responses are unchanged.
+
+On Postgres resume_uploads is partitioned by month of upload_date (see the
+a3c8e1f4b7d9 migration); each run also creates the partitions for the next
+ARCHIVE_PARTITIONS_AHEAD months, and for any month whose rows landed in the
+default partition because its partition did not exist yet. Those rows are
+moved out of the default partition into the new one.
+
+Blobs go to a FileBlobStore under ARCHIVE_DIR; any object with put/get/delete
+(an S3 bucket, say) can stand in for it.
+
+Run from the server directory:
+    python -m python_api.upload_archive
+"""
+import argparse
+import gzip
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, null, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from . import models
+from .database import SessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "500"))
+ARCHIVE_PARTITIONS_AHEAD = int(os.getenv("ARCHIVE_PARTITIONS_AHEAD", "3"))
+# Only uploads that will not be processed again are archived
+ARCHIVABLE_STATUSES = ("completed", "failed")
+
+class FileBlobStore:
+    """Blobs as files under a root directory"""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a reader never sees a partial blob
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+blob_store = FileBlobStore()
+
+def blob_key(upload_id: int, upload_date: datetime) -> str:
+    return f"resume_uploads/{upload_date:%Y/%m}/{upload_id}.json.gz"
+
+def rehydrate(uploads: Iterable[models.ResumeUpload]) -> None:
+    """Load archived parsed_data back onto uploads without marking them as changed"""
+    for upload in uploads:
+        if upload is not None and upload.parsed_data_ref and upload.parsed_data is None:
+            data = orjson.loads(gzip.decompress(blob_store.get(upload.parsed_data_ref)))
+            set_committed_value(upload, "parsed_data", data)
+
+def delete_archived(upload: models.ResumeUpload) -> None:
+    if upload.parsed_data_ref:
+        blob_store.delete(upload.parsed_data_ref)
+
+def _month_start(day: date, months_ahead: int = 0) -> date:
+    month = day.month - 1 + months_ahead
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+def _create_partition(db: Session, start: date, end: date) -> None:
+    """Create one monthly partition, moving its rows out of the default partition first"""
+    name = f"resume_uploads_y{start:%Y}m{start:%m}"
+    bounds = {"start": start, "end": end}
+    in_default = db.execute(text(
+        "SELECT to_regclass('resume_uploads_default') IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM resume_uploads_default WHERE upload_date >= :start AND upload_date < :end)"
+    ), bounds).scalar()
+    create = (
+        f"CREATE TABLE {name} PARTITION OF resume_uploads "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    if not in_default:
+        db.execute(text(create))
+        return
+    # Postgres refuses a new partition while the default one holds matching rows:
+    # detach the default, create the partition, move the rows across, reattach
+    db.execute(text("ALTER TABLE resume_uploads DETACH PARTITION resume_uploads_default"))
+    db.execute(text(create))
+    db.execute(text(
+        "WITH moved AS (DELETE FROM resume_uploads_default WHERE upload_date >= :start AND upload_date < :end "
+        "RETURNING *) INSERT INTO resume_uploads SELECT * FROM moved"
+    ), bounds)
+    db.execute(text("ALTER TABLE resume_uploads ATTACH PARTITION resume_uploads_default DEFAULT"))
+
+def ensure_partitions(db: Session, months_ahead: int = ARCHIVE_PARTITIONS_AHEAD, today: Optional[date] = None) -> int:
+    """
+    Create missing monthly resume_uploads partitions (Postgres only)
+
+    Covers this month up to months_ahead plus every month with rows in the
+    default partition. Each partition is created in its own transaction, and a
+    failure is logged and skipped so the archive run still goes ahead.
+
+    Returns:
+        How many partitions were created
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return 0
+    today = today or datetime.now(timezone.utc).date()
+    months = {_month_start(today, offset) for offset in range(months_ahead + 1)}
+    if db.execute(text("SELECT to_regclass('resume_uploads_default')")).scalar() is not None:
+        months.update(
+            day.date() for day in db.execute(text(
+                "SELECT DISTINCT date_trunc('month', upload_date) FROM resume_uploads_default"
+            )).scalars()
+        )
+    db.commit()
+    created = 0
+    for start in sorted(months):
+        name = f"resume_uploads_y{start:%Y}m{start:%m}"
+        try:
+            if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+                _create_partition(db, start, _month_start(start, 1))
+                created += 1
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.exception(f"Could not create partition {name}")
+    return created
+
+def archive_uploads(
+    db: Session,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    store=None,
+) -> Dict[str, int]:
+    """
+    Move parsed_data of finished uploads older than older_than_days to blob storage
+
+    Each chunk's blobs are written before the rows are updated, so a crash leaves
+    at worst an unreferenced blob that the next run overwrites.
+
+    Returns:
+        Counters: archived uploads, bytes of JSON moved and bytes stored
+    """
+    store = store or blob_store
+    U = models.ResumeUpload
+    table = U.__table__
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    # Archiving does not change what the API returns, so the version (ETag) is left alone
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("upload_id"))
+        .values(parsed_data=null(), parsed_data_ref=bindparam("ref"), archived_at=bindparam("now"))
+    )
+    stats = {"archived": 0, "json_bytes": 0, "stored_bytes": 0}
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(U.id, U.upload_date, U.parsed_data)
+            .where(
+                U.id > last_id,
+                U.upload_date < cutoff,
+                U.status.in_(ARCHIVABLE_STATUSES),
+                U.parsed_data.isnot(None),
+                U.parsed_data_ref.is_(None),
+            )
+            .order_by(U.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        now = datetime.now(timezone.utc)
+        params = []
+        for upload_id, upload_date, parsed_data in rows:
+            raw = orjson.dumps(parsed_data)
+            blob = gzip.compress(raw, compresslevel=6)
+            key = blob_key(upload_id, upload_date)
+            store.put(key, blob)
+            params.append({"upload_id": upload_id, "ref": key, "now": now})
+            stats["json_bytes"] += len(raw)
+            stats["stored_bytes"] += len(blob)
+        db.execute(stmt, params)
+        db.commit()
+        stats["archived"] += len(rows)
+        last_id = rows[-1][0]
+    return stats
+
+def run_once(session_factory=SessionLocal, older_than_days: int = ARCHIVE_AFTER_DAYS) -> Dict[str, int]:
+    db = session_factory()
+    try:
+        partitions = ensure_partitions(db)
+        stats = archive_uploads(db, older_than_days)
+    finally:
+        db.close()
+    logger.info(f"Archive run finished: {stats}, {partitions} partitions created")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive parsed_data of old resume uploads to blob storage")
+    parser.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS, help="Archive uploads older than this")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run_once(older_than_days=args.older_than_days)
+
+if __name__ == "__main__":
+    main()
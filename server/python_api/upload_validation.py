@@ -0,0 +1,363 @@
+"""
+Streaming validation of resume uploads.
+
+save_upload() copies an upload to UPLOAD_DIR in UPLOAD_CHUNK_SIZE chunks and
+feeds every chunk through an UploadValidator on the way, so a file is checked
+in the same single pass that writes it:
+
+    type     The first chunk is sniffed for magic bytes (%PDF-, a zip header
+             for DOCX, otherwise text). Unsupported types, or content that
+             does not match the filename extension or declared content type,
+             are rejected before anything else is read.
+    size     MAX_UPLOAD_BYTES, checked as bytes arrive.
+    pages    PDF page objects are counted per chunk against MAX_PDF_PAGES.
+             PDF 1.5+ usually keeps them in compressed object streams, which
+             a byte scan cannot see, so those streams are inflated as their
+             bytes arrive and the pages inside them are counted too.
+    scan     An optional scanner sees every chunk (UPLOAD_SCANNER):
+                 none       no scanning
+                 signature  in-process match of known signatures, such as the
+                            EICAR test file
+                 clamd      streams the file to clamd with INSTREAM
+                            (CLAMD_ADDRESS is host:port or a unix socket path)
+
+A rejected upload raises UploadRejected with the HTTP status to answer with
+and the partial file is removed, so parse workers never see it. Blocking
+scanner I/O (clamd) and PDF inflation run in the threadpool, off the event loop.
+"""
+import os
+import re
+import socket
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from .resume_parser import DOCX_TYPES, ResumeParser
+
+load_dotenv()
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "20"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+UPLOAD_SCANNER = os.getenv("UPLOAD_SCANNER", "signature")
+CLAMD_ADDRESS = os.getenv("CLAMD_ADDRESS", "/var/run/clamav/clamd.ctl")
+
+# Kind of file -> MIME type stored on the upload
+MEDIA_TYPES = {"pdf": "application/pdf", "docx": DOCX_TYPES[0], "text": "text/plain"}
+EXTENSION_KINDS = {".pdf": "pdf", ".docx": "docx", ".txt": "text"}
+CONTENT_TYPE_KINDS = {media_type: kind for kind, media_type in MEDIA_TYPES.items()}
+# Content types that say nothing about the file; the extension and magic bytes decide
+GENERIC_CONTENT_TYPES = ("", "application/octet-stream")
+
+# Magic bytes of types we recognise but cannot parse
+_REJECTED_MAGIC = [
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "legacy Office document"),
+    (b"\x89PNG", "image"), (b"\xff\xd8\xff", "image"), (b"GIF8", "image"),
+    (b"MZ", "executable"), (b"\x7fELF", "executable"),
+]
+_UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+# A page object, not the /Pages tree node
+_PDF_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_PDF_PAGE_CARRY = 16
+_PDF_OBJSTM = re.compile(rb"/Type\s*/ObjStm(?![a-zA-Z])")
+_PDF_STREAM = re.compile(rb"stream\r?\n")
+
+EICAR = b"X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+
+def count_new_pages(tail: bytes, data: bytes) -> Tuple[int, bytes]:
+    """
+    Count page objects in data, with tail the end of the bytes before it
+
+    Returns:
+        (pages, tail for the next call); a marker split across calls is counted once
+    """
+    window = tail + data
+    # A match at the very end waits for the next byte, which may turn /Page into /Pages
+    pages = sum(1 for m in _PDF_PAGE.finditer(window) if len(tail) <= m.end() < len(window))
+    return pages, window[-_PDF_PAGE_CARRY:]
+
+class ObjectStreamPages:
+    """
+    Counts page objects inside a PDF's compressed (FlateDecode) object streams, chunk by chunk
+
+    Every object stream gets its own decompressobj that is fed as the raw bytes
+    arrive, so nothing is read twice. At most max_inflated bytes are inflated in
+    total, so a compression bomb cannot blow up memory; streams that do not
+    inflate are skipped.
+    """
+
+    def __init__(self, max_inflated: int = MAX_UPLOAD_BYTES * 4):
+        self.budget = max_inflated
+        self._carry = b""
+        self._in_dictionary = False  # Saw /Type /ObjStm, its stream has not started yet
+        self._inflater = None
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> int:
+        """Scan the next chunk. Returns the number of pages found in it."""
+        pages = 0
+        data = chunk
+        while data and self.budget > 0:
+            if self._inflater is None:
+                data = self._find_stream(data)
+            else:
+                found, data = self._inflate(data)
+                pages += found
+        return pages
+
+    def _find_stream(self, data: bytes) -> bytes:
+        """Look for the start of the next object stream. Returns the bytes after it."""
+        window = self._carry + data
+        self._carry = b""
+        if not self._in_dictionary:
+            match = _PDF_OBJSTM.search(window)
+            if match is None:
+                self._carry = window[-_PDF_PAGE_CARRY:]
+                return b""
+            self._in_dictionary = True
+            window = window[match.end():]
+        match = _PDF_STREAM.search(window)
+        if match is None:
+            self._carry = window[-_PDF_PAGE_CARRY:]
+            return b""
+        self._in_dictionary = False
+        self._inflater = zlib.decompressobj()
+        self._tail = b""
+        return window[match.end():]
+
+    def _inflate(self, data: bytes) -> Tuple[int, bytes]:
+        """Inflate data into the current stream. Returns (pages, bytes after the stream ends)."""
+        try:
+            inflated = self._inflater.decompress(data, self.budget)
+        except zlib.error:
+            self._inflater = None
+            return 0, data
+        self.budget -= len(inflated)
+        pages, self._tail = count_new_pages(self._tail, inflated)
+        if not self._inflater.eof:
+            return pages, b""
+        rest = self._inflater.unused_data
+        self._inflater = None
+        return pages, rest
+
+class UploadRejected(Exception):
+    """An upload failed validation; status_code is the HTTP status to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def sniff(head: bytes) -> Tuple[Optional[str], str]:
+    """Kind of file from its first bytes. Returns (kind or None, description)."""
+    if head.startswith(b"%PDF-"):
+        return "pdf", "PDF"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx", "zip archive"
+    for magic, description in _REJECTED_MAGIC:
+        if head.startswith(magic):
+            return None, description
+    if head.startswith(_UTF16_BOMS) or b"\x00" not in head:
+        return "text", "text"
+    return None, "binary data"
+
+class SignatureScanner:
+    """In-process stand-in for an antivirus daemon: matches byte signatures across chunks"""
+
+    def __init__(self, signatures: Optional[Dict[str, bytes]] = None):
+        self.signatures = signatures or {"Eicar-Test-Signature": EICAR}
+        self._carry_size = max(len(s) for s in self.signatures.values()) - 1
+        self._carry = b""
+
+    def feed(self, chunk: bytes) -> Optional[str]:
+        """Scan the next chunk. Returns the name of a matched signature, if any."""
+        window = self._carry + chunk
+        for name, signature in self.signatures.items():
+            if signature in window:
+                return name
+        self._carry = window[-self._carry_size:]
+        return None
+
+    def finish(self) -> Optional[str]:
+        return None
+
+    def close(self) -> None:
+        pass
+
+class ClamdScanner:
+    """Streams the upload to clamd with the INSTREAM command"""
+
+    # Socket calls block, so save_upload runs feed/finish in the threadpool
+    blocking = True
+
+    def __init__(self, address: str = CLAMD_ADDRESS, timeout: float = 10.0):
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> socket.socket:
+        host, _, port = self.address.rpartition(":")
+        if host and port.isdigit():
+            sock = socket.create_connection((host, int(port)), timeout=self.timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        sock.sendall(b"zINSTREAM\0")
+        return sock
+
+    def feed(self, chunk: bytes) -> Optional[str]:
+        if self._sock is None:
+            self._sock = self._connect()
+        self._sock.sendall(struct.pack(">I", len(chunk)) + chunk)
+        return None
+
+    def finish(self) -> Optional[str]:
+        """Send the end-of-stream marker and read the verdict"""
+        if self._sock is None:
+            return None
+        try:
+            self._sock.sendall(struct.pack(">I", 0))
+            reply = b""
+            while not reply.endswith(b"\0"):
+                data = self._sock.recv(4096)
+                if not data:
+                    break
+                reply += data
+        finally:
+            self.close()
+        # "stream: OK" or "stream: <signature> FOUND"
+        verdict = reply.rstrip(b"\0").decode("utf-8", errors="replace").partition(": ")[2]
+        if verdict.endswith(" FOUND"):
+            return verdict[: -len(" FOUND")]
+        if verdict != "OK":
+            raise RuntimeError(f"clamd scan failed: {verdict or 'no reply'}")
+        return None
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+def make_scanner(name: str = UPLOAD_SCANNER):
+    if name == "clamd":
+        return ClamdScanner()
+    if name == "signature":
+        return SignatureScanner()
+    return None
+
+class UploadValidator:
+    """Validates an upload chunk by chunk; raises UploadRejected as soon as a check fails"""
+
+    def __init__(
+        self,
+        filename: str,
+        content_type: Optional[str],
+        max_bytes: int = MAX_UPLOAD_BYTES,
+        max_pdf_pages: int = MAX_PDF_PAGES,
+        scanner=None,
+    ):
+        self.filename = filename or ""
+        self.content_type = (content_type or "").split(";")[0].strip().lower()
+        self.max_bytes = max_bytes
+        self.max_pdf_pages = max_pdf_pages
+        self.scanner = scanner
+        self.kind: Optional[str] = None
+        self.size = 0
+        self.pages = 0
+        self._tail = b""
+        self._object_streams = ObjectStreamPages(max_bytes * 4)
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.kind]
+
+    @property
+    def blocking(self) -> bool:
+        """Whether feed() may block (scanner I/O, PDF inflation) and must stay off the event loop"""
+        return self.kind in (None, "pdf") or getattr(self.scanner, "blocking", False)
+
+    def _check_type(self, head: bytes) -> None:
+        kind, description = sniff(head)
+        if kind is None:
+            raise UploadRejected(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, f"Unsupported file type: {description}")
+        extension = os.path.splitext(self.filename)[1].lower()
+        if EXTENSION_KINDS.get(extension) != kind:
+            raise UploadRejected(
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                f"File content ({description}) does not match extension '{extension or '(none)'}'"
+            )
+        if self.content_type not in GENERIC_CONTENT_TYPES and CONTENT_TYPE_KINDS.get(self.content_type) != kind:
+            raise UploadRejected(
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                f"File content ({description}) does not match content type '{self.content_type}'"
+            )
+        self.kind = kind
+
+    def _count_pages(self, chunk: bytes) -> None:
+        pages, self._tail = count_new_pages(self._tail, chunk)
+        self.pages += pages + self._object_streams.feed(chunk)
+        if self.pages > self.max_pdf_pages:
+            raise UploadRejected(
+                status.HTTP_422_UNPROCESSABLE_ENTITY, f"PDF has more than {self.max_pdf_pages} pages"
+            )
+
+    def feed(self, chunk: bytes) -> None:
+        if self.kind is None:
+            self._check_type(chunk)
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"File is larger than {self.max_bytes} bytes"
+            )
+        if self.kind == "pdf":
+            self._count_pages(chunk)
+        if self.scanner is not None:
+            self._check_scan(self.scanner.feed(chunk))
+
+    def finish(self) -> None:
+        """Final checks once the whole file is in"""
+        if self.size == 0:
+            raise UploadRejected(status.HTTP_400_BAD_REQUEST, "Empty file")
+        if self.scanner is not None:
+            self._check_scan(self.scanner.finish())
+
+    def _check_scan(self, found: Optional[str]) -> None:
+        if found:
+            raise UploadRejected(status.HTTP_422_UNPROCESSABLE_ENTITY, f"File failed virus scan: {found}")
+
+async def save_upload(file: UploadFile, validator: UploadValidator) -> str:
+    """
+    Validate and write an upload to UPLOAD_DIR in one pass
+
+    Returns:
+        Path of the saved file; nothing is left on disk if validation fails
+    """
+    file_path, _ = ResumeParser.upload_path(file.filename or "")
+    try:
+        with open(file_path, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if validator.blocking:
+                    await run_in_threadpool(validator.feed, chunk)
+                else:
+                    validator.feed(chunk)
+                out.write(chunk)
+        # Waits for the scanner's verdict
+        if validator.blocking:
+            await run_in_threadpool(validator.finish)
+        else:
+            validator.finish()
+    except BaseException:
+        if validator.scanner is not None:
+            validator.scanner.close()
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return file_path